@@ -1,11 +1,57 @@
-from .signer import PayloadSigner, SignedResult
-from .verifier import SignatureVerificationError, parse_key_id, verify, verify_at
+from .aio import AsyncOffloader, AsyncPayloadSigner, OffloadMetrics, async_verify
+from .bulk import (
+    BulkVerifyResult,
+    BulkVerifyStats,
+    InvalidRecord,
+    ReplayCache,
+    iter_ndjson_records,
+    verify_bulk,
+)
+from .keystore import (
+    CachingVerifier,
+    HttpRegistryKeyLookup,
+    JsonFileKeyLookup,
+    KeyStore,
+    UnknownKeyError,
+)
+from .rotation import KeyringSigner, KeyringVerifier, SigningKey, VerificationKey
+from .signer import PayloadSigner, SignedHeaderCache, SignedResult
+from .verifier import (
+    ParsedHeader,
+    SignatureVerificationError,
+    parse_auth_header,
+    parse_key_id,
+    verify,
+    verify_at,
+)
 
 __all__ = [
+    "AsyncOffloader",
+    "AsyncPayloadSigner",
+    "BulkVerifyResult",
+    "BulkVerifyStats",
+    "CachingVerifier",
+    "HttpRegistryKeyLookup",
+    "InvalidRecord",
+    "JsonFileKeyLookup",
+    "KeyStore",
+    "KeyringSigner",
+    "KeyringVerifier",
+    "OffloadMetrics",
+    "ParsedHeader",
     "PayloadSigner",
+    "ReplayCache",
+    "SignedHeaderCache",
     "SignedResult",
+    "SigningKey",
     "SignatureVerificationError",
+    "UnknownKeyError",
+    "VerificationKey",
+    "async_verify",
+    "iter_ndjson_records",
+    "parse_auth_header",
     "parse_key_id",
     "verify",
     "verify_at",
+    "verify_bulk",
 ]
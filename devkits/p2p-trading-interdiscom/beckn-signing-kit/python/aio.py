@@ -0,0 +1,206 @@
+"""asyncio wrappers that keep signing and verification off the event loop.
+
+Hashing a large body and the Ed25519 operation run in an executor (the
+loop's default thread pool unless one is given). A semaphore bounds how
+many run at once so a burst of callbacks queues instead of flooding the
+pool, and OffloadMetrics reports queue depth and latency. Bodies of at most
+``inline_max_bytes`` are handled inline, where a thread hop would cost more
+than the work.
+
+Usage::
+
+    signer = AsyncPayloadSigner(PayloadSigner(...), max_concurrency=8)
+    auth_header = await signer.sign_payload(body)
+
+    await async_verify(body, auth_header, sender_public_key)
+
+    # Any other call, e.g. a CachingVerifier, through the same limits:
+    offloader = AsyncOffloader(max_concurrency=8)
+    await offloader.run(caching_verifier.verify, body, auth_header)
+    print(offloader.metrics)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+import weakref
+from collections import deque
+from collections.abc import Callable, Iterable
+from concurrent.futures import Executor
+from dataclasses import dataclass, field
+from typing import Any, TypeVar
+
+from .signer import Body, PayloadSigner, SignedResult
+from .verifier import ParsedHeader, verify
+
+DEFAULT_MAX_CONCURRENCY = 32
+DEFAULT_INLINE_MAX_BYTES = 4096
+LATENCY_SAMPLES = 1024
+
+T = TypeVar("T")
+
+
+@dataclass
+class OffloadMetrics:
+    """Counters for an AsyncOffloader; latencies are in seconds.
+
+    ``queue_depth`` is the number of calls waiting for a concurrency slot and
+    ``running`` those executing now. Percentiles cover the most recent
+    LATENCY_SAMPLES offloaded calls, from submission to completion.
+    """
+
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    running: int = 0
+    completed: int = 0
+    failed: int = 0
+    inline: int = 0
+    wait_seconds: float = 0.0
+    run_seconds: float = 0.0
+    _latencies: deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES), repr=False)
+
+    def latency_percentile(self, pct: float) -> float:
+        """Latency at percentile ``pct`` (0-100) of recent calls, or 0.0 before any."""
+        if not self._latencies:
+            return 0.0
+        ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, max(0, math.ceil(len(ordered) * pct / 100) - 1))]
+
+
+class AsyncOffloader:
+    """Run blocking calls in an executor with bounded concurrency.
+
+    Args:
+        executor: Executor to run calls in (default: the loop's default
+            thread pool).
+        max_concurrency: Calls allowed to run at once; the rest wait in
+            FIFO order (default 32).
+    """
+
+    def __init__(self, executor: Executor | None = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._executor = executor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.metrics = OffloadMetrics()
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Await ``fn(*args)`` in the executor once a concurrency slot is free."""
+        metrics = self.metrics
+        submitted = time.perf_counter()
+        metrics.queue_depth += 1
+        metrics.max_queue_depth = max(metrics.max_queue_depth, metrics.queue_depth)
+        try:
+            await self._semaphore.acquire()
+        finally:
+            metrics.queue_depth -= 1
+
+        try:
+            started = time.perf_counter()
+            metrics.wait_seconds += started - submitted
+            metrics.running += 1
+            try:
+                result = await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+            except BaseException:
+                metrics.failed += 1
+                raise
+            else:
+                metrics.completed += 1
+                return result
+            finally:
+                finished = time.perf_counter()
+                metrics.running -= 1
+                metrics.run_seconds += finished - started
+                metrics._latencies.append(finished - submitted)
+        finally:
+            self._semaphore.release()
+
+    def run_inline(self, fn: Callable[..., T], *args: Any) -> T:
+        """Call ``fn(*args)`` on the loop thread, counting it in the metrics."""
+        self.metrics.inline += 1
+        return fn(*args)
+
+
+def _is_small(body: Body, inline_max_bytes: int) -> bool:
+    return isinstance(body, (bytes, bytearray, memoryview, str)) and len(body) <= inline_max_bytes
+
+
+class AsyncPayloadSigner:
+    """Awaitable PayloadSigner that signs in an executor.
+
+    Args:
+        signer: The PayloadSigner to wrap.
+        executor: Executor for hashing and signing (default: the loop's
+            default thread pool).
+        max_concurrency: Signatures computed at once (default 32).
+        inline_max_bytes: Sign bodies up to this size on the loop thread
+            (default 4096; 0 offloads everything).
+        offloader: Share an AsyncOffloader (and its limit and metrics)
+            instead of creating one from ``executor`` and ``max_concurrency``.
+    """
+
+    def __init__(
+        self,
+        signer: PayloadSigner,
+        executor: Executor | None = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        inline_max_bytes: int = DEFAULT_INLINE_MAX_BYTES,
+        offloader: AsyncOffloader | None = None,
+    ) -> None:
+        self._signer = signer
+        self._inline_max_bytes = inline_max_bytes
+        self._offloader = offloader or AsyncOffloader(executor, max_concurrency)
+
+    @property
+    def metrics(self) -> OffloadMetrics:
+        return self._offloader.metrics
+
+    async def sign_payload(self, body: Body) -> str:
+        """Sign a JSON payload and return the Authorization header value."""
+        return (await self.sign_payload_detailed(body)).authorization_header
+
+    async def sign_payload_detailed(self, body: Body) -> SignedResult:
+        """Sign a JSON payload and return full signing details."""
+        if _is_small(body, self._inline_max_bytes):
+            return self._offloader.run_inline(self._signer.sign_payload_detailed, body)
+        return await self._offloader.run(self._signer.sign_payload_detailed, body)
+
+    async def sign_many(self, bodies: Iterable[Body]) -> list[SignedResult]:
+        """Sign a batch with one shared timestamp, as a single executor call."""
+        return await self._offloader.run(self._signer.sign_many, list(bodies))
+
+
+# One default AsyncOffloader per event loop (asyncio semaphores are bound to a loop).
+_default_offloaders: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOffloader] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+async def async_verify(
+    body: Body,
+    auth_header: str | ParsedHeader,
+    public_key_base64: str,
+    *,
+    offloader: AsyncOffloader | None = None,
+    inline_max_bytes: int = DEFAULT_INLINE_MAX_BYTES,
+) -> None:
+    """Awaitable verifier.verify, run in an executor for bodies over ``inline_max_bytes``.
+
+    Without ``offloader``, calls on the same event loop share an
+    AsyncOffloader with the default limit.
+
+    Raises:
+        ValueError: If the header is malformed or timestamps are invalid.
+        SignatureVerificationError: If the signature is invalid.
+    """
+    if offloader is None:
+        loop = asyncio.get_running_loop()
+        offloader = _default_offloaders.get(loop)
+        if offloader is None:
+            offloader = _default_offloaders[loop] = AsyncOffloader()
+    if _is_small(body, inline_max_bytes):
+        offloader.run_inline(verify, body, auth_header, public_key_base64)
+    else:
+        await offloader.run(verify, body, auth_header, public_key_base64)
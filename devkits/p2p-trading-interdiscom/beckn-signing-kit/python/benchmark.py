@@ -0,0 +1,303 @@
+"""Microbenchmarks for the Beckn DEG signing kit.
+
+Run from the beckn-signing-kit directory::
+
+    python -m python.benchmark sign-many --count 5000 --workers 4
+    python -m python.benchmark parse-header --count 200000
+    python -m python.benchmark throughput --sizes 1K,1M,50M --batch-sizes 1,100,1000 --output bench.json
+    python -m python.benchmark throughput --baseline bench.json --threshold 0.2
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from .signer import PayloadSigner
+from .verifier import parse_auth_header, verify_at
+
+# Sandbox key from the test suite; benchmarks never leave the process.
+BENCH_SUBSCRIBER_ID = "p2p-trading-sandbox1.com"
+BENCH_KEY_ID = "76EU8aUqHouww7gawT6EibH4bseMCumyDv3sgyXSKENGk8NDcdVwmQ"
+BENCH_PRIVATE_KEY = "Pc6dkYo5LeP0LkwvZXVRV9pcbeh8jDdtdHWymID5cjw="
+BENCH_PUBLIC_KEY = "KVYEWkQB2WwnttVMWfy7KrnqiD51ZDvi8vfCac2IwRE="
+
+DEFAULT_COUNT = 2000
+DEFAULT_BODY_BYTES = 1024
+DEFAULT_PARSE_COUNT = 100_000
+DEFAULT_SIZES = "1K,16K,256K,1M,10M,50M"
+DEFAULT_BATCH_SIZES = "1,10,100,1000"
+DEFAULT_MAX_ITERATIONS = 2000
+# Stop timing a body size once this many bytes have been signed (or verified).
+BYTES_BUDGET_PER_SIZE = 512 << 20
+MIN_ITERATIONS = 5
+DEFAULT_THRESHOLD = 0.2
+SIZE_SUFFIXES = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def make_signer() -> PayloadSigner:
+    return PayloadSigner(
+        subscriber_id=BENCH_SUBSCRIBER_ID,
+        unique_key_id=BENCH_KEY_ID,
+        signing_private_key=BENCH_PRIVATE_KEY,
+    )
+
+
+def make_body(size: int, seq: int = 0) -> bytes:
+    """A JSON ledger-write body padded to roughly ``size`` bytes."""
+    body = {"context": {"action": "on_status", "message_id": f"msg-{seq}"}, "message": {"data": ""}}
+    padding = max(0, size - len(json.dumps(body)))
+    body["message"]["data"] = "x" * padding
+    return json.dumps(body).encode()
+
+
+def _report(label: str, count: int, seconds: float) -> None:
+    print(f"  {label + ':':<34}{count / seconds:>10.0f} ops/s  ({seconds * 1000:.1f} ms)")
+
+
+def bench_sign_many(count: int, body_bytes: int, workers: int) -> None:
+    """Compare a per-call sign_payload_detailed loop with sign_many."""
+    signer = make_signer()
+    bodies = [make_body(body_bytes, seq) for seq in range(count)]
+
+    started = time.perf_counter()
+    for body in bodies:
+        signer.sign_payload_detailed(body)
+    loop_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    signer.sign_many(bodies)
+    batch_seconds = time.perf_counter() - started
+
+    print(f"{count} bodies of ~{body_bytes} bytes")
+    _report("sign_payload_detailed loop", count, loop_seconds)
+    _report("sign_many", count, batch_seconds)
+
+    if workers > 1:
+        started = time.perf_counter()
+        signer.sign_many(bodies, max_workers=workers)
+        threaded_seconds = time.perf_counter() - started
+        _report(f"sign_many(max_workers={workers})", count, threaded_seconds)
+
+
+def bench_parse_header(count: int) -> None:
+    """Authorization header parse throughput, and what reusing a ParsedHeader saves in verify_at."""
+    result = make_signer().sign_payload_detailed(make_body(DEFAULT_BODY_BYTES))
+    header = result.authorization_header
+    body = make_body(DEFAULT_BODY_BYTES)
+    now = result.created_at
+
+    started = time.perf_counter()
+    for _ in range(count):
+        parse_auth_header(header)
+    parse_seconds = time.perf_counter() - started
+
+    verify_count = max(1, count // 100)
+    started = time.perf_counter()
+    for _ in range(verify_count):
+        verify_at(body, header, BENCH_PUBLIC_KEY, now)
+    str_seconds = time.perf_counter() - started
+
+    parsed = parse_auth_header(header)
+    started = time.perf_counter()
+    for _ in range(verify_count):
+        verify_at(body, parsed, BENCH_PUBLIC_KEY, now)
+    parsed_seconds = time.perf_counter() - started
+
+    print(f"{len(header)}-byte Authorization header")
+    _report("parse_auth_header", count, parse_seconds)
+    _report("verify_at(header str)", verify_count, str_seconds)
+    _report("verify_at(ParsedHeader)", verify_count, parsed_seconds)
+
+
+def parse_size(text: str) -> int:
+    """``"64K"`` -> 65536; a bare number is a byte count."""
+    text = text.strip().upper()
+    if text and text[-1] in SIZE_SUFFIXES:
+        return int(text[:-1]) * SIZE_SUFFIXES[text[-1]]
+    return int(text)
+
+
+def format_size(size: int) -> str:
+    for suffix, factor in sorted(SIZE_SUFFIXES.items(), key=lambda item: -item[1]):
+        if size >= factor and size % factor == 0:
+            return f"{size // factor}{suffix}"
+    return str(size)
+
+
+def latency_stats(samples_ns: list[int]) -> dict[str, float]:
+    """ops/s and p50/p99 latency (ms) of per-operation timings."""
+    ordered = sorted(samples_ns)
+    p99_index = min(len(ordered) - 1, math.ceil(len(ordered) * 0.99) - 1)
+    return {
+        "iterations": len(ordered),
+        "ops_per_sec": round(len(ordered) / (sum(ordered) / 1e9), 1),
+        "p50_ms": round(statistics.median(ordered) / 1e6, 4),
+        "p99_ms": round(ordered[p99_index] / 1e6, 4),
+    }
+
+
+def allocation_stats(op) -> dict[str, float]:
+    """Peak and still-held traced allocations (KiB) of one call of ``op``."""
+    tracemalloc.start()
+    try:
+        op()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"alloc_peak_kib": round(peak / 1024, 1), "alloc_retained_kib": round(current / 1024, 1)}
+
+
+def _time_op(op, iterations: int) -> list[int]:
+    samples = []
+    for _ in range(iterations):
+        started = time.perf_counter_ns()
+        op()
+        samples.append(time.perf_counter_ns() - started)
+    return samples
+
+
+def bench_throughput(sizes: list[int], batch_sizes: list[int], max_iterations: int) -> dict:
+    """Time _sign_payload_at and verify_at per body size, and sign_many per batch size."""
+    signer = make_signer()
+    report: dict = {"python": platform.python_version(), "sizes": {}, "batches": {}}
+
+    for size in sizes:
+        body = make_body(size)
+        result = signer._sign_payload_at(body, int(time.time()))
+        header = parse_auth_header(result.authorization_header)
+        now = result.created_at
+        iterations = max(MIN_ITERATIONS, min(max_iterations, BYTES_BUDGET_PER_SIZE // len(body)))
+
+        def sign() -> None:
+            signer._sign_payload_at(body, now)
+
+        def verify() -> None:
+            verify_at(body, header, BENCH_PUBLIC_KEY, now)
+
+        entry = {"body_bytes": len(body)}
+        for name, op in (("sign", sign), ("verify", verify)):
+            op()  # warm up
+            stats = latency_stats(_time_op(op, iterations))
+            stats["mb_per_sec"] = round(stats["ops_per_sec"] * len(body) / (1 << 20), 1)
+            stats.update(allocation_stats(op))
+            entry[name] = stats
+        report["sizes"][format_size(size)] = entry
+
+    bodies = [make_body(DEFAULT_BODY_BYTES, seq) for seq in range(max(batch_sizes, default=0))]
+    for batch_size in batch_sizes:
+        batch = bodies[:batch_size]
+        rounds = max(MIN_ITERATIONS, min(max_iterations, max_iterations * 10 // batch_size))
+        samples = _time_op(lambda: signer.sign_many(batch), rounds)
+        stats = latency_stats(samples)
+        stats["bodies_per_sec"] = round(stats["ops_per_sec"] * batch_size, 1)
+        stats.update(allocation_stats(lambda: signer.sign_many(batch)))
+        report["batches"][str(batch_size)] = stats
+    return report
+
+
+def print_throughput(report: dict) -> None:
+    print(f"{'size':>6} {'op':<7}{'ops/s':>10}{'MB/s':>9}{'p50 ms':>11}{'p99 ms':>11}{'peak KiB':>10}  runs")
+    for label, entry in report["sizes"].items():
+        for name in ("sign", "verify"):
+            stats = entry[name]
+            print(
+                f"{label:>6} {name:<7}{stats['ops_per_sec']:>10.0f}{stats['mb_per_sec']:>9.1f}"
+                f"{stats['p50_ms']:>11.3f}{stats['p99_ms']:>11.3f}{stats['alloc_peak_kib']:>10.1f}"
+                f"  {stats['iterations']}"
+            )
+    if report["batches"]:
+        print(f"\nsign_many of ~{format_size(DEFAULT_BODY_BYTES)} bodies")
+        print(f"{'batch':>6} {'bodies/s':>10}{'p50 ms':>11}{'p99 ms':>11}{'peak KiB':>10}  runs")
+        for label, stats in report["batches"].items():
+            print(
+                f"{label:>6} {stats['bodies_per_sec']:>10.0f}{stats['p50_ms']:>11.3f}"
+                f"{stats['p99_ms']:>11.3f}{stats['alloc_peak_kib']:>10.1f}  {stats['iterations']}"
+            )
+
+
+def compare_throughput(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """Describe every throughput that dropped below baseline by more than threshold (a fraction)."""
+    pairs = []
+    for label, entry in report["sizes"].items():
+        previous = baseline.get("sizes", {}).get(label, {})
+        for name in ("sign", "verify"):
+            pairs.append((f"{label} {name}", entry[name]["ops_per_sec"], previous.get(name, {}).get("ops_per_sec")))
+    for label, stats in report["batches"].items():
+        previous = baseline.get("batches", {}).get(label, {})
+        pairs.append((f"sign_many batch {label}", stats["bodies_per_sec"], previous.get("bodies_per_sec")))
+
+    regressions = []
+    for label, current, previous in pairs:
+        if previous and (previous - current) / previous > threshold:
+            regressions.append(f"{label}: {previous:g} -> {current:g} ops/s ({(current - previous) / previous:+.0%})")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    sign_many = subparsers.add_parser("sign-many", help="sign_many vs. a per-call signing loop")
+    sign_many.add_argument("--count", type=int, default=DEFAULT_COUNT, help="bodies per batch")
+    sign_many.add_argument("--body-bytes", type=int, default=DEFAULT_BODY_BYTES, help="approximate body size")
+    sign_many.add_argument(
+        "--workers", type=int, default=os.cpu_count() or 1, help="threads for the threaded sign_many run"
+    )
+
+    parse_header = subparsers.add_parser("parse-header", help="Authorization header parse throughput")
+    parse_header.add_argument("--count", type=int, default=DEFAULT_PARSE_COUNT, help="headers to parse")
+
+    throughput = subparsers.add_parser(
+        "throughput", help="sign/verify ops/s, p50/p99 latency and allocations by body and batch size"
+    )
+    throughput.add_argument("--sizes", default=DEFAULT_SIZES, help=f"body sizes (default {DEFAULT_SIZES})")
+    throughput.add_argument(
+        "--batch-sizes", default=DEFAULT_BATCH_SIZES, help=f"sign_many batch sizes (default {DEFAULT_BATCH_SIZES})"
+    )
+    throughput.add_argument(
+        "--max-iterations", type=int, default=DEFAULT_MAX_ITERATIONS, help="timed calls per body size, at most"
+    )
+    throughput.add_argument("--output", help="also write the results as JSON (usable as a later --baseline)")
+    throughput.add_argument("--baseline", help="compare against a report written by --output")
+    throughput.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"relative slowdown counted as a regression (default {DEFAULT_THRESHOLD})",
+    )
+
+    args = parser.parse_args()
+    if args.benchmark == "throughput":
+        report = bench_throughput(
+            [parse_size(size) for size in args.sizes.split(",") if size],
+            [int(batch) for batch in args.batch_sizes.split(",") if batch],
+            args.max_iterations,
+        )
+        print_throughput(report)
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        if args.baseline:
+            with open(args.baseline) as f:
+                regressions = compare_throughput(report, json.load(f), args.threshold)
+            if regressions:
+                print(f"\nRegressions against {args.baseline} (threshold {args.threshold:.0%}):")
+                for regression in regressions:
+                    print(f"  {regression}")
+                return 1
+            print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%})")
+    elif args.benchmark == "sign-many":
+        bench_sign_many(args.count, args.body_bytes, args.workers)
+    elif args.benchmark == "parse-header":
+        bench_parse_header(args.count)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
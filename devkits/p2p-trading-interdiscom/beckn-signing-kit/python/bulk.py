@@ -0,0 +1,302 @@
+"""Bulk verification of archived (body, Authorization header) pairs.
+
+Fans verification out over a process pool (Ed25519 verification is CPU
+bound, so throughput scales with cores), reports a pass/fail reason per
+record, and can flag replayed signatures.
+
+Archived records are verified as of their own ``created`` timestamp by
+default, so old traffic does not fail as expired.
+
+Usage::
+
+    with open("ledger-traffic.ndjson", "rb") as f:
+        stats = BulkVerifyStats()
+        for result in verify_bulk(iter_ndjson_records(f), keys=keys, processes=8,
+                                  replay_cache=ReplayCache(), stats=stats):
+            if not result.ok or result.replay:
+                print(result)
+    print(stats)
+
+or from the beckn-signing-kit directory::
+
+    python -m python.bulk ledger-traffic.ndjson --keys registry-keys.json --processes 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import heapq
+import itertools
+import json
+import os
+import sys
+import time
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import BinaryIO
+
+from .keystore import CachingVerifier, KeyStore, _keys_from_records
+from .verifier import ParsedHeader, parse_auth_header, verify_at
+
+DEFAULT_BATCH_SIZE = 2000
+DEFAULT_MAX_SEEN_SIGNATURES = 1_000_000
+
+
+@dataclass(frozen=True)
+class InvalidRecord:
+    """An input record that could not be read; verify_bulk reports it as failed."""
+
+    reason: str
+
+
+Record = "tuple[bytes | str, str] | InvalidRecord"
+
+
+@dataclass
+class BulkVerifyResult:
+    index: int
+    ok: bool
+    reason: str = ""
+    replay: bool = False
+
+
+@dataclass
+class BulkVerifyStats:
+    records: int = 0
+    passed: int = 0
+    failed: int = 0
+    replays: int = 0
+    seconds: float = 0.0
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def records_per_sec(self) -> float:
+        return self.records / self.seconds if self.seconds else 0.0
+
+    def add(self, result: BulkVerifyResult) -> None:
+        self.records += 1
+        if result.ok:
+            self.passed += 1
+        else:
+            self.failed += 1
+        if result.replay:
+            self.replays += 1
+        self.seconds = time.perf_counter() - self._started
+
+
+class ReplayCache:
+    """Bounded set of seen signatures, each forgotten once its ``expires`` has passed.
+
+    "Now" is the ``created`` time of the record being checked, so archived
+    traffic replays in its own timeline. When full, the signatures closest to
+    expiry are dropped first.
+
+    Args:
+        max_entries: Maximum number of signatures remembered (default 1,000,000).
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_SEEN_SIGNATURES) -> None:
+        self._max_entries = max_entries
+        self._expires: dict[str, int] = {}
+        self._heap: list[tuple[int, str]] = []
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+    def seen(self, signature: str, created: int, expires: int) -> bool:
+        """Record a signature and return True if it was already seen and is still live."""
+        while self._heap and (self._heap[0][0] < created or len(self._expires) >= self._max_entries):
+            heap_expires, old_signature = heapq.heappop(self._heap)
+            if self._expires.get(old_signature) == heap_expires:
+                del self._expires[old_signature]
+        if signature in self._expires:
+            return True
+        self._expires[signature] = expires
+        heapq.heappush(self._heap, (expires, signature))
+        return False
+
+
+def iter_ndjson_records(f: BinaryIO) -> Iterator[Record]:
+    """Read ``{"body": ..., "authorization": ...}`` records, one JSON object per line.
+
+    ``body`` must be the exact signed payload text (or ``body_base64`` its raw
+    bytes); re-serializing a parsed JSON object would change the digest. A line
+    that is not such a record yields an InvalidRecord naming the line, so one bad
+    line does not stop a bulk run.
+    """
+    for line_no, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("expected a JSON object")
+            if "body_base64" in record:
+                body = base64.b64decode(record["body_base64"])
+            elif isinstance(record.get("body"), str):
+                body = record["body"]
+            else:
+                raise ValueError("expected a string 'body' or 'body_base64'")
+            if not isinstance(record.get("authorization"), str):
+                raise ValueError("expected a string 'authorization'")
+        except (ValueError, TypeError) as exc:
+            yield InvalidRecord(f"line {line_no}: {exc}")
+            continue
+        yield body, record["authorization"]
+
+
+VerifyFn = Callable[["bytes | str", ParsedHeader, int], None]
+
+
+def _make_verify(public_key_base64: str | None, keys: dict[str, str] | None) -> VerifyFn:
+    if keys is not None:
+        return CachingVerifier(KeyStore(lambda s, k: keys.get(f"{s}|{k}"))).verify_at
+    return lambda body, header, now: verify_at(body, header, public_key_base64, now)
+
+
+def _check_record(verify: VerifyFn, record: tuple[bytes | str, str, int | None]) -> str:
+    """Verify one record; returns "" on success or the failure reason."""
+    body, auth_header, now_unix = record
+    try:
+        parsed = parse_auth_header(auth_header)
+        verify(body, parsed, parsed.created if now_unix is None else now_unix)
+    except Exception as exc:
+        return str(exc) or type(exc).__name__
+    return ""
+
+
+# Per-process verifier, installed by _init_worker.
+_worker_verify: VerifyFn | None = None
+
+
+def _init_worker(public_key_base64: str | None, keys: dict[str, str] | None) -> None:
+    global _worker_verify
+    _worker_verify = _make_verify(public_key_base64, keys)
+
+
+def _verify_record(record: tuple[bytes | str, str, int | None]) -> str:
+    return _check_record(_worker_verify, record)
+
+
+def verify_bulk(
+    records: Iterable[Record],
+    *,
+    public_key_base64: str | None = None,
+    keys: dict[str, str] | None = None,
+    processes: int = 1,
+    replay_cache: ReplayCache | None = None,
+    now_unix: int | None = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    stats: BulkVerifyStats | None = None,
+) -> Iterator[BulkVerifyResult]:
+    """Verify (body, auth_header) pairs, yielding one result per record in order.
+
+    Args:
+        records: Iterable of (body, auth_header) or InvalidRecord (reported as
+            failed with its reason); consumed lazily, in batches.
+        public_key_base64: Verify every record against this key, or
+        keys: resolve each record's keyId in a {"subscriber_id|unique_key_id": key} map.
+        processes: Worker processes (default 1, verify inline).
+        replay_cache: If given, flag signatures already seen and not yet expired.
+        now_unix: Verify as of this time; default is each record's own ``created``.
+        batch_size: Records handed to the pool at a time (bounds memory).
+        stats: If given, updated with counts and throughput as results are yielded.
+    """
+    if (public_key_base64 is None) == (keys is None):
+        raise ValueError("verifier: pass exactly one of public_key_base64 and keys")
+
+    executor = None
+    inline_verify = None
+    if processes > 1:
+        executor = ProcessPoolExecutor(
+            max_workers=processes, initializer=_init_worker, initargs=(public_key_base64, keys)
+        )
+    else:
+        inline_verify = _make_verify(public_key_base64, keys)
+
+    try:
+        index = 0
+        records = iter(records)
+        while batch := list(itertools.islice(records, batch_size)):
+            work = [(record[0], record[1], now_unix) for record in batch if not isinstance(record, InvalidRecord)]
+            if executor is not None:
+                chunksize = max(1, len(work) // (processes * 4))
+                reasons = iter(executor.map(_verify_record, work, chunksize=chunksize))
+            else:
+                reasons = (_check_record(inline_verify, record) for record in work)
+            for record in batch:
+                if isinstance(record, InvalidRecord):
+                    result = BulkVerifyResult(index=index, ok=False, reason=record.reason)
+                    if stats is not None:
+                        stats.add(result)
+                    yield result
+                    index += 1
+                    continue
+                auth_header = record[1]
+                reason = next(reasons)
+                replay = False
+                if replay_cache is not None:
+                    try:
+                        parsed = parse_auth_header(auth_header)
+                    except ValueError:
+                        pass
+                    else:
+                        replay = replay_cache.seen(parsed.signature, parsed.created, parsed.expires)
+                result = BulkVerifyResult(index=index, ok=not reason, reason=reason, replay=replay)
+                if stats is not None:
+                    stats.add(result)
+                yield result
+                index += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk-verify archived signed Beckn traffic (NDJSON)")
+    parser.add_argument("path", help='NDJSON file of {"body": ..., "authorization": ...} records ("-" for stdin)')
+    key_source = parser.add_mutually_exclusive_group(required=True)
+    key_source.add_argument("--public-key", help="Base64 Ed25519 public key for every record")
+    key_source.add_argument("--keys", help="JSON key file (same formats as JsonFileKeyLookup)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--no-replay-check", action="store_true", help="do not flag replayed signatures")
+    parser.add_argument("--now", type=int, help="verify as of this Unix time instead of each record's created")
+    args = parser.parse_args()
+
+    keys = None
+    if args.keys:
+        with open(args.keys, encoding="utf-8") as f:
+            keys = _keys_from_records(json.load(f))
+
+    stats = BulkVerifyStats()
+    replay_cache = None if args.no_replay_check else ReplayCache()
+    f = sys.stdin.buffer if args.path == "-" else open(args.path, "rb")
+    try:
+        for result in verify_bulk(
+            iter_ndjson_records(f),
+            public_key_base64=args.public_key,
+            keys=keys,
+            processes=args.processes,
+            replay_cache=replay_cache,
+            now_unix=args.now,
+            stats=stats,
+        ):
+            if not result.ok or result.replay:
+                print(json.dumps({"record": result.index, "ok": result.ok, "reason": result.reason,
+                                  "replay": result.replay}))
+    finally:
+        if f is not sys.stdin.buffer:
+            f.close()
+
+    print(
+        f"{stats.records} records: {stats.passed} passed, {stats.failed} failed, {stats.replays} replays "
+        f"in {stats.seconds:.2f}s ({stats.records_per_sec:.0f} records/s, {args.processes} processes)",
+        file=sys.stderr,
+    )
+    return 1 if stats.failed or stats.replays else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
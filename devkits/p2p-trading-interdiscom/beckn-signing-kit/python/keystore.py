@@ -0,0 +1,229 @@
+"""Public-key lookup and caching for verifying inbound Beckn signatures.
+
+Receivers usually do not know the sender's key up front: the Authorization
+header names it in ``keyId="{subscriber_id}|{unique_key_id}|ed25519"``.
+A KeyStore resolves that pair to a decoded Ed25519 public key through a
+pluggable lookup and caches the result (including misses) for a TTL.
+
+Usage::
+
+    store = KeyStore(JsonFileKeyLookup("registry-keys.json"))
+    verifier = CachingVerifier(store)
+
+    verifier.verify(body, auth_header)  # raises on failure
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from collections.abc import Callable
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+from .signer import Body
+from .verifier import (
+    ParsedHeader,
+    SignatureVerificationError,
+    _verify_with_key,
+    parse_auth_header,
+    parse_key_id,
+)
+
+DEFAULT_KEY_TTL_SECONDS = 300  # 5 minutes
+DEFAULT_NEGATIVE_TTL_SECONDS = 30
+DEFAULT_MAX_KEYS = 1024
+DEFAULT_LOOKUP_TIMEOUT_SECONDS = 5
+
+# (subscriber_id, unique_key_id) -> base64 Ed25519 public key, or None if unknown.
+KeyLookup = Callable[[str, str], str | None]
+
+
+class UnknownKeyError(SignatureVerificationError):
+    """Raised when the keyId in a header cannot be resolved to a public key."""
+
+
+class JsonFileKeyLookup:
+    """Resolve keys from a local JSON file, re-read when the file changes.
+
+    The file is either an object mapping ``"subscriber_id|unique_key_id"`` to a
+    base64 public key, or a list of registry records with ``subscriber_id``,
+    ``unique_key_id`` (or ``ukId``) and ``signing_public_key``.
+
+    Args:
+        path: Path to the JSON file.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self._path = os.fspath(path)
+        self._mtime_ns: int | None = None
+        self._keys: dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, subscriber_id: str, unique_key_id: str) -> str | None:
+        mtime_ns = os.stat(self._path).st_mtime_ns
+        with self._lock:
+            if mtime_ns != self._mtime_ns:
+                with open(self._path, encoding="utf-8") as f:
+                    self._keys = _keys_from_records(json.load(f))
+                self._mtime_ns = mtime_ns
+            return self._keys.get(f"{subscriber_id}|{unique_key_id}")
+
+
+class HttpRegistryKeyLookup:
+    """Resolve keys through a Beckn registry ``/lookup`` endpoint.
+
+    POSTs ``{"subscriber_id": ..., "ukId": ...}`` and reads
+    ``signing_public_key`` from the first matching record in the response.
+
+    Args:
+        lookup_url: Full URL of the lookup endpoint.
+        timeout: Request timeout in seconds (default 5).
+    """
+
+    def __init__(self, lookup_url: str, timeout: float = DEFAULT_LOOKUP_TIMEOUT_SECONDS) -> None:
+        self._lookup_url = lookup_url
+        self._timeout = timeout
+
+    def __call__(self, subscriber_id: str, unique_key_id: str) -> str | None:
+        request = urllib.request.Request(
+            self._lookup_url,
+            data=json.dumps({"subscriber_id": subscriber_id, "ukId": unique_key_id}).encode(),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self._timeout) as response:
+            records = json.load(response)
+        return _keys_from_records(records).get(f"{subscriber_id}|{unique_key_id}")
+
+
+class KeyStore:
+    """Cache of decoded Ed25519 public keys in front of a KeyLookup.
+
+    Found keys are cached for ``ttl`` seconds and unknown keys for
+    ``negative_ttl`` seconds, so a flood of requests with a bogus keyId does
+    not hit the lookup on every call. The least recently used entries are
+    evicted beyond ``max_keys``. Safe to share between threads.
+
+    Args:
+        lookup: Callable resolving (subscriber_id, unique_key_id) to a base64
+            public key, or None if the key is unknown.
+        ttl: Seconds to cache a found key (default 300).
+        negative_ttl: Seconds to cache an unknown key (default 30).
+        max_keys: Maximum number of cached entries (default 1024).
+    """
+
+    def __init__(
+        self,
+        lookup: KeyLookup,
+        ttl: float = DEFAULT_KEY_TTL_SECONDS,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL_SECONDS,
+        max_keys: int = DEFAULT_MAX_KEYS,
+    ) -> None:
+        self._lookup = lookup
+        self._ttl = ttl
+        self._negative_ttl = negative_ttl
+        self._max_keys = max_keys
+        # (subscriber_id, unique_key_id) -> (expires_at, public key or None)
+        self._entries: OrderedDict[tuple[str, str], tuple[float, Ed25519PublicKey | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, subscriber_id: str, unique_key_id: str) -> Ed25519PublicKey:
+        """Return the public key for a subscriber's key ID.
+
+        Raises:
+            UnknownKeyError: If the lookup does not know the key.
+            ValueError: If the lookup returned a malformed key.
+        """
+        cache_key = (subscriber_id, unique_key_id)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] > now:
+                self.hits += 1
+                self._entries.move_to_end(cache_key)
+                public_key = entry[1]
+                if public_key is None:
+                    raise UnknownKeyError(f"verifier: unknown keyId {subscriber_id}|{unique_key_id}")
+                return public_key
+            self.misses += 1
+
+        # Look up outside the lock so a slow registry does not block cached keys.
+        public_key_base64 = self._lookup(subscriber_id, unique_key_id)
+        public_key = _decode_public_key(public_key_base64) if public_key_base64 else None
+        ttl = self._ttl if public_key is not None else self._negative_ttl
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic() + ttl, public_key)
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self._max_keys:
+                self._entries.popitem(last=False)
+
+        if public_key is None:
+            raise UnknownKeyError(f"verifier: unknown keyId {subscriber_id}|{unique_key_id}")
+        return public_key
+
+    def invalidate(self, subscriber_id: str, unique_key_id: str) -> None:
+        """Drop a cached entry, e.g. after the sender announced a key rotation."""
+        with self._lock:
+            self._entries.pop((subscriber_id, unique_key_id), None)
+
+
+class CachingVerifier:
+    """Verify Authorization headers using the keyId they carry.
+
+    Args:
+        key_store: KeyStore resolving keyIds to public keys.
+    """
+
+    def __init__(self, key_store: KeyStore) -> None:
+        self._key_store = key_store
+
+    def verify(self, body: Body, auth_header: str | ParsedHeader) -> None:
+        """Verify a header against the key named in its keyId.
+
+        Raises:
+            ValueError: If the header is malformed or timestamps are invalid.
+            UnknownKeyError: If the keyId cannot be resolved.
+            SignatureVerificationError: If the signature is invalid.
+        """
+        self.verify_at(body, auth_header, int(time.time()))
+
+    def verify_at(self, body: Body, auth_header: str | ParsedHeader, now_unix: int) -> None:
+        """Verify at a specific Unix timestamp (useful for testing)."""
+        parsed = parse_auth_header(auth_header)
+        if parsed.key_id is None:
+            raise ValueError("missing 'keyId' in auth header")
+        key_id = parse_key_id(parsed.key_id)
+        if key_id["algorithm"] != "ed25519":
+            raise ValueError(f"verifier: unsupported algorithm {key_id['algorithm']!r}")
+
+        public_key = self._key_store.get(key_id["subscriber_id"], key_id["unique_key_id"])
+        _verify_with_key(body, parsed.created, parsed.expires, parsed.signature, public_key, now_unix)
+
+
+def _decode_public_key(public_key_base64: str) -> Ed25519PublicKey:
+    try:
+        return Ed25519PublicKey.from_public_bytes(base64.b64decode(public_key_base64, validate=True))
+    except Exception as exc:
+        raise ValueError(f"verifier: invalid public key: {exc}") from exc
+
+
+def _keys_from_records(data: object) -> dict[str, str]:
+    """Normalize a key file or registry response to {"subscriber|ukId": public_key}."""
+    if isinstance(data, dict):
+        return {str(k): str(v) for k, v in data.items()}
+    keys: dict[str, str] = {}
+    for record in data if isinstance(data, list) else []:
+        if not isinstance(record, dict):
+            continue
+        unique_key_id = record.get("unique_key_id") or record.get("ukId")
+        if record.get("subscriber_id") and unique_key_id and record.get("signing_public_key"):
+            keys[f"{record['subscriber_id']}|{unique_key_id}"] = record["signing_public_key"]
+    return keys
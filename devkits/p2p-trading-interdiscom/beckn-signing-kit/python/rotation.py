@@ -0,0 +1,344 @@
+"""Key rotation without restarts: keyring-backed signing and verification.
+
+A KeyringSigner holds several Ed25519 keys, each with an optional validity
+window, and signs with the newest key valid at the signing time. A
+KeyringVerifier accepts a signature from any key whose window contains the
+signature's ``created`` time, so old and new keys both verify while their
+windows overlap.
+
+Both can be loaded from a JSON key file that is re-read when it changes. The
+replacement key set is built off to the side and swapped in with a single
+attribute assignment, so signing and verifying never take a lock. A file
+that fails to load (e.g. caught mid-write) leaves the previous keys in place
+and is retried on the next check.
+
+Signer key file (a list; times are Unix seconds or ISO 8601)::
+
+    [
+      {"unique_key_id": "k1", "signing_private_key": "...", "valid_until": "2025-07-01T00:00:00Z"},
+      {"unique_key_id": "k2", "signing_private_key": "...", "valid_from": "2025-06-24T00:00:00Z"}
+    ]
+
+Verifier key files list registry-style records: ``subscriber_id``,
+``unique_key_id`` (or ``ukId``), ``signing_public_key`` and optional
+``valid_from`` / ``valid_until``.
+
+Usage::
+
+    signer = KeyringSigner.from_file("signing-keys.json", subscriber_id="bpp.example.com")
+    auth_header = signer.sign_payload(body)
+
+    verifier = KeyringVerifier.from_file("trusted-keys.json")
+    verifier.verify(body, auth_header)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Generic, TypeVar
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
+
+from .keystore import UnknownKeyError, _decode_public_key
+from .signer import DEFAULT_EXPIRY_SECONDS, Body, PayloadSigner, SignedHeaderCache, SignedResult
+from .verifier import ParsedHeader, _verify_with_key, parse_auth_header, parse_key_id
+
+DEFAULT_RELOAD_CHECK_SECONDS = 5.0
+
+K = TypeVar("K")
+
+
+@dataclass(frozen=True)
+class SigningKey:
+    unique_key_id: str
+    signing_private_key: str
+    valid_from: int | None = None
+    valid_until: int | None = None
+
+
+@dataclass(frozen=True)
+class VerificationKey:
+    subscriber_id: str
+    unique_key_id: str
+    signing_public_key: str
+    valid_from: int | None = None
+    valid_until: int | None = None
+
+
+def _valid_at(valid_from: int | None, valid_until: int | None, now_unix: int) -> bool:
+    return (valid_from is None or valid_from <= now_unix) and (valid_until is None or now_unix <= valid_until)
+
+
+class KeyringSigner:
+    """Sign with whichever of several keys is active at the signing time.
+
+    The active key is the one with the latest ``valid_from`` whose window
+    contains the current time, so a successor key takes over as soon as it
+    becomes valid. Output is identical to a PayloadSigner for that key.
+
+    Args:
+        subscriber_id: Network participant ID.
+        keys: Initial signing keys.
+        expiry_seconds: Signature validity window in seconds (default 300).
+        header_cache: Optional SignedHeaderCache shared by every key.
+    """
+
+    def __init__(
+        self,
+        subscriber_id: str,
+        keys: Iterable[SigningKey] = (),
+        expiry_seconds: int = DEFAULT_EXPIRY_SECONDS,
+        header_cache: SignedHeaderCache | None = None,
+    ) -> None:
+        if not subscriber_id:
+            raise ValueError("signer: subscriber_id is required")
+        self._subscriber_id = subscriber_id
+        self._expiry_seconds = expiry_seconds
+        self._header_cache = header_cache
+        # Newest first: (valid_from, valid_until, unique_key_id, signer). Replaced, never mutated.
+        self._keys: tuple[tuple[int | None, int | None, str, PayloadSigner], ...] = ()
+        self._watch: _WatchedKeyFile[SigningKey] | None = None
+        self.set_keys(keys)
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str | os.PathLike[str],
+        subscriber_id: str,
+        expiry_seconds: int = DEFAULT_EXPIRY_SECONDS,
+        header_cache: SignedHeaderCache | None = None,
+        check_interval: float = DEFAULT_RELOAD_CHECK_SECONDS,
+    ) -> KeyringSigner:
+        """Load keys from a JSON file, re-read when it changes (checked every ``check_interval`` s)."""
+        signer = cls(subscriber_id, expiry_seconds=expiry_seconds, header_cache=header_cache)
+        signer._watch = _WatchedKeyFile(path, _signing_keys_from_records, signer.set_keys, check_interval)
+        return signer
+
+    @property
+    def reload_error(self) -> Exception | None:
+        """Why the key file last failed to load, or None if the current file loaded."""
+        return self._watch.last_error if self._watch is not None else None
+
+    def set_keys(self, keys: Iterable[SigningKey]) -> None:
+        """Atomically replace the key set; in-flight signatures finish with the old one."""
+        entries = [
+            (
+                key.valid_from,
+                key.valid_until,
+                key.unique_key_id,
+                PayloadSigner(
+                    self._subscriber_id,
+                    key.unique_key_id,
+                    key.signing_private_key,
+                    self._expiry_seconds,
+                    header_cache=self._header_cache,
+                ),
+            )
+            for key in keys
+        ]
+        entries.sort(key=lambda entry: entry[0] if entry[0] is not None else float("-inf"), reverse=True)
+        self._keys = tuple(entries)
+
+    def active_key_id(self, now_unix: int | None = None) -> str:
+        """unique_key_id of the key that would sign at ``now_unix`` (default now)."""
+        return self._active(int(time.time()) if now_unix is None else now_unix)[0]
+
+    def sign_payload(self, body: Body) -> str:
+        """Sign a JSON payload and return the Authorization header value."""
+        return self.sign_payload_detailed(body).authorization_header
+
+    def sign_payload_detailed(self, body: Body) -> SignedResult:
+        """Sign a JSON payload and return full signing details."""
+        return self._sign_payload_at(body, int(time.time()))
+
+    def sign_many(self, bodies: Iterable[Body], max_workers: int = 1) -> list[SignedResult]:
+        """Sign a batch with one shared timestamp and one key (see PayloadSigner.sign_many)."""
+        now = int(time.time())
+        return self._active(now)[1]._sign_many_at(bodies, now, max_workers)
+
+    def _sign_payload_at(self, body: Body, now_unix: int) -> SignedResult:
+        """Sign at a specific Unix timestamp (used for deterministic testing)."""
+        return self._active(now_unix)[1]._sign_payload_at(body, now_unix)
+
+    def _active(self, now_unix: int) -> tuple[str, PayloadSigner]:
+        if self._watch is not None:
+            self._watch.poll()
+        for valid_from, valid_until, unique_key_id, signer in self._keys:
+            if _valid_at(valid_from, valid_until, now_unix):
+                return unique_key_id, signer
+        raise ValueError(f"signer: no signing key valid at {now_unix}")
+
+
+class KeyringVerifier:
+    """Verify headers against trusted keys that each have a validity window.
+
+    The header's keyId selects the key, and the signature's ``created`` time
+    must fall inside that key's window. During a rotation both keys are
+    listed, so traffic signed with either verifies.
+
+    Args:
+        keys: Initial trusted keys.
+    """
+
+    def __init__(self, keys: Iterable[VerificationKey] = ()) -> None:
+        # (subscriber_id, unique_key_id) -> (valid_from, valid_until, public key). Replaced, never mutated.
+        self._keys: dict[tuple[str, str], tuple[int | None, int | None, Ed25519PublicKey]] = {}
+        self._watch: _WatchedKeyFile[VerificationKey] | None = None
+        self.set_keys(keys)
+
+    @classmethod
+    def from_file(
+        cls, path: str | os.PathLike[str], check_interval: float = DEFAULT_RELOAD_CHECK_SECONDS
+    ) -> KeyringVerifier:
+        """Load trusted keys from a JSON file, re-read when it changes."""
+        verifier = cls()
+        verifier._watch = _WatchedKeyFile(path, _verification_keys_from_records, verifier.set_keys, check_interval)
+        return verifier
+
+    @property
+    def reload_error(self) -> Exception | None:
+        """Why the key file last failed to load, or None if the current file loaded."""
+        return self._watch.last_error if self._watch is not None else None
+
+    def set_keys(self, keys: Iterable[VerificationKey]) -> None:
+        """Atomically replace the trusted key set."""
+        self._keys = {
+            (key.subscriber_id, key.unique_key_id): (
+                key.valid_from,
+                key.valid_until,
+                _decode_public_key(key.signing_public_key),
+            )
+            for key in keys
+        }
+
+    def verify(self, body: Body, auth_header: str | ParsedHeader) -> None:
+        """Verify a header against the trusted key named in its keyId.
+
+        Raises:
+            ValueError: If the header is malformed or timestamps are invalid.
+            UnknownKeyError: If the keyId is not trusted, or was not valid
+                when the signature was created.
+            SignatureVerificationError: If the signature is invalid.
+        """
+        self.verify_at(body, auth_header, int(time.time()))
+
+    def verify_at(self, body: Body, auth_header: str | ParsedHeader, now_unix: int) -> None:
+        """Verify at a specific Unix timestamp (useful for testing)."""
+        parsed = parse_auth_header(auth_header)
+        if parsed.key_id is None:
+            raise ValueError("missing 'keyId' in auth header")
+        key_id = parse_key_id(parsed.key_id)
+        if key_id["algorithm"] != "ed25519":
+            raise ValueError(f"verifier: unsupported algorithm {key_id['algorithm']!r}")
+
+        if self._watch is not None:
+            self._watch.poll()
+        name = f"{key_id['subscriber_id']}|{key_id['unique_key_id']}"
+        entry = self._keys.get((key_id["subscriber_id"], key_id["unique_key_id"]))
+        if entry is None:
+            raise UnknownKeyError(f"verifier: unknown keyId {name}")
+        valid_from, valid_until, public_key = entry
+        if not _valid_at(valid_from, valid_until, parsed.created):
+            raise UnknownKeyError(f"verifier: keyId {name} was not valid at created {parsed.created}")
+        _verify_with_key(body, parsed.created, parsed.expires, parsed.signature, public_key, now_unix)
+
+
+class _WatchedKeyFile(Generic[K]):
+    """Re-read a JSON key file when its mtime changes, at most every ``check_interval`` seconds.
+
+    poll() is called on the hot path: between checks it is one clock read,
+    and only one thread at a time stats and reloads the file while the
+    others carry on with the current keys.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        parse: Callable[[object], list[K]],
+        on_change: Callable[[list[K]], None],
+        check_interval: float,
+    ) -> None:
+        self._path = os.fspath(path)
+        self._parse = parse
+        self._on_change = on_change
+        self._check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime_ns: int | None = None
+        self._next_check = 0.0
+        self.last_error: Exception | None = None
+        # The first load must succeed; there are no previous keys to fall back on.
+        self._load(os.stat(self._path).st_mtime_ns)
+
+    def poll(self) -> None:
+        if time.monotonic() < self._next_check or not self._lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = time.monotonic() + self._check_interval
+            try:
+                mtime_ns = os.stat(self._path).st_mtime_ns
+                if mtime_ns != self._mtime_ns:
+                    self._load(mtime_ns)
+            except Exception as exc:
+                self.last_error = exc
+        finally:
+            self._lock.release()
+
+    def _load(self, mtime_ns: int) -> None:
+        with open(self._path, encoding="utf-8") as f:
+            keys = self._parse(json.load(f))
+        self._on_change(keys)
+        self._mtime_ns = mtime_ns
+        self.last_error = None
+
+
+def _parse_time(value: object) -> int | None:
+    """Unix seconds from a number or an ISO 8601 string (UTC unless it has an offset)."""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return int(value)
+    if isinstance(value, str):
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return int(parsed.timestamp())
+    raise ValueError(f"invalid key validity time: {value!r}")
+
+
+def _records(data: object) -> list[dict]:
+    if isinstance(data, dict) and isinstance(data.get("keys"), list):
+        data = data["keys"]
+    if not isinstance(data, list) or not all(isinstance(record, dict) for record in data):
+        raise ValueError("key file must contain a list of key records")
+    return data
+
+
+def _signing_keys_from_records(data: object) -> list[SigningKey]:
+    return [
+        SigningKey(
+            unique_key_id=record.get("unique_key_id") or record["ukId"],
+            signing_private_key=record["signing_private_key"],
+            valid_from=_parse_time(record.get("valid_from")),
+            valid_until=_parse_time(record.get("valid_until")),
+        )
+        for record in _records(data)
+    ]
+
+
+def _verification_keys_from_records(data: object) -> list[VerificationKey]:
+    return [
+        VerificationKey(
+            subscriber_id=record["subscriber_id"],
+            unique_key_id=record.get("unique_key_id") or record["ukId"],
+            signing_public_key=record["signing_public_key"],
+            valid_from=_parse_time(record.get("valid_from")),
+            valid_until=_parse_time(record.get("valid_until")),
+        )
+        for record in _records(data)
+    ]
@@ -12,18 +12,42 @@ Usage::
     )
 
     auth_header = signer.sign_payload(payload_bytes)
+
+    # Batches share one timestamp; max_workers > 1 signs on a thread pool.
+    results = signer.sign_many(bodies, max_workers=4)
+
+    # Large bodies can be hashed incrementally instead of being buffered.
+    with open("on_status.json", "rb") as f:
+        auth_header = signer.sign_payload(f)
+
+    # Polling loops that re-send identical bodies can reuse recent headers.
+    signer = PayloadSigner(..., header_cache=SignedHeaderCache(min_remaining_seconds=60))
 """
 
 from __future__ import annotations
 
 import base64
 import hashlib
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from typing import BinaryIO, Union
 
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 
 DEFAULT_EXPIRY_SECONDS = 300  # 5 minutes
+DIGEST_CHUNK_SIZE = 1 << 20  # 1 MiB read buffer for file bodies
+DEFAULT_HEADER_CACHE_SIZE = 1024
+DEFAULT_HEADER_CACHE_MARGIN_SECONDS = 60
+
+# A payload to sign or verify: the raw bytes (any buffer, e.g. a memoryview,
+# hashed without copying), a str (UTF-8 encoded), a binary file object read
+# in DIGEST_CHUNK_SIZE chunks, or an iterable of byte chunks. File objects
+# and iterators are consumed.
+Body = Union[bytes, bytearray, memoryview, str, BinaryIO, Iterable[bytes]]
 
 
 @dataclass
@@ -34,6 +58,64 @@ class SignedResult:
     signature: str
 
 
+class SignedHeaderCache:
+    """Reuse signatures of byte-identical bodies while they remain valid.
+
+    Entries are keyed by signer and body digest. A cached SignedResult is
+    handed out again while at least ``min_remaining_seconds`` of its validity
+    window remain, so receivers never see a header about to expire; the body
+    is still hashed, but the Ed25519 signature is skipped. The least recently
+    used entries are evicted beyond ``max_entries``. Safe to share between
+    threads and signers.
+
+    Args:
+        max_entries: Maximum number of cached results (default 1024).
+        min_remaining_seconds: Validity a cached result must still have to be
+            reused (default 60).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_HEADER_CACHE_SIZE,
+        min_remaining_seconds: int = DEFAULT_HEADER_CACHE_MARGIN_SECONDS,
+    ) -> None:
+        self._max_entries = max_entries
+        self._min_remaining_seconds = min_remaining_seconds
+        self._entries: OrderedDict[tuple, SignedResult] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: tuple, now_unix: int) -> SignedResult | None:
+        """Return a cached result still valid for long enough at ``now_unix``."""
+        with self._lock:
+            result = self._entries.get(key)
+            if (
+                result is not None
+                and result.created_at <= now_unix
+                and result.expires_at - now_unix >= self._min_remaining_seconds
+            ):
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return result
+            self.misses += 1
+            return None
+
+    def put(self, key: tuple, result: SignedResult) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
 class PayloadSigner:
     """Sign Beckn protocol payloads with Ed25519 + BLAKE2-512.
 
@@ -42,6 +124,9 @@ class PayloadSigner:
         unique_key_id: Unique key ID registered in the Beckn registry.
         signing_private_key: Base64-encoded Ed25519 seed (32 bytes).
         expiry_seconds: Signature validity window in seconds (default 300).
+        header_cache: Optional SignedHeaderCache; sign_payload and
+            sign_payload_detailed then reuse recent results for identical
+            bodies (sign_many always signs).
     """
 
     def __init__(
@@ -50,6 +135,7 @@ class PayloadSigner:
         unique_key_id: str,
         signing_private_key: str,
         expiry_seconds: int = DEFAULT_EXPIRY_SECONDS,
+        header_cache: SignedHeaderCache | None = None,
     ) -> None:
         if not subscriber_id:
             raise ValueError("signer: subscriber_id is required")
@@ -78,45 +164,109 @@ class PayloadSigner:
         self._unique_key_id = unique_key_id
         self._private_key = Ed25519PrivateKey.from_private_bytes(seed)
         self._expiry_seconds = expiry_seconds
+        self._header_cache = header_cache
+        # Everything in the header before the created timestamp is fixed per signer.
+        self._header_prefix = (
+            f'Signature keyId="{subscriber_id}|{unique_key_id}|ed25519"'
+            f',algorithm="ed25519"'
+            f',created="'
+        )
 
-    def sign_payload(self, body: bytes | str) -> str:
+    def sign_payload(self, body: Body) -> str:
         """Sign a JSON payload and return the Authorization header value."""
         return self.sign_payload_detailed(body).authorization_header
 
-    def sign_payload_detailed(self, body: bytes | str) -> SignedResult:
+    def sign_payload_detailed(self, body: Body) -> SignedResult:
         """Sign a JSON payload and return full signing details."""
         now = int(time.time())
         return self._sign_payload_at(body, now)
 
-    def _sign_payload_at(self, body: bytes | str, now_unix: int) -> SignedResult:
-        """Sign at a specific Unix timestamp (used for deterministic testing)."""
+    def sign_many(
+        self, bodies: Iterable[Body], max_workers: int = 1
+    ) -> list[SignedResult]:
+        """Sign a batch of JSON payloads with one shared timestamp.
+
+        Args:
+            bodies: Raw JSON payloads.
+            max_workers: Threads to sign on. Ed25519 signing and BLAKE2b
+                hashing of large bodies release the GIL, so values above 1
+                help on multi-core hosts (default 1, sign inline).
+
+        Returns:
+            One SignedResult per body, in input order.
+        """
+        return self._sign_many_at(bodies, int(time.time()), max_workers)
+
+    def _sign_many_at(
+        self, bodies: Iterable[Body], now_unix: int, max_workers: int = 1
+    ) -> list[SignedResult]:
+        """Sign a batch at a specific Unix timestamp (used for deterministic testing)."""
+        bodies = list(bodies)
         created_at = now_unix
         expires_at = now_unix + self._expiry_seconds
+        signing_prefix = _signing_string_prefix(created_at, expires_at)
+        header_head = self._header_head(created_at, expires_at)
 
-        body_bytes = body if isinstance(body, bytes) else body.encode("utf-8")
-        signing_string = build_signing_string(body_bytes, created_at, expires_at)
+        def sign_one(body: Body) -> SignedResult:
+            return self._sign_digest(
+                _blake2b_512_b64(body), signing_prefix, header_head, created_at, expires_at
+            )
 
-        sig = self._private_key.sign(signing_string.encode("utf-8"))
-        sig_b64 = base64.b64encode(sig).decode()
+        if max_workers <= 1 or len(bodies) <= 1:
+            return [sign_one(body) for body in bodies]
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(bodies))) as executor:
+            return list(executor.map(sign_one, bodies))
 
-        header = (
-            f'Signature keyId="{self._subscriber_id}|{self._unique_key_id}|ed25519"'
-            f',algorithm="ed25519"'
-            f',created="{created_at}"'
+    def _sign_payload_at(self, body: Body, now_unix: int) -> SignedResult:
+        """Sign at a specific Unix timestamp (used for deterministic testing)."""
+        created_at = now_unix
+        expires_at = now_unix + self._expiry_seconds
+        digest = _blake2b_512_b64(body)
+        if self._header_cache is not None:
+            cache_key = (self._header_prefix, self._expiry_seconds, digest)
+            cached = self._header_cache.get(cache_key, now_unix)
+            if cached is not None:
+                return cached
+        result = self._sign_digest(
+            digest,
+            _signing_string_prefix(created_at, expires_at),
+            self._header_head(created_at, expires_at),
+            created_at,
+            expires_at,
+        )
+        if self._header_cache is not None:
+            self._header_cache.put(cache_key, result)
+        return result
+
+    def _header_head(self, created_at: int, expires_at: int) -> str:
+        """Authorization header up to the opening quote of the signature value."""
+        return (
+            f'{self._header_prefix}{created_at}"'
             f',expires="{expires_at}"'
             f',headers="(created) (expires) digest"'
-            f',signature="{sig_b64}"'
+            f',signature="'
         )
 
+    def _sign_digest(
+        self,
+        digest: bytes,
+        signing_prefix: bytes,
+        header_head: str,
+        created_at: int,
+        expires_at: int,
+    ) -> SignedResult:
+        sig = self._private_key.sign(signing_prefix + digest)
+        sig_b64 = base64.b64encode(sig).decode()
+
         return SignedResult(
-            authorization_header=header,
+            authorization_header=f'{header_head}{sig_b64}"',
             created_at=created_at,
             expires_at=expires_at,
             signature=sig_b64,
         )
 
 
-def build_signing_string(body: bytes, created_at: int, expires_at: int) -> str:
+def build_signing_string(body: Body, created_at: int, expires_at: int) -> str:
     """Build the canonical signing string.
 
     Format::
@@ -125,8 +275,32 @@ def build_signing_string(body: bytes, created_at: int, expires_at: int) -> str:
         (expires): {timestamp}
         digest: BLAKE-512={base64_hash}
     """
-    digest = base64.b64encode(
-        hashlib.blake2b(body, digest_size=64).digest()
-    ).decode()
+    return (_signing_string_prefix(created_at, expires_at) + _blake2b_512_b64(body)).decode()
+
+
+def _signing_string_prefix(created_at: int, expires_at: int) -> bytes:
+    """Encoded signing string up to (not including) the base64 digest."""
+    return f"(created): {created_at}\n(expires): {expires_at}\ndigest: BLAKE-512=".encode()
+
+
+def _blake2b_512_b64(body: Body) -> bytes:
+    """Base64 BLAKE2b-512 digest of a body, hashed incrementally where possible."""
+    if isinstance(body, str):
+        return base64.b64encode(hashlib.blake2b(body.encode("utf-8"), digest_size=64).digest())
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        return base64.b64encode(hashlib.blake2b(body, digest_size=64).digest())
 
-    return f"(created): {created_at}\n(expires): {expires_at}\ndigest: BLAKE-512={digest}"
+    hasher = hashlib.blake2b(digest_size=64)
+    if hasattr(body, "readinto"):
+        # Reuse one buffer so peak memory stays at the chunk size.
+        buffer = bytearray(DIGEST_CHUNK_SIZE)
+        view = memoryview(buffer)
+        while n := body.readinto(buffer):
+            hasher.update(view[:n])
+    elif hasattr(body, "read"):
+        while chunk := body.read(DIGEST_CHUNK_SIZE):
+            hasher.update(chunk)
+    else:
+        for chunk in body:
+            hasher.update(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+    return base64.b64encode(hasher.digest())
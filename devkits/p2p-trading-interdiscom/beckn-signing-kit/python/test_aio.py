@@ -0,0 +1,96 @@
+"""Tests for the asyncio signing/verification wrappers."""
+
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from . import AsyncOffloader, AsyncPayloadSigner, SignatureVerificationError, async_verify
+from .test_signer import SAMPLE_PAYLOAD, TEST_PUBLIC_KEY, _make_signer
+
+LARGE_PAYLOAD = SAMPLE_PAYLOAD[:-1] + b', "padding": "' + b"x" * 65536 + b'"}'
+
+
+class TestAsyncPayloadSigner(unittest.IsolatedAsyncioTestCase):
+    async def test_signs_large_body_in_executor(self):
+        executor = ThreadPoolExecutor(max_workers=2)
+        self.addCleanup(executor.shutdown)
+        signer = AsyncPayloadSigner(_make_signer(), executor=executor)
+
+        auth_header = await signer.sign_payload(LARGE_PAYLOAD)
+        await async_verify(LARGE_PAYLOAD, auth_header, TEST_PUBLIC_KEY)
+        self.assertEqual((signer.metrics.completed, signer.metrics.inline), (1, 0))
+        self.assertGreater(signer.metrics.latency_percentile(50), 0)
+
+    async def test_small_body_is_signed_inline(self):
+        signer = AsyncPayloadSigner(_make_signer())
+        result = await signer.sign_payload_detailed(SAMPLE_PAYLOAD)
+
+        await async_verify(SAMPLE_PAYLOAD, result.authorization_header, TEST_PUBLIC_KEY)
+        self.assertEqual((signer.metrics.completed, signer.metrics.inline), (0, 1))
+
+    async def test_sign_many(self):
+        signer = AsyncPayloadSigner(_make_signer())
+        bodies = [SAMPLE_PAYLOAD, LARGE_PAYLOAD]
+        results = await signer.sign_many(bodies)
+
+        self.assertEqual(len({r.created_at for r in results}), 1)
+        for body, result in zip(bodies, results):
+            await async_verify(body, result.authorization_header, TEST_PUBLIC_KEY)
+
+
+class TestAsyncVerify(unittest.IsolatedAsyncioTestCase):
+    async def test_rejects_tampered_payload(self):
+        auth_header = _make_signer().sign_payload(LARGE_PAYLOAD)
+        offloader = AsyncOffloader(max_concurrency=1)
+        with self.assertRaises(SignatureVerificationError):
+            await async_verify(LARGE_PAYLOAD + b" ", auth_header, TEST_PUBLIC_KEY, offloader=offloader)
+        self.assertEqual((offloader.metrics.failed, offloader.metrics.running), (1, 0))
+
+
+class TestAsyncOffloader(unittest.IsolatedAsyncioTestCase):
+    async def test_bounds_concurrency_and_tracks_queue_depth(self):
+        executor = ThreadPoolExecutor(max_workers=8)
+        self.addCleanup(executor.shutdown)
+        offloader = AsyncOffloader(executor, max_concurrency=2)
+        lock = threading.Lock()
+        active = peak = 0
+
+        def work():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.01)
+            with lock:
+                active -= 1
+
+        await asyncio.gather(*(offloader.run(work) for _ in range(6)))
+
+        metrics = offloader.metrics
+        self.assertEqual(peak, 2)
+        self.assertEqual(metrics.max_queue_depth, 4)  # two run at once, four wait
+        self.assertEqual((metrics.queue_depth, metrics.running, metrics.completed), (0, 0, 6))
+        self.assertGreater(metrics.wait_seconds, 0)
+
+    async def test_cancelled_waiter_leaves_queue(self):
+        offloader = AsyncOffloader(max_concurrency=1)
+        blocker = asyncio.ensure_future(offloader.run(time.sleep, 0.05))
+        waiter = asyncio.ensure_future(offloader.run(time.sleep, 0))
+        await asyncio.sleep(0)
+        self.assertEqual(offloader.metrics.queue_depth, 1)
+
+        waiter.cancel()
+        await blocker
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+        self.assertEqual((offloader.metrics.queue_depth, offloader.metrics.completed), (0, 1))
+
+    def test_rejects_non_positive_concurrency(self):
+        with self.assertRaises(ValueError):
+            AsyncOffloader(max_concurrency=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
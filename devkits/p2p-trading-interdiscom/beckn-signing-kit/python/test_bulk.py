@@ -0,0 +1,143 @@
+"""Tests for bulk verification and replay detection."""
+
+import io
+import json
+import unittest
+
+from .bulk import BulkVerifyStats, InvalidRecord, ReplayCache, iter_ndjson_records, verify_bulk
+from .test_signer import (
+    SAMPLE_PAYLOAD,
+    TEST_KEY_ID,
+    TEST_PUBLIC_KEY,
+    TEST_SUBSCRIBER_ID,
+    _make_signer,
+)
+
+# Archived traffic: signed long ago, long expired by now.
+ARCHIVE_TIME = 1700000000
+
+
+def _archive(count):
+    signer = _make_signer()
+    bodies = [SAMPLE_PAYLOAD + b" " * i for i in range(count)]
+    results = signer._sign_many_at(bodies, ARCHIVE_TIME)
+    return [(body, result.authorization_header) for body, result in zip(bodies, results)]
+
+
+class TestVerifyBulk(unittest.TestCase):
+    def test_verifies_archived_records_at_their_created_time(self):
+        stats = BulkVerifyStats()
+        results = list(verify_bulk(_archive(5), public_key_base64=TEST_PUBLIC_KEY, stats=stats))
+
+        self.assertEqual([r.index for r in results], list(range(5)))
+        self.assertTrue(all(r.ok for r in results))
+        self.assertEqual((stats.records, stats.passed, stats.failed), (5, 5, 0))
+
+    def test_reports_reason_per_failed_record(self):
+        records = _archive(3)
+        records[1] = (records[1][0] + b"tampered", records[1][1])
+        records[2] = (records[2][0], "Signature garbage")
+
+        results = list(verify_bulk(records, public_key_base64=TEST_PUBLIC_KEY))
+        self.assertEqual([r.ok for r in results], [True, False, False])
+        self.assertIn("verification failed", results[1].reason)
+        self.assertIn("malformed auth header", results[2].reason)
+
+    def test_now_unix_enforces_expiry(self):
+        results = list(verify_bulk(_archive(1), public_key_base64=TEST_PUBLIC_KEY, now_unix=ARCHIVE_TIME + 3600))
+        self.assertIn("expired", results[0].reason)
+
+    def test_resolves_keys_by_key_id(self):
+        keys = {f"{TEST_SUBSCRIBER_ID}|{TEST_KEY_ID}": TEST_PUBLIC_KEY}
+        results = list(verify_bulk(_archive(2), keys=keys))
+        self.assertTrue(all(r.ok for r in results))
+
+    def test_flags_replays(self):
+        records = _archive(2)
+        records.append(records[0])
+        stats = BulkVerifyStats()
+
+        results = list(
+            verify_bulk(records, public_key_base64=TEST_PUBLIC_KEY, replay_cache=ReplayCache(), stats=stats)
+        )
+        self.assertEqual([r.replay for r in results], [False, False, True])
+        self.assertEqual(stats.replays, 1)
+
+    def test_process_pool_matches_inline(self):
+        records = _archive(10)
+        records[3] = (b"{}", records[3][1])
+
+        inline = list(verify_bulk(records, public_key_base64=TEST_PUBLIC_KEY))
+        pooled = list(verify_bulk(records, public_key_base64=TEST_PUBLIC_KEY, processes=2, batch_size=4))
+        self.assertEqual(pooled, inline)
+
+    def test_requires_exactly_one_key_source(self):
+        with self.assertRaises(ValueError):
+            list(verify_bulk([]))
+
+
+class TestReplayCache(unittest.TestCase):
+    def test_forgets_expired_signatures(self):
+        cache = ReplayCache()
+        self.assertFalse(cache.seen("sig", 100, 400))
+        self.assertTrue(cache.seen("sig", 200, 500))
+        self.assertFalse(cache.seen("sig", 401, 700))
+
+    def test_bounded(self):
+        cache = ReplayCache(max_entries=2)
+        for i in range(5):
+            cache.seen(f"sig{i}", 100, 400 + i)
+        self.assertEqual(len(cache), 2)
+
+
+class TestIterNdjsonRecords(unittest.TestCase):
+    def test_reads_records(self):
+        lines = [
+            json.dumps({"body": '{"a": 1}', "authorization": "h1"}),
+            "",
+            json.dumps({"body_base64": "e30=", "authorization": "h2"}),
+        ]
+        records = list(iter_ndjson_records(io.BytesIO("\n".join(lines).encode())))
+        self.assertEqual(records, [('{"a": 1}', "h1"), (b"{}", "h2")])
+
+    def test_bad_lines_yield_invalid_records(self):
+        lines = [
+            json.dumps({"body": {"a": 1}, "authorization": "h"}),
+            "{not json",
+            json.dumps({"body": "{}"}),
+            json.dumps(["body", "authorization"]),
+            json.dumps({"body_base64": "e30", "authorization": "h"}),
+            json.dumps({"body": "{}", "authorization": "h"}),
+        ]
+        records = list(iter_ndjson_records(io.BytesIO("\n".join(lines).encode())))
+        self.assertEqual(records[-1], ("{}", "h"))
+        self.assertTrue(all(isinstance(record, InvalidRecord) for record in records[:-1]))
+        self.assertEqual([record.reason.split(":")[0] for record in records[:-1]],
+                         ["line 1", "line 2", "line 3", "line 4", "line 5"])
+        self.assertIn("'body'", records[0].reason)
+        self.assertIn("'authorization'", records[2].reason)
+
+    def test_bad_lines_are_reported_without_stopping_verify_bulk(self):
+        archive = _archive(2)
+        lines = [
+            json.dumps({"body": archive[0][0].decode(), "authorization": archive[0][1]}),
+            "{not json",
+            json.dumps({"body": archive[1][0].decode()}),
+            json.dumps({"body": archive[1][0].decode(), "authorization": archive[1][1]}),
+        ]
+        for processes in (1, 2):
+            with self.subTest(processes=processes):
+                stats = BulkVerifyStats()
+                results = list(verify_bulk(
+                    iter_ndjson_records(io.BytesIO("\n".join(lines).encode())),
+                    public_key_base64=TEST_PUBLIC_KEY, processes=processes, batch_size=3,
+                    replay_cache=ReplayCache(), stats=stats,
+                ))
+                self.assertEqual([(r.index, r.ok) for r in results], [(0, True), (1, False), (2, False), (3, True)])
+                self.assertTrue(results[1].reason.startswith("line 2: "))
+                self.assertTrue(results[2].reason.startswith("line 3: "))
+                self.assertEqual((stats.records, stats.passed, stats.failed), (4, 2, 2))
+
+
+if __name__ == "__main__":
+    unittest.main()
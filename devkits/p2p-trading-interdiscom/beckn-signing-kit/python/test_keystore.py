@@ -0,0 +1,135 @@
+"""Tests for KeyStore / CachingVerifier."""
+
+import json
+import os
+import tempfile
+import unittest
+
+from . import (
+    CachingVerifier,
+    JsonFileKeyLookup,
+    KeyStore,
+    SignatureVerificationError,
+    UnknownKeyError,
+)
+from .test_signer import (
+    SAMPLE_PAYLOAD,
+    TEST_KEY_ID,
+    TEST_PUBLIC_KEY,
+    TEST_SUBSCRIBER_ID,
+    _make_signer,
+)
+
+
+class CountingLookup:
+    def __init__(self, keys):
+        self.keys = keys
+        self.calls = 0
+
+    def __call__(self, subscriber_id, unique_key_id):
+        self.calls += 1
+        return self.keys.get(f"{subscriber_id}|{unique_key_id}")
+
+
+class TestKeyStore(unittest.TestCase):
+    def test_caches_decoded_key(self):
+        lookup = CountingLookup({f"{TEST_SUBSCRIBER_ID}|{TEST_KEY_ID}": TEST_PUBLIC_KEY})
+        store = KeyStore(lookup)
+
+        first = store.get(TEST_SUBSCRIBER_ID, TEST_KEY_ID)
+        second = store.get(TEST_SUBSCRIBER_ID, TEST_KEY_ID)
+
+        self.assertIs(first, second)
+        self.assertEqual(lookup.calls, 1)
+        self.assertEqual((store.hits, store.misses), (1, 1))
+
+    def test_negative_caching(self):
+        lookup = CountingLookup({})
+        store = KeyStore(lookup)
+
+        for _ in range(3):
+            with self.assertRaises(UnknownKeyError):
+                store.get("unknown.example.com", "k1")
+        self.assertEqual(lookup.calls, 1)
+
+    def test_expired_entries_are_looked_up_again(self):
+        lookup = CountingLookup({f"{TEST_SUBSCRIBER_ID}|{TEST_KEY_ID}": TEST_PUBLIC_KEY})
+        store = KeyStore(lookup, ttl=0)
+
+        store.get(TEST_SUBSCRIBER_ID, TEST_KEY_ID)
+        store.get(TEST_SUBSCRIBER_ID, TEST_KEY_ID)
+        self.assertEqual(lookup.calls, 2)
+
+    def test_evicts_least_recently_used(self):
+        lookup = CountingLookup({f"s|k{i}": TEST_PUBLIC_KEY for i in range(3)})
+        store = KeyStore(lookup, max_keys=2)
+
+        store.get("s", "k0")
+        store.get("s", "k1")
+        store.get("s", "k0")
+        store.get("s", "k2")  # evicts k1
+        store.get("s", "k0")
+        store.get("s", "k1")
+        self.assertEqual(lookup.calls, 4)
+
+    def test_rejects_malformed_key(self):
+        store = KeyStore(CountingLookup({"s|k": "not-base64!!!"}))
+        with self.assertRaises(ValueError):
+            store.get("s", "k")
+
+
+class TestJsonFileKeyLookup(unittest.TestCase):
+    def _write(self, data):
+        fd, path = tempfile.mkstemp(suffix=".json")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        self.addCleanup(os.unlink, path)
+        return path
+
+    def test_reads_key_map(self):
+        path = self._write({f"{TEST_SUBSCRIBER_ID}|{TEST_KEY_ID}": TEST_PUBLIC_KEY})
+        lookup = JsonFileKeyLookup(path)
+        self.assertEqual(lookup(TEST_SUBSCRIBER_ID, TEST_KEY_ID), TEST_PUBLIC_KEY)
+        self.assertIsNone(lookup(TEST_SUBSCRIBER_ID, "other"))
+
+    def test_reads_registry_records(self):
+        path = self._write(
+            [
+                {
+                    "subscriber_id": TEST_SUBSCRIBER_ID,
+                    "ukId": TEST_KEY_ID,
+                    "signing_public_key": TEST_PUBLIC_KEY,
+                }
+            ]
+        )
+        self.assertEqual(JsonFileKeyLookup(path)(TEST_SUBSCRIBER_ID, TEST_KEY_ID), TEST_PUBLIC_KEY)
+
+
+class TestCachingVerifier(unittest.TestCase):
+    def setUp(self):
+        self.lookup = CountingLookup({f"{TEST_SUBSCRIBER_ID}|{TEST_KEY_ID}": TEST_PUBLIC_KEY})
+        self.verifier = CachingVerifier(KeyStore(self.lookup))
+
+    def test_verifies_with_key_from_header(self):
+        signer = _make_signer()
+        for _ in range(3):
+            self.verifier.verify(SAMPLE_PAYLOAD, signer.sign_payload(SAMPLE_PAYLOAD))
+        self.assertEqual(self.lookup.calls, 1)
+
+    def test_rejects_tampered_payload(self):
+        auth_header = _make_signer().sign_payload(SAMPLE_PAYLOAD)
+        with self.assertRaises(SignatureVerificationError):
+            self.verifier.verify(SAMPLE_PAYLOAD + b" ", auth_header)
+
+    def test_rejects_unknown_key_id(self):
+        auth_header = _make_signer(unique_key_id="rotated-away").sign_payload(SAMPLE_PAYLOAD)
+        with self.assertRaises(UnknownKeyError):
+            self.verifier.verify(SAMPLE_PAYLOAD, auth_header)
+
+    def test_rejects_missing_key_id(self):
+        with self.assertRaises(ValueError):
+            self.verifier.verify(SAMPLE_PAYLOAD, 'Signature created="1",expires="2",signature="AA=="')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+"""Tests for KeyringSigner / KeyringVerifier key rotation."""
+
+import base64
+import json
+import os
+import tempfile
+import threading
+import unittest
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from . import (
+    KeyringSigner,
+    KeyringVerifier,
+    SignatureVerificationError,
+    SigningKey,
+    UnknownKeyError,
+    VerificationKey,
+    verify_at,
+)
+from .test_signer import (
+    SAMPLE_PAYLOAD,
+    TEST_KEY_ID,
+    TEST_PRIVATE_KEY,
+    TEST_PUBLIC_KEY,
+    TEST_SUBSCRIBER_ID,
+    _make_signer,
+)
+
+NEW_PRIVATE_KEY = base64.b64encode(bytes(range(32))).decode()
+NEW_PUBLIC_KEY = base64.b64encode(
+    Ed25519PrivateKey.from_private_bytes(bytes(range(32))).public_key().public_bytes_raw()
+).decode()
+
+T0 = 1700000000
+CUTOVER = T0 + 3600  # new key valid from here
+OLD_RETIRED = CUTOVER + 600  # old key valid until here
+
+OLD_KEY = SigningKey(TEST_KEY_ID, TEST_PRIVATE_KEY, valid_until=OLD_RETIRED)
+NEW_KEY = SigningKey("key-2", NEW_PRIVATE_KEY, valid_from=CUTOVER)
+TRUSTED = [
+    VerificationKey(TEST_SUBSCRIBER_ID, TEST_KEY_ID, TEST_PUBLIC_KEY, valid_until=OLD_RETIRED),
+    VerificationKey(TEST_SUBSCRIBER_ID, "key-2", NEW_PUBLIC_KEY, valid_from=CUTOVER),
+]
+
+
+def _write_json(path, data, mtime_ns):
+    with open(path, "w") as f:
+        json.dump(data, f)
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+class TestKeyringSigner(unittest.TestCase):
+    def setUp(self):
+        self.signer = KeyringSigner(TEST_SUBSCRIBER_ID, [OLD_KEY, NEW_KEY])
+
+    def test_signs_with_newest_valid_key(self):
+        self.assertEqual(self.signer.active_key_id(T0), TEST_KEY_ID)
+        self.assertEqual(self.signer.active_key_id(CUTOVER), "key-2")
+        self.assertEqual(self.signer.active_key_id(OLD_RETIRED + 1), "key-2")
+
+    def test_output_matches_payload_signer(self):
+        expected = _make_signer()._sign_payload_at(SAMPLE_PAYLOAD, T0)
+        self.assertEqual(self.signer._sign_payload_at(SAMPLE_PAYLOAD, T0), expected)
+
+        after = self.signer._sign_payload_at(SAMPLE_PAYLOAD, CUTOVER)
+        self.assertIn('|key-2|ed25519"', after.authorization_header)
+        verify_at(SAMPLE_PAYLOAD, after.authorization_header, NEW_PUBLIC_KEY, CUTOVER)
+
+    def test_no_valid_key(self):
+        signer = KeyringSigner(TEST_SUBSCRIBER_ID, [SigningKey(TEST_KEY_ID, TEST_PRIVATE_KEY, valid_from=CUTOVER)])
+        with self.assertRaisesRegex(ValueError, "no signing key valid"):
+            signer._sign_payload_at(SAMPLE_PAYLOAD, T0)
+
+    def test_set_keys_swaps_while_signing(self):
+        signer = KeyringSigner(TEST_SUBSCRIBER_ID, [SigningKey(TEST_KEY_ID, TEST_PRIVATE_KEY)])
+        verifier = KeyringVerifier(
+            [
+                VerificationKey(TEST_SUBSCRIBER_ID, TEST_KEY_ID, TEST_PUBLIC_KEY),
+                VerificationKey(TEST_SUBSCRIBER_ID, "key-2", NEW_PUBLIC_KEY),
+            ]
+        )
+        headers = []
+        stop = threading.Event()
+
+        def sign_loop():
+            while not stop.is_set():
+                headers.append(signer._sign_payload_at(SAMPLE_PAYLOAD, T0).authorization_header)
+
+        thread = threading.Thread(target=sign_loop)
+        thread.start()
+        try:
+            for i in range(50):
+                key = SigningKey("key-2", NEW_PRIVATE_KEY) if i % 2 else SigningKey(TEST_KEY_ID, TEST_PRIVATE_KEY)
+                signer.set_keys([key])
+        finally:
+            stop.set()
+            thread.join()
+
+        for header in headers:
+            verifier.verify_at(SAMPLE_PAYLOAD, header, T0)
+
+
+class TestKeyringVerifier(unittest.TestCase):
+    def setUp(self):
+        self.verifier = KeyringVerifier(TRUSTED)
+        self.signer = KeyringSigner(TEST_SUBSCRIBER_ID, [OLD_KEY, NEW_KEY])
+
+    def test_accepts_old_and_new_keys_during_overlap(self):
+        old = _make_signer()._sign_payload_at(SAMPLE_PAYLOAD, CUTOVER + 10)
+        new = self.signer._sign_payload_at(SAMPLE_PAYLOAD, CUTOVER + 10)
+        self.verifier.verify_at(SAMPLE_PAYLOAD, old.authorization_header, CUTOVER + 10)
+        self.verifier.verify_at(SAMPLE_PAYLOAD, new.authorization_header, CUTOVER + 10)
+
+    def test_rejects_key_outside_its_window(self):
+        retired = _make_signer()._sign_payload_at(SAMPLE_PAYLOAD, OLD_RETIRED + 1)
+        with self.assertRaisesRegex(UnknownKeyError, "not valid at created"):
+            self.verifier.verify_at(SAMPLE_PAYLOAD, retired.authorization_header, OLD_RETIRED + 1)
+
+        early = KeyringSigner(TEST_SUBSCRIBER_ID, [SigningKey("key-2", NEW_PRIVATE_KEY)])._sign_payload_at(
+            SAMPLE_PAYLOAD, T0
+        )
+        with self.assertRaises(UnknownKeyError):
+            self.verifier.verify_at(SAMPLE_PAYLOAD, early.authorization_header, T0)
+
+    def test_rejects_unknown_key_and_bad_signature(self):
+        unknown = _make_signer(unique_key_id="other")._sign_payload_at(SAMPLE_PAYLOAD, T0)
+        with self.assertRaises(UnknownKeyError):
+            self.verifier.verify_at(SAMPLE_PAYLOAD, unknown.authorization_header, T0)
+
+        header = self.signer._sign_payload_at(SAMPLE_PAYLOAD, T0).authorization_header
+        with self.assertRaises(SignatureVerificationError):
+            self.verifier.verify_at(SAMPLE_PAYLOAD + b" ", header, T0)
+
+
+class TestKeyFileReload(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        self.addCleanup(os.unlink, self.path)
+
+    def test_signer_picks_up_rotated_file(self):
+        _write_json(self.path, [{"unique_key_id": TEST_KEY_ID, "signing_private_key": TEST_PRIVATE_KEY}], 1_000)
+        signer = KeyringSigner.from_file(self.path, TEST_SUBSCRIBER_ID, check_interval=0)
+        self.assertEqual(signer.active_key_id(T0), TEST_KEY_ID)
+
+        _write_json(
+            self.path,
+            [
+                {"unique_key_id": TEST_KEY_ID, "signing_private_key": TEST_PRIVATE_KEY,
+                 "valid_until": "2023-11-14T23:23:20Z"},
+                {"ukId": "key-2", "signing_private_key": NEW_PRIVATE_KEY, "valid_from": CUTOVER},
+            ],
+            2_000,
+        )
+        self.assertEqual(signer.active_key_id(CUTOVER), "key-2")
+        self.assertEqual(signer.active_key_id(T0), TEST_KEY_ID)  # 2023-11-14T22:13:20Z
+
+    def test_broken_file_keeps_previous_keys(self):
+        records = [{"subscriber_id": TEST_SUBSCRIBER_ID, "ukId": TEST_KEY_ID, "signing_public_key": TEST_PUBLIC_KEY}]
+        _write_json(self.path, records, 1_000)
+        verifier = KeyringVerifier.from_file(self.path, check_interval=0)
+        header = _make_signer()._sign_payload_at(SAMPLE_PAYLOAD, T0).authorization_header
+
+        with open(self.path, "w") as f:
+            f.write('[{"subscriber_id": ')  # caught mid-write
+        os.utime(self.path, ns=(2_000, 2_000))
+        verifier.verify_at(SAMPLE_PAYLOAD, header, T0)
+        self.assertIsInstance(verifier.reload_error, ValueError)
+
+        _write_json(self.path, records, 3_000)
+        verifier.verify_at(SAMPLE_PAYLOAD, header, T0)
+        self.assertIsNone(verifier.reload_error)
+
+    def test_first_load_must_succeed(self):
+        with open(self.path, "w") as f:
+            f.write("{}")
+        with self.assertRaises(ValueError):
+            KeyringVerifier.from_file(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
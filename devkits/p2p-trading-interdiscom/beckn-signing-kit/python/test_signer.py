@@ -5,7 +5,16 @@ import unittest
 
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 
-from . import PayloadSigner, SignatureVerificationError, parse_key_id, verify, verify_at
+from . import (
+    ParsedHeader,
+    PayloadSigner,
+    SignatureVerificationError,
+    SignedHeaderCache,
+    parse_auth_header,
+    parse_key_id,
+    verify,
+    verify_at,
+)
 
 # Test keys matching the config in local-p2p-bap.yaml (sandbox1).
 TEST_SUBSCRIBER_ID = "p2p-trading-sandbox1.com"
@@ -127,6 +136,143 @@ class TestStringBody(unittest.TestCase):
         self.assertTrue(auth_header.startswith("Signature "))
 
 
+class TestSignMany(unittest.TestCase):
+    def test_matches_individual_signing_at_same_timestamp(self):
+        signer = _make_signer()
+        bodies = [SAMPLE_PAYLOAD, SAMPLE_PAYLOAD.decode(), b'{"other": true}']
+        results = signer._sign_many_at(bodies, 1700000000)
+
+        expected = [signer._sign_payload_at(body, 1700000000) for body in bodies]
+        self.assertEqual(results, expected)
+
+    def test_shares_one_timestamp_and_verifies(self):
+        signer = _make_signer()
+        bodies = [SAMPLE_PAYLOAD + b" " * i for i in range(5)]
+        results = signer.sign_many(bodies)
+
+        self.assertEqual(len({r.created_at for r in results}), 1)
+        for body, result in zip(bodies, results):
+            verify(body, result.authorization_header, TEST_PUBLIC_KEY)
+
+    def test_thread_pool_preserves_order(self):
+        signer = _make_signer()
+        bodies = [f'{{"seq": {i}}}'.encode() for i in range(20)]
+
+        sequential = signer._sign_many_at(bodies, 1700000000)
+        threaded = signer._sign_many_at(bodies, 1700000000, max_workers=4)
+        self.assertEqual(threaded, sequential)
+
+    def test_empty_batch(self):
+        self.assertEqual(_make_signer().sign_many([], max_workers=4), [])
+
+
+class TestSignedHeaderCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = SignedHeaderCache(max_entries=2, min_remaining_seconds=60)
+        self.signer = _make_signer(header_cache=self.cache)  # 300 s expiry
+
+    def test_reuses_result_for_identical_body(self):
+        first = self.signer._sign_payload_at(SAMPLE_PAYLOAD, 1700000000)
+        again = self.signer._sign_payload_at(SAMPLE_PAYLOAD.decode(), 1700000100)
+
+        self.assertIs(again, first)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+        verify_at(SAMPLE_PAYLOAD, again.authorization_header, TEST_PUBLIC_KEY, 1700000100)
+
+    def test_re_signs_within_safety_margin_of_expiry(self):
+        first = self.signer._sign_payload_at(SAMPLE_PAYLOAD, 1700000000)
+        self.assertIs(self.signer._sign_payload_at(SAMPLE_PAYLOAD, 1700000240), first)
+
+        renewed = self.signer._sign_payload_at(SAMPLE_PAYLOAD, 1700000241)
+        self.assertEqual(renewed.created_at, 1700000241)
+        self.assertIs(self.signer._sign_payload_at(SAMPLE_PAYLOAD, 1700000242), renewed)
+
+    def test_ignores_results_from_the_future(self):
+        self.signer._sign_payload_at(SAMPLE_PAYLOAD, 1700000000)
+        earlier = self.signer._sign_payload_at(SAMPLE_PAYLOAD, 1699999990)
+        self.assertEqual(earlier.created_at, 1699999990)
+
+    def test_different_bodies_and_signers_do_not_collide(self):
+        body_a = self.signer._sign_payload_at(b'{"a": 1}', 1700000000)
+        body_b = self.signer._sign_payload_at(b'{"b": 1}', 1700000000)
+        self.assertNotEqual(body_a.signature, body_b.signature)
+
+        other = _make_signer(unique_key_id="other-key", header_cache=self.cache)
+        self.assertNotEqual(
+            other._sign_payload_at(b'{"a": 1}', 1700000000).authorization_header, body_a.authorization_header
+        )
+
+    def test_evicts_least_recently_used(self):
+        bodies = [b'{"seq": 0}', b'{"seq": 1}', b'{"seq": 2}']
+        first = self.signer._sign_payload_at(bodies[0], 1700000000)
+        self.signer._sign_payload_at(bodies[1], 1700000000)
+        self.signer._sign_payload_at(bodies[2], 1700000000)  # evicts seq 0
+
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNot(self.signer._sign_payload_at(bodies[0], 1700000001), first)
+
+    def test_matches_uncached_output(self):
+        expected = _make_signer()._sign_payload_at(SAMPLE_PAYLOAD, 1700000000)
+        self.assertEqual(self.signer._sign_payload_at(SAMPLE_PAYLOAD, 1700000000), expected)
+
+    def test_sign_many_bypasses_cache(self):
+        self.signer._sign_many_at([SAMPLE_PAYLOAD], 1700000000)
+        self.assertEqual((self.cache.hits, self.cache.misses, len(self.cache)), (0, 0, 0))
+
+
+class TestStreamingBodies(unittest.TestCase):
+    def setUp(self):
+        self.signer = _make_signer()
+        self.expected = self.signer._sign_payload_at(SAMPLE_PAYLOAD, 1700000000)
+
+    def test_memoryview_body(self):
+        result = self.signer._sign_payload_at(memoryview(SAMPLE_PAYLOAD), 1700000000)
+        self.assertEqual(result, self.expected)
+
+    def test_chunk_iterable_body(self):
+        chunks = (SAMPLE_PAYLOAD[i:i + 7] for i in range(0, len(SAMPLE_PAYLOAD), 7))
+        result = self.signer._sign_payload_at(chunks, 1700000000)
+        self.assertEqual(result, self.expected)
+
+    def test_file_body(self):
+        import io
+
+        from . import signer as signer_module
+
+        original_chunk_size = signer_module.DIGEST_CHUNK_SIZE
+        signer_module.DIGEST_CHUNK_SIZE = 16  # force several reads
+        try:
+            result = self.signer._sign_payload_at(io.BytesIO(SAMPLE_PAYLOAD), 1700000000)
+        finally:
+            signer_module.DIGEST_CHUNK_SIZE = original_chunk_size
+        self.assertEqual(result, self.expected)
+
+    def test_verify_accepts_streamed_body(self):
+        import io
+
+        auth_header = self.signer.sign_payload(SAMPLE_PAYLOAD)
+        verify(io.BytesIO(SAMPLE_PAYLOAD), auth_header, TEST_PUBLIC_KEY)
+        verify([SAMPLE_PAYLOAD[:10], SAMPLE_PAYLOAD[10:]], auth_header, TEST_PUBLIC_KEY)
+
+    def test_large_file_is_not_buffered(self):
+        import tempfile
+        import tracemalloc
+
+        with tempfile.TemporaryFile() as f:
+            chunk = b"x" * (1 << 20)
+            for _ in range(32):
+                f.write(chunk)
+            f.seek(0)
+
+            tracemalloc.start()
+            try:
+                self.signer.sign_payload(f)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+        self.assertLess(peak, 4 << 20)
+
+
 class TestSignAndVerifyRoundTrip(unittest.TestCase):
     def test_verifies_freshly_signed_payload(self):
         signer = _make_signer()
@@ -206,5 +352,66 @@ class TestParseKeyId(unittest.TestCase):
             parse_key_id("bad-format")
 
 
+class TestParseAuthHeader(unittest.TestCase):
+    def test_parses_signer_output(self):
+        result = _make_signer()._sign_payload_at(SAMPLE_PAYLOAD, 1700000000)
+        parsed = parse_auth_header(result.authorization_header)
+
+        self.assertEqual(parsed.key_id, f"{TEST_SUBSCRIBER_ID}|{TEST_KEY_ID}|ed25519")
+        self.assertEqual(parsed.algorithm, "ed25519")
+        self.assertEqual((parsed.created, parsed.expires), (result.created_at, result.expires_at))
+        self.assertEqual(parsed.headers, "(created) (expires) digest")
+        self.assertEqual(parsed.signature, result.signature)
+
+    def test_quoted_value_may_contain_commas(self):
+        parsed = parse_auth_header('Signature keyId="a,b|k|ed25519", created="1",expires="2", signature="AA=="')
+        self.assertEqual(parsed.key_id, "a,b|k|ed25519")
+        self.assertEqual(parsed.signature, "AA==")
+
+    def test_scheme_is_case_insensitive(self):
+        header = _make_signer()._sign_payload_at(SAMPLE_PAYLOAD, 1700000000).authorization_header
+        self.assertTrue(header.startswith("Signature "))
+        for scheme in ("signature ", "SIGNATURE ", "sIgNaTuRe "):
+            with self.subTest(scheme=scheme):
+                self.assertEqual(parse_auth_header(scheme + header[10:]), parse_auth_header(header))
+                verify_at(SAMPLE_PAYLOAD, scheme + header[10:], TEST_PUBLIC_KEY, 1700000000)
+
+    def test_accepts_unquoted_values(self):
+        parsed = parse_auth_header("created=1,expires=2,signature=AA==")
+        self.assertEqual((parsed.created, parsed.expires, parsed.signature), (1, 2, "AA=="))
+
+    def test_rejects_malformed_header(self):
+        for header in ("Signature garbage", 'created="1",expires="2",signature="AA==" trailing', 'created="1'):
+            with self.subTest(header=header), self.assertRaisesRegex(ValueError, "malformed"):
+                parse_auth_header(header)
+
+    def test_rejects_duplicate_parameter(self):
+        with self.assertRaisesRegex(ValueError, "duplicate 'created'"):
+            parse_auth_header('created="1",created="5",expires="2",signature="AA=="')
+
+    def test_rejects_missing_or_invalid_fields(self):
+        with self.assertRaisesRegex(ValueError, "missing 'expires'"):
+            parse_auth_header('created="1",signature="AA=="')
+        with self.assertRaisesRegex(ValueError, "invalid 'created'"):
+            parse_auth_header('created="soon",expires="2",signature="AA=="')
+
+    def test_rejects_unsupported_algorithm_and_headers(self):
+        with self.assertRaisesRegex(ValueError, "unsupported algorithm"):
+            parse_auth_header('algorithm="rsa-sha256",created="1",expires="2",signature="AA=="')
+        with self.assertRaisesRegex(ValueError, "unsupported signed headers"):
+            parse_auth_header('headers="(created) digest",created="1",expires="2",signature="AA=="')
+
+    def test_parsed_header_is_reusable(self):
+        result = _make_signer()._sign_payload_at(SAMPLE_PAYLOAD, 1700000000)
+        parsed = parse_auth_header(result.authorization_header)
+
+        self.assertIs(parse_auth_header(parsed), parsed)
+        for _ in range(2):
+            verify_at(SAMPLE_PAYLOAD, parsed, TEST_PUBLIC_KEY, 1700000001)
+        with self.assertRaises(SignatureVerificationError):
+            verify_at(SAMPLE_PAYLOAD + b" ", parsed, TEST_PUBLIC_KEY, 1700000001)
+        self.assertIsInstance(parsed, ParsedHeader)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,77 @@
+"""Checks the kit against the shared golden vectors in ../testdata/golden-vectors.json."""
+
+import base64
+import json
+import os
+import unittest
+
+from . import PayloadSigner, SignatureVerificationError, verify_at
+from .signer import build_signing_string
+
+VECTORS_PATH = os.path.join(os.path.dirname(__file__), "..", "testdata", "golden-vectors.json")
+
+with open(VECTORS_PATH, encoding="utf-8") as _f:
+    VECTORS = json.load(_f)
+
+
+def _body(vector):
+    if "body_base64" in vector:
+        return base64.b64decode(vector["body_base64"])
+    return vector["body"]
+
+
+class TestSigningVectors(unittest.TestCase):
+    def test_reproduces_every_vector(self):
+        for vector in VECTORS["signing"]:
+            with self.subTest(vector["name"]):
+                key = VECTORS["keys"][vector["key"]]
+                signer = PayloadSigner(
+                    subscriber_id=key["subscriber_id"],
+                    unique_key_id=key["unique_key_id"],
+                    signing_private_key=key["private_key"],
+                    expiry_seconds=vector["expires"] - vector["created"],
+                )
+                body = _body(vector)
+                result = signer._sign_payload_at(body, vector["created"])
+
+                self.assertEqual(
+                    build_signing_string(body, vector["created"], vector["expires"]), vector["signing_string"]
+                )
+                self.assertTrue(vector["signing_string"].endswith("\ndigest: " + vector["digest"]))
+                self.assertEqual(result.signature, vector["signature"])
+                self.assertEqual(result.authorization_header, vector["authorization_header"])
+
+    def test_every_vector_verifies(self):
+        for vector in VECTORS["signing"]:
+            with self.subTest(vector["name"]):
+                public_key = VECTORS["keys"][vector["key"]]["public_key"]
+                verify_at(_body(vector), vector["authorization_header"], public_key, vector["created"])
+
+
+class TestVerificationVectors(unittest.TestCase):
+    EXPECTED_ERRORS = {
+        "expired": (ValueError, "expired"),
+        "not_yet_valid": (ValueError, "not yet valid"),
+        "signature_mismatch": (SignatureVerificationError, "verification failed"),
+        "malformed": (ValueError, ""),
+    }
+
+    def test_outcomes(self):
+        for vector in VECTORS["verification"]:
+            with self.subTest(vector["name"]):
+                args = (
+                    _body(vector),
+                    vector["authorization_header"],
+                    VECTORS["keys"][vector["key"]]["public_key"],
+                    vector["now"],
+                )
+                if vector["expect"] == "ok":
+                    verify_at(*args)
+                    continue
+                error, message = self.EXPECTED_ERRORS[vector["expect"]]
+                with self.assertRaisesRegex(error, message):
+                    verify_at(*args)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+"""Golden test vectors shared by the Beckn DEG signing kits.
+
+Ed25519 signatures are deterministic, so a (key, body, created, expires)
+tuple always yields the same digest, signing string, signature and
+Authorization header. ``testdata/golden-vectors.json`` was generated once by
+this module and is checked by test_vectors.py; the Go, Node.js and C# kits
+can load the same file to cross-check their output.
+
+Only regenerate when adding cases, from the beckn-signing-kit directory::
+
+    python -m python.vectors --output testdata/golden-vectors.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import json
+import sys
+
+from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+from .signer import PayloadSigner, _blake2b_512_b64, build_signing_string
+
+VECTORS_VERSION = 1
+CREATED = 1700000000
+EXPIRES_IN = 300
+
+# Sandbox key from the test suite, plus a second key from the seed 00 01 .. 1f.
+KEYS = {
+    "sandbox1": {
+        "subscriber_id": "p2p-trading-sandbox1.com",
+        "unique_key_id": "76EU8aUqHouww7gawT6EibH4bseMCumyDv3sgyXSKENGk8NDcdVwmQ",
+        "private_key": "Pc6dkYo5LeP0LkwvZXVRV9pcbeh8jDdtdHWymID5cjw=",
+    },
+    "sequential-seed": {
+        "subscriber_id": "bpp.energy-provider.com",
+        "unique_key_id": "vector-key-2",
+        "private_key": base64.b64encode(bytes(range(32))).decode(),
+    },
+}
+
+CONFIRM_BODY = json.dumps(
+    {
+        "context": {
+            "version": "2.0.0",
+            "action": "confirm",
+            "timestamp": "2024-10-04T10:25:00Z",
+            "message_id": "msg-confirm-001",
+            "transaction_id": "txn-energy-001",
+            "bap_id": "bap.energy-consumer.com",
+            "domain": "beckn.one:deg:p2p-trading:2.0.0",
+        },
+        "message": {"order": {"@type": "beckn:Order", "beckn:orderStatus": "CREATED"}},
+    }
+)
+
+# name -> (key, body text or raw bytes, expires_in)
+SIGNING_CASES: dict[str, tuple[str, str | bytes, int]] = {
+    "confirm-compact-json": ("sandbox1", CONFIRM_BODY, EXPIRES_IN),
+    "confirm-pretty-json": ("sandbox1", json.dumps(json.loads(CONFIRM_BODY), indent=2) + "\n", EXPIRES_IN),
+    "empty-body": ("sandbox1", "", EXPIRES_IN),
+    "non-ascii-utf8": ("sandbox1", '{"note":"₹ 4.50/kWh ⚡ 電力 — Zählerstand"}', EXPIRES_IN),
+    "raw-bytes-not-utf8": ("sandbox1", b'{"blob":"\xff\xfe\x00\x80"}', EXPIRES_IN),
+    "4kib-body": ("sandbox1", '{"data":"' + "0123456789abcdef" * 256 + '"}', EXPIRES_IN),
+    "second-key-long-expiry": ("sequential-seed", CONFIRM_BODY, 3600),
+}
+
+
+def _body_fields(body: str | bytes) -> dict[str, str]:
+    if isinstance(body, str):
+        return {"body": body}
+    return {"body_base64": base64.b64encode(body).decode()}
+
+
+def _public_key(private_key: str) -> str:
+    seed = base64.b64decode(private_key)
+    return base64.b64encode(Ed25519PrivateKey.from_private_bytes(seed).public_key().public_bytes_raw()).decode()
+
+
+def build_vectors() -> dict:
+    """Compute every vector from SIGNING_CASES and KEYS."""
+    keys = {name: dict(key, public_key=_public_key(key["private_key"])) for name, key in KEYS.items()}
+
+    signing = []
+    for name, (key_name, body, expires_in) in SIGNING_CASES.items():
+        key = keys[key_name]
+        signer = PayloadSigner(key["subscriber_id"], key["unique_key_id"], key["private_key"], expires_in)
+        result = signer._sign_payload_at(body, CREATED)
+        signing.append(
+            {
+                "name": name,
+                "key": key_name,
+                **_body_fields(body),
+                "created": result.created_at,
+                "expires": result.expires_at,
+                "digest": "BLAKE-512=" + _blake2b_512_b64(body).decode(),
+                "signing_string": build_signing_string(body, result.created_at, result.expires_at),
+                "signature": result.signature,
+                "authorization_header": result.authorization_header,
+            }
+        )
+
+    # Verification outcomes for headers derived from the first signing vector.
+    base = signing[0]
+    header = base["authorization_header"]
+    verification = [
+        {"name": "valid-at-created", "now": CREATED, "expect": "ok"},
+        {"name": "valid-at-expires", "now": base["expires"], "expect": "ok"},
+        {"name": "expired", "now": base["expires"] + 1, "expect": "expired"},
+        {"name": "not-yet-valid", "now": CREATED - 1, "expect": "not_yet_valid"},
+        {"name": "tampered-body", "body": CONFIRM_BODY + " ", "expect": "signature_mismatch"},
+        {"name": "wrong-public-key", "key": "sequential-seed", "expect": "signature_mismatch"},
+        {
+            "name": "tampered-created",
+            "authorization_header": header.replace(f'created="{CREATED}"', f'created="{CREATED + 1}"'),
+            "now": CREATED + 1,
+            "expect": "signature_mismatch",
+        },
+        {
+            "name": "unsupported-algorithm",
+            "authorization_header": header.replace('algorithm="ed25519"', 'algorithm="rsa-sha256"'),
+            "expect": "malformed",
+        },
+        {"name": "missing-signature", "authorization_header": header.split(",signature=")[0], "expect": "malformed"},
+    ]
+    for case in verification:
+        case.setdefault("key", base["key"])
+        case.setdefault("body", base["body"])
+        case.setdefault("authorization_header", header)
+        case.setdefault("now", CREATED)
+
+    return {"version": VECTORS_VERSION, "keys": keys, "signing": signing, "verification": verification}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Write the golden signing/verification vectors")
+    parser.add_argument("--output", default="-", help='output path (default "-" for stdout)')
+    args = parser.parse_args()
+
+    text = json.dumps(build_vectors(), indent=2, ensure_ascii=False) + "\n"
+    if args.output == "-":
+        sys.stdout.write(text)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,18 +9,20 @@ from __future__ import annotations
 import base64
 import re
 import time
+from dataclasses import dataclass
 
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PublicKey
 
-from .signer import build_signing_string
+from .signer import Body, build_signing_string
 
 
-def verify(body: bytes | str, auth_header: str, public_key_base64: str) -> None:
+def verify(body: Body, auth_header: str | ParsedHeader, public_key_base64: str) -> None:
     """Verify that an Authorization header is a valid signature for the given body.
 
     Args:
-        body: Raw JSON payload.
-        auth_header: Authorization header value.
+        body: Raw JSON payload (bytes, str, memoryview, binary file object or
+            iterable of byte chunks; see signer.Body).
+        auth_header: Authorization header value, or a ParsedHeader.
         public_key_base64: Base64-encoded Ed25519 public key (32 bytes).
 
     Raises:
@@ -32,19 +34,39 @@ def verify(body: bytes | str, auth_header: str, public_key_base64: str) -> None:
 
 
 def verify_at(
-    body: bytes | str,
-    auth_header: str,
+    body: Body,
+    auth_header: str | ParsedHeader,
     public_key_base64: str,
     now_unix: int,
 ) -> None:
     """Verify at a specific Unix timestamp (useful for testing).
 
+    ``auth_header`` may be a ParsedHeader from parse_auth_header().
+
     Raises:
         ValueError: If the header is malformed or timestamps are invalid.
         SignatureVerificationError: If the signature is invalid.
     """
-    created, expires, signature = _parse_auth_header(auth_header)
+    parsed = parse_auth_header(auth_header)
+
+    try:
+        pub_key_bytes = base64.b64decode(public_key_base64, validate=True)
+    except Exception as exc:
+        raise ValueError(f"verifier: invalid public key base64: {exc}") from exc
+
+    public_key = Ed25519PublicKey.from_public_bytes(pub_key_bytes)
+    _verify_with_key(body, parsed.created, parsed.expires, parsed.signature, public_key, now_unix)
+
 
+def _verify_with_key(
+    body: Body,
+    created: int,
+    expires: int,
+    signature: str,
+    public_key: Ed25519PublicKey,
+    now_unix: int,
+) -> None:
+    """Check the validity window and the signature against a decoded public key."""
     if created > now_unix:
         raise ValueError(
             f"verifier: signature not yet valid (created {created} > now {now_unix})"
@@ -59,15 +81,7 @@ def verify_at(
     except Exception as exc:
         raise ValueError(f"verifier: invalid signature base64: {exc}") from exc
 
-    body_bytes = body if isinstance(body, bytes) else body.encode("utf-8")
-    signing_string = build_signing_string(body_bytes, created, expires)
-
-    try:
-        pub_key_bytes = base64.b64decode(public_key_base64, validate=True)
-    except Exception as exc:
-        raise ValueError(f"verifier: invalid public key base64: {exc}") from exc
-
-    public_key = Ed25519PublicKey.from_public_bytes(pub_key_bytes)
+    signing_string = build_signing_string(body, created, expires)
 
     try:
         public_key.verify(sig_bytes, signing_string.encode("utf-8"))
@@ -99,37 +113,94 @@ class SignatureVerificationError(Exception):
     """Raised when an Ed25519 signature fails verification."""
 
 
-def _parse_auth_header(header: str) -> tuple[int, int, str]:
-    """Parse the Authorization header to extract created, expires, and signature."""
-    stripped = header
-    if stripped.startswith("Signature "):
-        stripped = stripped[len("Signature "):]
+EXPECTED_ALGORITHM = "ed25519"
+EXPECTED_HEADERS = "(created) (expires) digest"
+
+# One key="value" (or bare key=value) parameter and its trailing comma.
+# Quoted values may contain commas; the scanner never splits the header first.
+_AUTH_PARAM_RE = re.compile(
+    r'[ \t]*([A-Za-z][A-Za-z0-9_-]*)[ \t]*=[ \t]*(?:"([^"]*)"|([^,"]*?))[ \t]*(?:,|\Z)'
+)
+_AUTH_SCHEME = "Signature "
+
+
+@dataclass(frozen=True, slots=True)
+class ParsedHeader:
+    """The parameters of a Beckn Authorization header.
+
+    Parse once with parse_auth_header() and pass the result to verify_at()
+    or CachingVerifier.verify_at() to skip re-parsing, e.g. when the same
+    header is checked against several keys or for replays.
+    """
+
+    created: int
+    expires: int
+    signature: str
+    key_id: str | None = None
+    algorithm: str | None = None
+    headers: str | None = None
+
 
+def parse_auth_header(header: str | ParsedHeader) -> ParsedHeader:
+    """Parse an Authorization header in a single pass.
+
+    ``created``, ``expires`` and ``signature`` are required. ``algorithm`` and
+    ``headers`` are optional but, when present, must be ``"ed25519"`` and
+    ``"(created) (expires) digest"``. A ParsedHeader is returned unchanged.
+
+    Raises:
+        ValueError: If the header is malformed, a parameter is repeated, a
+            required parameter is missing or a value is unsupported.
+    """
+    if isinstance(header, ParsedHeader):
+        return header
+
+    # Authentication schemes are case-insensitive (RFC 9110, section 11.1).
+    pos = len(_AUTH_SCHEME) if header[: len(_AUTH_SCHEME)].lower() == _AUTH_SCHEME.lower() else 0
+    end = len(header)
     params: dict[str, str] = {}
-    for part in stripped.split(","):
-        eq_idx = part.find("=")
-        if eq_idx != -1:
-            key = part[:eq_idx].strip()
-            val = part[eq_idx + 1:]
-            # Strip surrounding quotes.
-            val = re.sub(r'^"|"$', "", val)
-            params[key] = val
-
-    if "created" not in params:
+    match = _AUTH_PARAM_RE.match
+    while pos < end:
+        m = match(header, pos)
+        if m is None or m.end() == pos:
+            raise ValueError(f"malformed auth header at offset {pos}")
+        key, quoted, bare = m.groups()
+        if key in params:
+            raise ValueError(f"duplicate '{key}' in auth header")
+        params[key] = quoted if quoted is not None else bare
+        pos = m.end()
+
+    created = params.get("created")
+    expires = params.get("expires")
+    signature = params.get("signature")
+    if created is None:
         raise ValueError("missing 'created' in auth header")
-    if "expires" not in params:
+    if expires is None:
         raise ValueError("missing 'expires' in auth header")
-    if "signature" not in params:
+    if signature is None:
         raise ValueError("missing 'signature' in auth header")
 
+    algorithm = params.get("algorithm")
+    if algorithm is not None and algorithm != EXPECTED_ALGORITHM:
+        raise ValueError(f"verifier: unsupported algorithm {algorithm!r}")
+    headers = params.get("headers")
+    if headers is not None and headers != EXPECTED_HEADERS:
+        raise ValueError(f"verifier: unsupported signed headers {headers!r}")
+
     try:
-        created = int(params["created"])
+        created_at = int(created)
     except ValueError:
-        raise ValueError(f"invalid 'created' timestamp: {params['created']}")
-
+        raise ValueError(f"invalid 'created' timestamp: {created}")
     try:
-        expires = int(params["expires"])
+        expires_at = int(expires)
     except ValueError:
-        raise ValueError(f"invalid 'expires' timestamp: {params['expires']}")
-
-    return created, expires, params["signature"]
+        raise ValueError(f"invalid 'expires' timestamp: {expires}")
+
+    return ParsedHeader(
+        created=created_at,
+        expires=expires_at,
+        signature=signature,
+        key_id=params.get("keyId"),
+        algorithm=algorithm,
+        headers=headers,
+    )
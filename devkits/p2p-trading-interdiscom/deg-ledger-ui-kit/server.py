@@ -13,6 +13,12 @@ Setup:
     4. python3 server.py --ledger-url https://example.com (needed if LEDGER_URL not set in .env)
     5. Open http://localhost:8080
 
+Requests are handled on a bounded pool of threads (--workers), so one slow
+ledger call does not stall other dashboard users. Upstream calls time out
+after --upstream-timeout seconds (504), and SIGINT/SIGTERM stop accepting
+connections and let in-flight requests finish for up to --shutdown-timeout
+seconds.
+
 Querying via the proxy (no auth header needed — the server signs for you):
 
     curl -s -X POST http://localhost:8080/api/ledger/get \
@@ -25,7 +31,10 @@ import base64
 import hashlib
 import http.server
 import json
+import signal
+import socket
 import ssl
+import threading
 import time
 import urllib.request
 import os
@@ -34,6 +43,10 @@ from datetime import datetime, timedelta, timezone
 from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
 
 PORT = 8080
+DEFAULT_WORKERS = 32
+DEFAULT_UPSTREAM_TIMEOUT = 30  # seconds per ledger API call
+DEFAULT_SHUTDOWN_TIMEOUT = 10  # seconds to let in-flight requests finish
+CLIENT_TIMEOUT = 60  # seconds a client may take to send its request
 DIR = os.path.dirname(os.path.abspath(__file__))
 
 # Load .env file if present (simple loader, no dependency needed)
@@ -49,6 +62,12 @@ if os.path.isfile(_env_path):
 # ── Ledger API (set via --ledger-url or LEDGER_URL env var) ──
 LEDGER_URL = None  # populated in main()
 LEDGER_API = None
+UPSTREAM_TIMEOUT = DEFAULT_UPSTREAM_TIMEOUT
+
+# Allow self-signed / sslip.io certs on the ledger API
+_UPSTREAM_SSL_CONTEXT = ssl.create_default_context()
+_UPSTREAM_SSL_CONTEXT.check_hostname = False
+_UPSTREAM_SSL_CONTEXT.verify_mode = ssl.CERT_NONE
 
 # ── Beckn signing config ──
 SUBSCRIBER_ID = os.environ.get("SUBSCRIBER_ID")
@@ -132,7 +151,67 @@ def enforce_lookback(body: bytes) -> bytes:
     return json.dumps(payload, separators=(",", ":")).encode()
 
 
+class BoundedThreadingHTTPServer(http.server.ThreadingHTTPServer):
+    """ThreadingHTTPServer that runs at most ``workers`` requests at once.
+
+    Further connections wait in the listen backlog until a worker frees up;
+    while all workers are busy the accept loop polls for a free slot so that
+    shutdown() still takes effect. server_close() waits up to ``shutdown_timeout`` seconds for in-flight
+    requests instead of joining every thread indefinitely.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+    slot_poll_interval = 0.5
+
+    def __init__(self, server_address, handler_class, workers=DEFAULT_WORKERS,
+                 shutdown_timeout=DEFAULT_SHUTDOWN_TIMEOUT):
+        self._slots = threading.BoundedSemaphore(workers)
+        self._idle = threading.Condition()
+        self._active = 0
+        self._stopping = threading.Event()
+        self._shutdown_timeout = shutdown_timeout
+        super().__init__(server_address, handler_class)
+
+    def shutdown(self):
+        self._stopping.set()
+        super().shutdown()
+
+    def process_request(self, request, client_address):
+        while not self._slots.acquire(timeout=self.slot_poll_interval):
+            if self._stopping.is_set():
+                self.shutdown_request(request)
+                return
+        with self._idle:
+            self._active += 1
+        try:
+            super().process_request(request, client_address)
+        except Exception:
+            self._finish_request_slot()
+            raise
+
+    def process_request_thread(self, request, client_address):
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            self._finish_request_slot()
+
+    def _finish_request_slot(self):
+        with self._idle:
+            self._active -= 1
+            self._idle.notify_all()
+        self._slots.release()
+
+    def server_close(self):
+        super().server_close()
+        with self._idle:
+            if not self._idle.wait_for(lambda: self._active == 0, timeout=self._shutdown_timeout):
+                print(f"Shutdown timeout: abandoning {self._active} in-flight request(s)")
+
+
 class Handler(http.server.SimpleHTTPRequestHandler):
+    timeout = CLIENT_TIMEOUT
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=DIR, **kwargs)
 
@@ -173,12 +252,8 @@ class Handler(http.server.SimpleHTTPRequestHandler):
                 },
                 method="POST",
             )
-            # Allow self-signed / sslip.io certs
-            ctx = ssl.create_default_context()
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
 
-            with urllib.request.urlopen(req, context=ctx) as resp:
+            with urllib.request.urlopen(req, context=_UPSTREAM_SSL_CONTEXT, timeout=UPSTREAM_TIMEOUT) as resp:
                 data = resp.read()
                 self.send_response(resp.status)
                 self.send_header("Content-Type", "application/json")
@@ -186,8 +261,11 @@ class Handler(http.server.SimpleHTTPRequestHandler):
                 self.end_headers()
                 self.wfile.write(data)
         except Exception as e:
-            err = json.dumps({"error": str(e)}).encode()
-            self.send_response(502)
+            timed_out = isinstance(e, (TimeoutError, socket.timeout)) or isinstance(
+                getattr(e, "reason", None), (TimeoutError, socket.timeout)
+            )
+            err = json.dumps({"error": str(e) or type(e).__name__}).encode()
+            self.send_response(504 if timed_out else 502)
             self.send_header("Content-Type", "application/json")
             self.send_header("Content-Length", str(len(err)))
             self.end_headers()
@@ -206,18 +284,50 @@ if __name__ == "__main__":
         help="Base URL of the ledger API (e.g. https://example.com). "
              "Falls back to LEDGER_URL env var.",
     )
+    parser.add_argument("--port", type=int, default=PORT, help=f"Port to listen on (default: {PORT})")
+    parser.add_argument(
+        "--workers", type=int, default=DEFAULT_WORKERS,
+        help=f"Maximum requests handled concurrently (default: {DEFAULT_WORKERS})",
+    )
+    parser.add_argument(
+        "--upstream-timeout", type=float, default=DEFAULT_UPSTREAM_TIMEOUT,
+        help=f"Seconds to wait for the ledger API before answering 504 (default: {DEFAULT_UPSTREAM_TIMEOUT})",
+    )
+    parser.add_argument(
+        "--shutdown-timeout", type=float, default=DEFAULT_SHUTDOWN_TIMEOUT,
+        help=f"Seconds to let in-flight requests finish on shutdown (default: {DEFAULT_SHUTDOWN_TIMEOUT})",
+    )
     args = parser.parse_args()
 
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.upstream_timeout <= 0:
+        parser.error("--upstream-timeout must be positive")
+    if args.shutdown_timeout < 0:
+        parser.error("--shutdown-timeout must not be negative")
     if not args.ledger_url:
         parser.error("--ledger-url is required (or set LEDGER_URL env var)")
 
     LEDGER_URL = args.ledger_url.rstrip("/")
     LEDGER_API = f"{LEDGER_URL}/ledger/get"
+    UPSTREAM_TIMEOUT = args.upstream_timeout
+
+    server = BoundedThreadingHTTPServer(
+        ("", args.port), Handler, workers=args.workers, shutdown_timeout=args.shutdown_timeout
+    )
+
+    def _stop(signum, frame):
+        # shutdown() blocks until serve_forever() returns, so it cannot run on this thread.
+        print(f"\n{signal.Signals(signum).name} received, finishing in-flight requests...")
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
 
-    server = http.server.HTTPServer(("", PORT), Handler)
-    print(f"DEG Ledger Dashboard running at http://localhost:{PORT}")
+    print(f"DEG Ledger Dashboard running at http://localhost:{args.port} ({args.workers} workers)")
     print(f"Proxying to {LEDGER_API}")
     try:
         server.serve_forever()
-    except KeyboardInterrupt:
-        print("\nStopped.")
+    finally:
+        server.server_close()
+    print("Stopped.")
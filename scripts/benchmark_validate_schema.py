@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""Benchmark scripts/validate_schema.py.
+
+Benchmarks:
+- startup: `import validate_schema`, `validate_schema.py --help`, and validating a
+  single file (optionally from a --snapshot written by --save-snapshot). Each
+  measurement runs in a fresh interpreter so it includes interpreter start-up and
+  module imports, which dominate short CI and pre-commit invocations.
+- corpus: validate examples/**/*.json and every devkit Postman collection in-process
+  against an offline schema snapshot (or the on-disk cache with --offline semantics),
+  reporting per-file and per-schema-type wall time, objects/sec, peak RSS and cache
+  hit rates. --output saves the numbers as JSON; --baseline compares against such a
+  file and exits non-zero on a regression beyond --threshold.
+- compare: run the corpus benchmark for the validate_schema.py of a git ref (e.g. the
+  merge base of a pull request) and for the working tree, alternating for --rounds
+  rounds on the same machine, and fail on a regression beyond --threshold. This is
+  the step to run in CI or before merging a performance-sensitive change. A ref whose
+  validator predates the schema cache and snapshots is given the working tree's
+  schema snapshot instead of fetching schemas itself; if it does not report
+  per-object results, only the timings are compared.
+
+Timings depend on the machine, its load and the Python version, so a --baseline
+report is only meaningful on the machine that wrote it, and no baseline is kept in
+the repository. `compare` measures both sides in the same run instead; the default
+20% threshold absorbs the usual run-to-run noise on an otherwise idle machine, and
+shared CI runners may need a higher one.
+
+Usage:
+    python3 scripts/benchmark_validate_schema.py startup
+    python3 scripts/benchmark_validate_schema.py startup --repeat 20 \\
+        --file examples/demand-flex/v2/confirm-request.json \\
+        --snapshot /tmp/deg-schemas.pickle --offline
+    python3 scripts/validate_schema.py --save-snapshot /tmp/deg-schemas.pickle \
+        examples/**/*.json devkits/*/postman/*.json
+    python3 scripts/benchmark_validate_schema.py corpus --snapshot /tmp/deg-schemas.pickle \
+        --output bench.json
+    python3 scripts/benchmark_validate_schema.py corpus --snapshot /tmp/deg-schemas.pickle \
+        --baseline bench.json
+    python3 scripts/benchmark_validate_schema.py compare --ref origin/main \
+        --snapshot /tmp/deg-schemas.pickle
+"""
+
+from __future__ import annotations
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_ROOT = SCRIPTS_DIR.parent
+VALIDATE_SCHEMA = SCRIPTS_DIR / "validate_schema.py"
+DEFAULT_REPEAT = 10
+DEFAULT_TOP = 10
+DEFAULT_THRESHOLD = 0.2
+DEFAULT_ROUNDS = 3
+# Per-type timings below this are too noisy to compare against a baseline
+MIN_COMPARED_TYPE_MS = 5.0
+CORPUS_GLOBS = ("examples/**/*.json", "devkits/**/postman/*.json")
+
+
+def time_command(argv: list[str], repeat: int) -> list[float]:
+    """Run argv `repeat` times and return the wall-clock duration of each run in ms."""
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(argv, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        durations.append((time.perf_counter() - started) * 1000)
+    return durations
+
+
+def startup_commands(args: argparse.Namespace) -> dict[str, list[str]]:
+    """Build the labelled commands measured by the startup benchmark."""
+    commands = {
+        "import validate_schema": [
+            sys.executable, "-c", f"import sys; sys.path.insert(0, {str(SCRIPTS_DIR)!r}); import validate_schema",
+        ],
+        "validate_schema.py --help": [sys.executable, str(VALIDATE_SCHEMA), "--help"],
+    }
+    if args.file:
+        run = [sys.executable, str(VALIDATE_SCHEMA)]
+        if args.snapshot:
+            run += ["--snapshot", args.snapshot]
+        if args.offline:
+            run.append("--offline")
+        if args.cache_dir:
+            run += ["--cache-dir", args.cache_dir]
+        commands[f"validate {Path(args.file).name}"] = run + [args.file]
+    return commands
+
+
+def run_startup(args: argparse.Namespace) -> int:
+    print(f"{'command':<50} {'min ms':>9} {'median ms':>10}")
+    for label, argv in startup_commands(args).items():
+        durations = time_command(argv, args.repeat)
+        print(f"{label:<50} {min(durations):>9.1f} {statistics.median(durations):>10.1f}")
+    return 0
+
+
+def corpus_files() -> list[str]:
+    """Every example payload and devkit Postman collection, relative to the repository root."""
+    files = set()
+    for pattern in CORPUS_GLOBS:
+        files.update(str(path.relative_to(REPO_ROOT)) for path in REPO_ROOT.glob(pattern))
+    return sorted(files)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def hit_rate(hits: int, misses: int) -> float | None:
+    return round(hits / (hits + misses), 4) if hits + misses else None
+
+
+def import_validator(path: str | None, name: str = "validate_schema"):
+    """Import validate_schema from path as module name, or from this directory if path is None."""
+    if path is None:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+        import validate_schema
+
+        return validate_schema
+    import importlib.util
+
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module  # dataclasses look the module up by name
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_schema_store(validate_schema, context_urls: set[str], snapshot: dict):
+    """
+    Build validate_schema's schema store from a snapshot.
+
+    Validators from before prefetch snapshots existed only load schemas on demand, over
+    HTTP; their load_schema_from_url is pointed at the snapshot instead, so that they
+    validate against the same schemas and never touch the network.
+    """
+    if hasattr(validate_schema, "build_schema_store_from_snapshot"):
+        return validate_schema.build_schema_store_from_snapshot(context_urls, snapshot)
+
+    def load_schema_from_url(url):
+        if url not in snapshot:
+            raise LookupError(f"{url} is not in the schema snapshot")
+        return snapshot[url]
+
+    validate_schema.load_schema_from_url = load_schema_from_url
+    return validate_schema.get_schema_store()
+
+
+def run_corpus_benchmark(args: argparse.Namespace) -> dict:
+    """
+    Validate the corpus in-process and collect timings and cache counters.
+
+    A --validator from an older ref may predate the schema cache, snapshots, the result
+    memo or per-object results. Its schemas are then loaded with the working tree's
+    validate_schema.py, and the counters it cannot report are None.
+    """
+    validate_schema = import_validator(args.validator)
+    loader = validate_schema
+    if not hasattr(loader, "load_schema_snapshot" if args.snapshot else "prefetch_schema_snapshot"):
+        loader = import_validator(str(VALIDATE_SCHEMA), "validate_schema_head")
+
+    os.chdir(REPO_ROOT)
+    files = args.files or corpus_files()
+    for module in {validate_schema, loader}:
+        if hasattr(module, "configure_schema_cache"):
+            module.configure_schema_cache(args.cache_dir or module.DEFAULT_CACHE_DIR, offline=True)
+    if args.memoize and hasattr(validate_schema, "configure_result_memo"):
+        validate_schema.configure_result_memo()
+    reports_results = "results" in inspect.signature(validate_schema.process_file).parameters
+
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        started = time.perf_counter()
+        if args.snapshot:
+            context_urls, snapshot = loader.load_schema_snapshot(args.snapshot)
+        else:
+            context_urls, snapshot = loader.prefetch_schema_snapshot(files, args.core_only)
+        store = build_schema_store(validate_schema, context_urls, snapshot)
+        schema_load_ms = (time.perf_counter() - started) * 1000
+
+        per_file = {}
+        results = []
+        validate_started = time.perf_counter()
+        for filepath in files:
+            file_results = []
+            file_started = time.perf_counter()
+            if reports_results:
+                validate_schema.process_file(filepath, *store, core_only=args.core_only, results=file_results)
+            else:
+                validate_schema.process_file(filepath, *store, core_only=args.core_only)
+            per_file[filepath] = {
+                "ms": round((time.perf_counter() - file_started) * 1000, 3),
+                "objects": len(file_results) if reports_results else None,
+            }
+            results.extend(file_results)
+        validate_ms = (time.perf_counter() - validate_started) * 1000
+
+    per_type = {}
+    for result in results:
+        entry = per_type.setdefault(result.schema_type or "(unknown)", {"ms": 0.0, "objects": 0})
+        entry["ms"] += result.duration_ms
+        entry["objects"] += 1
+    for entry in per_type.values():
+        entry["ms"] = round(entry["ms"], 3)
+
+    validator_cache = getattr(validate_schema, "_validator_cache", None)
+    result_memo = getattr(validate_schema, "_result_memo", None)
+    schema_cache = getattr(validate_schema, "_schema_cache", None)
+    return {
+        "python": platform.python_version(),
+        "files": len(files),
+        "objects": len(results) if reports_results else None,
+        "invalid": sum(1 for result in results if not result.valid) if reports_results else None,
+        "schemas": len(snapshot),
+        "schema_load_ms": round(schema_load_ms, 3),
+        "validate_ms": round(validate_ms, 3),
+        "objects_per_sec": round(len(results) / (validate_ms / 1000), 1) if validate_ms and reports_results else None,
+        "peak_rss_mb": round(peak_rss_mb(), 1),
+        "cache": {
+            "validator_hit_rate": hit_rate(validator_cache.hits, validator_cache.misses) if validator_cache else None,
+            "result_memo_hit_rate": hit_rate(result_memo.hits, result_memo.misses) if result_memo else None,
+            "schema_cache": dict(schema_cache.stats) if schema_cache else None,
+        },
+        "per_file": per_file,
+        "per_type": dict(sorted(per_type.items())),
+    }
+
+
+def compare_to_baseline(report: dict, baseline: dict, threshold: float) -> list[str]:
+    """Describe every metric that got slower than baseline by more than threshold (a fraction)."""
+    regressions = []
+
+    def check(label: str, current: float | None, previous: float | None, higher_is_better: bool = False) -> None:
+        if not current or not previous:
+            return
+        change = (previous - current) / previous if higher_is_better else (current - previous) / previous
+        if change > threshold:
+            regressions.append(f"{label}: {previous:g} -> {current:g} ({change:+.0%} worse)")
+
+    check("validate_ms", report["validate_ms"], baseline.get("validate_ms"))
+    check("objects_per_sec", report["objects_per_sec"], baseline.get("objects_per_sec"), higher_is_better=True)
+    check("peak_rss_mb", report["peak_rss_mb"], baseline.get("peak_rss_mb"))
+    for schema_type, entry in report["per_type"].items():
+        previous = baseline.get("per_type", {}).get(schema_type)
+        if previous and previous.get("objects") == entry["objects"] and previous.get("ms", 0) >= MIN_COMPARED_TYPE_MS:
+            check(f"per_type[{schema_type}].ms", entry["ms"], previous.get("ms"))
+    return regressions
+
+
+def run_corpus(args: argparse.Namespace) -> int:
+    report = run_corpus_benchmark(args)
+    cache = report["cache"]
+    if report["objects"] is None:
+        print(f"Validated {report['files']} files (this validator does not report per-object results)")
+    else:
+        print(f"Validated {report['objects']} objects in {report['files']} files ({report['invalid']} invalid)")
+    print(f"  schema load:     {report['schema_load_ms']:.1f} ms ({report['schemas']} schemas)")
+    print(f"  validation:      {report['validate_ms']:.1f} ms, {report['objects_per_sec']} objects/sec")
+    print(f"  peak RSS:        {report['peak_rss_mb']} MB")
+    print(f"  validator cache: {cache['validator_hit_rate']} hit rate")
+    if cache["result_memo_hit_rate"] is not None:
+        print(f"  result memo:     {cache['result_memo_hit_rate']} hit rate")
+
+    print(f"\nSlowest {args.top} files:")
+    slowest = sorted(report["per_file"].items(), key=lambda item: item[1]["ms"], reverse=True)[:args.top]
+    for filepath, entry in slowest:
+        print(f"  {entry['ms']:>9.1f} ms {'-' if entry['objects'] is None else entry['objects']:>5} objects  {filepath}")
+    print(f"\nSlowest {args.top} schema types:")
+    slowest = sorted(report["per_type"].items(), key=lambda item: item[1]["ms"], reverse=True)[:args.top]
+    for schema_type, entry in slowest:
+        print(f"  {entry['ms']:>9.1f} ms {entry['objects']:>5} objects  {schema_type}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare_to_baseline(report, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions against {args.baseline} (threshold {args.threshold:.0%}):")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"\nNo regressions against {args.baseline} (threshold {args.threshold:.0%})")
+    return 0
+
+
+def fastest(reports: list[dict]) -> dict:
+    """
+    Combine the rounds of one side into a single report.
+
+    Noise only ever makes a run slower, so the fastest round is kept, with each
+    per-type time replaced by that type's fastest time in any round: a single round
+    is rarely the fastest for every type at once.
+    """
+    best = min(reports, key=lambda report: report["validate_ms"])
+    per_type = {
+        schema_type: dict(entry, ms=min(report["per_type"][schema_type]["ms"]
+                                        for report in reports if schema_type in report["per_type"]))
+        for schema_type, entry in best["per_type"].items()
+    }
+    return dict(best, per_type=per_type)
+
+
+def run_compare(args: argparse.Namespace) -> int:
+    """Benchmark args.ref's validate_schema.py against the working tree's, alternating runs."""
+    with tempfile.TemporaryDirectory() as tmp:
+        base_validator = os.path.join(tmp, "validate_schema.py")
+        with open(base_validator, "wb") as f:
+            subprocess.run(
+                ["git", "show", f"{args.ref}:scripts/validate_schema.py"], cwd=REPO_ROOT, stdout=f, check=True
+            )
+
+        corpus = [sys.executable, str(Path(__file__).resolve()), "corpus", *args.files]
+        if args.snapshot:
+            corpus += ["--snapshot", args.snapshot]
+        if args.cache_dir:
+            corpus += ["--cache-dir", args.cache_dir]
+        if args.core_only:
+            corpus.append("--core-only")
+        if args.memoize:
+            corpus.append("--memoize")
+
+        reports = {"base": [], "head": []}
+        for round_number in range(1, args.rounds + 1):
+            for side, validator in (("base", base_validator), ("head", None)):
+                output = os.path.join(tmp, f"{side}-{round_number}.json")
+                argv = corpus + ["--output", output] + (["--validator", validator] if validator else [])
+                subprocess.run(argv, stdout=subprocess.DEVNULL, check=True)
+                with open(output) as f:
+                    reports[side].append(json.load(f))
+
+    base, head = fastest(reports["base"]), fastest(reports["head"])
+    print(f"{'':<18} {args.ref:>14} {'working tree':>14}")
+    for label, key in (("validate ms", "validate_ms"), ("objects/sec", "objects_per_sec"),
+                       ("schema load ms", "schema_load_ms"), ("peak RSS MB", "peak_rss_mb")):
+        print(f"{label:<18} {str(base[key]):>14} {str(head[key]):>14}")
+    if base["objects"] is None:
+        print(f"\nNote: {args.ref}'s validate_schema.py does not report per-object results; only times are compared")
+    elif (base["objects"], base["invalid"]) != (head["objects"], head["invalid"]):
+        print(f"\nNote: results differ ({base['objects']} objects, {base['invalid']} invalid -> "
+              f"{head['objects']} objects, {head['invalid']} invalid)")
+
+    regressions = compare_to_baseline(head, base, args.threshold)
+    if regressions:
+        print(f"\nRegressions against {args.ref} (threshold {args.threshold:.0%}, best of {args.rounds} rounds):")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"\nNo regressions against {args.ref} (threshold {args.threshold:.0%}, best of {args.rounds} rounds)")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark validate_schema.py")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    startup = subparsers.add_parser("startup", help="Measure CLI start-up and single-file latency")
+    startup.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help=f"Runs per command (default: {DEFAULT_REPEAT})")
+    startup.add_argument("--file", help="Also time validating this file end to end")
+    startup.add_argument("--snapshot", help="Pass --snapshot PATH to the single-file run")
+    startup.add_argument("--offline", action="store_true", help="Pass --offline to the single-file run")
+    startup.add_argument("--cache-dir", help="Pass --cache-dir DIR to the single-file run")
+    startup.set_defaults(func=run_startup)
+
+    corpus = subparsers.add_parser("corpus", help="Validate the example and Postman corpus and report hot spots")
+    corpus.add_argument("files", nargs="*", help="Files to validate instead of the default corpus")
+    corpus.add_argument("--snapshot", help="Schema snapshot written by validate_schema.py --save-snapshot")
+    corpus.add_argument("--cache-dir", help="On-disk schema cache to prefetch from (offline) when no --snapshot is given")
+    corpus.add_argument("--core-only", action="store_true", help="Only validate core Beckn objects")
+    corpus.add_argument("--memoize", action="store_true", help="Enable the validation result memo")
+    corpus.add_argument("--top", type=int, default=DEFAULT_TOP, help=f"Rows in the per-file and per-type tables (default: {DEFAULT_TOP})")
+    corpus.add_argument("--output", help="Write the full report as JSON (usable as a later --baseline)")
+    corpus.add_argument("--baseline", help="Compare against a report written by --output on the same machine")
+    corpus.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"Relative slowdown counted as a regression; machine-dependent (default: {DEFAULT_THRESHOLD})",
+    )
+    corpus.add_argument("--validator", help="Benchmark this copy of validate_schema.py instead of the working tree's")
+    corpus.set_defaults(func=run_corpus)
+
+    compare = subparsers.add_parser(
+        "compare", help="Benchmark a git ref's validate_schema.py against the working tree's on this machine"
+    )
+    compare.add_argument("files", nargs="*", help="Files to validate instead of the default corpus")
+    compare.add_argument("--ref", default="HEAD", help="Git ref to compare against (default: HEAD)")
+    compare.add_argument("--snapshot", help="Schema snapshot written by validate_schema.py --save-snapshot")
+    compare.add_argument("--cache-dir", help="On-disk schema cache to prefetch from (offline) when no --snapshot is given")
+    compare.add_argument("--core-only", action="store_true", help="Only validate core Beckn objects")
+    compare.add_argument("--memoize", action="store_true", help="Enable the validation result memo")
+    compare.add_argument(
+        "--rounds", type=int, default=DEFAULT_ROUNDS,
+        help=f"Alternating runs per side; each side's fastest is compared (default: {DEFAULT_ROUNDS})",
+    )
+    compare.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help=f"Relative slowdown counted as a regression; machine-dependent (default: {DEFAULT_THRESHOLD})",
+    )
+    compare.set_defaults(func=run_compare)
+
+    args = parser.parse_args()
+    if getattr(args, "rounds", 1) < 1:
+        parser.error("--rounds must be at least 1")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -57,23 +57,31 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 
-# Import validation functions from validate_schema
-try:
-    # Try importing as module (if scripts directory is in path)
-    from validate_schema import get_schema_store, process_file
-except ImportError:
-    # If running as a script, import from same directory
-    import importlib.util
-    validate_schema_path = Path(__file__).parent / "validate_schema.py"
-    if validate_schema_path.exists():
+def load_validation_functions():
+    """
+    Import get_schema_store and process_file from validate_schema.
+
+    Only called for --validate, so generating a collection does not pay for loading
+    the validator and its dependencies.
+
+    Returns:
+        tuple: (get_schema_store, process_file), or (None, None) if validate_schema is unavailable
+    """
+    try:
+        # Try importing as module (if scripts directory is in path)
+        from validate_schema import get_schema_store, process_file
+    except ImportError:
+        # If running as a script, import from same directory
+        import importlib.util
+        validate_schema_path = Path(__file__).parent / "validate_schema.py"
+        if not validate_schema_path.exists():
+            return None, None
         spec = importlib.util.spec_from_file_location("validate_schema", validate_schema_path)
         validate_schema = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(validate_schema)
         get_schema_store = validate_schema.get_schema_store
         process_file = validate_schema.process_file
-    else:
-        get_schema_store = None
-        process_file = None
+    return get_schema_store, process_file
 
 
 # Configuration for different devkits
@@ -807,6 +815,7 @@ def main():
     
     # Validate collection if requested
     if args.validate:
+        get_schema_store, process_file = load_validation_functions()
         if get_schema_store is None or process_file is None:
             print("\n⚠ Warning: Schema validation module not available, skipping validation")
         else:
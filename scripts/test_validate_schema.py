@@ -0,0 +1,821 @@
+"""
+Tests for validate_schema.py.
+
+Run from the repository root:
+
+    python3 -m pytest -q scripts/test_validate_schema.py
+"""
+
+import copy
+import http.client
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import validate_schema as vs  # noqa: E402
+
+
+FOO_CONTEXT = "https://example.org/refs/heads/main/schema/Foo/v1/context.jsonld"
+FOO_SCHEMA_URL = "https://example.org/refs/heads/main/schema/Foo/v1/attributes.yaml"
+FOO_ATTRIBUTES_YAML = """
+components:
+  schemas:
+    Foo:
+      type: object
+      required: [count]
+      additionalProperties: false
+      properties:
+        count:
+          type: integer
+"""
+
+
+def _foo(count):
+    return {"@context": FOO_CONTEXT, "@type": "Foo", "count": count}
+
+
+class IsolatedSchemasTestCase(unittest.TestCase):
+    """
+    Serve FOO_CONTEXT's schema from a temporary directory, with an empty offline
+    schema cache so nothing reaches the network.
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.write_schema("Foo", FOO_ATTRIBUTES_YAML)
+
+        saved = (vs._schema_cache, vs._local_schema_resolver, vs._result_memo)
+        self.addCleanup(self._restore, saved)
+        vs.configure_schema_cache(os.path.join(self.tmp, "cache"), offline=True)
+        vs.configure_local_schemas([("https://example.org/refs/heads/main/schema/", os.path.join(self.tmp, "schema"))])
+        vs.configure_result_memo(0)
+        # Compiled validators and the attribute index are keyed by URL, and the URLs
+        # are the same in every test
+        vs._validator_cache.clear()
+        vs._attribute_schema_index.clear()
+        vs._schema_load_errors.clear()
+        vs._unresolved_schema_refs.clear()
+        self.store = vs.get_schema_store()
+
+    @staticmethod
+    def _restore(saved):
+        vs._schema_cache, vs._local_schema_resolver, vs._result_memo = saved
+
+    def write_schema(self, name, text, version="v1"):
+        """Write schema/<name>/<version>/attributes.yaml and return its URL."""
+        schema_dir = os.path.join(self.tmp, "schema", name, version)
+        os.makedirs(schema_dir, exist_ok=True)
+        with open(os.path.join(schema_dir, "attributes.yaml"), "w") as f:
+            f.write(text)
+        return f"https://example.org/refs/heads/main/schema/{name}/{version}/attributes.yaml"
+
+    def write_file(self, name, text):
+        path = os.path.join(self.tmp, name)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
+
+
+def _stream_elements(text, chunk_size):
+    return [message for _, message in vs.iter_json_array_messages(io.StringIO(text), chunk_size=chunk_size)]
+
+
+class TestIterJsonArrayMessages(unittest.TestCase):
+    DOCUMENTS = [
+        "[]",
+        " [ ] \n",
+        "[null, -12500.0, 1]",
+        "[1e5, -0.25E-3, 2.5e+10, 0, -0, 123456789012345678901234567890]",
+        "[true, false, null, \"a,b]c\", \"\\u00e9\\\"\"]",
+        '[{"message": {"order": {"@type": "beckn:Order", "items": [1, 2.5, {"x": []}]}}}, [], {}]',
+        "[\n  1,\n  [2, [3, [4]]],\n  {\"k\": \"v\"}\n]\n",
+        "[NaN, Infinity, -Infinity]",
+    ]
+
+    def test_matches_json_load_for_every_chunk_size(self):
+        for text in self.DOCUMENTS:
+            expected = json.loads(text)
+            for chunk_size in range(1, len(text) + 2):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    self.assertEqual(
+                        json.dumps(_stream_elements(text, chunk_size)), json.dumps(expected)
+                    )
+
+    def test_labels_are_element_indices(self):
+        labels = [label for label, _ in vs.iter_json_array_messages(io.StringIO("[1, 2, 3]"))]
+        self.assertEqual(labels, ["[0]", "[1]", "[2]"])
+
+    def test_rejects_what_json_load_rejects(self):
+        for text in ["[1,,2]", "[1 2]", "[,1]", "[1,]", "[1]trailing", "[1] [2]", "[1", "[", "", "  ",
+                     "[1.]", "[1e]", "[-]", "[tru]", "[\"open]", "[1}", "[1]]"]:
+            with self.assertRaises(json.JSONDecodeError, msg="json.loads accepts it"):
+                json.loads(text)
+            for chunk_size in (1, 2, 3, 7, vs.STREAM_CHUNK_SIZE):
+                with self.subTest(text=text, chunk_size=chunk_size):
+                    with self.assertRaises(json.JSONDecodeError):
+                        _stream_elements(text, chunk_size)
+
+    def test_rejects_a_top_level_value_that_is_not_an_array(self):
+        for text in ["{}", "1", "\"[]\"", "null"]:
+            with self.subTest(text=text):
+                with self.assertRaisesRegex(json.JSONDecodeError, "top-level JSON array"):
+                    _stream_elements(text, 4)
+
+    def test_elements_before_an_error_are_still_yielded(self):
+        messages = vs.iter_json_array_messages(io.StringIO("[1, 2 3]"), chunk_size=2)
+        self.assertEqual(next(messages), ("[0]", 1))
+        self.assertEqual(next(messages), ("[1]", 2))
+        with self.assertRaises(json.JSONDecodeError):
+            next(messages)
+
+
+class TestLazyImports(IsolatedSchemasTestCase):
+    def test_loaders_work_before_anything_else_imported_jsonschema(self):
+        # A fresh interpreter, so the loader is the first code to need referencing
+        script = (
+            "import sys; sys.path.insert(0, sys.argv[1]); import validate_schema as vs\n"
+            "vs.configure_local_schemas([('https://example.org/refs/heads/main/schema/', sys.argv[2])])\n"
+            "from referencing import Registry\n"
+            "registry_list, schemas = [Registry()], {}\n"
+            "assert vs.load_schema_for_context_url(sys.argv[3], schemas, registry_list) is not None\n"
+            "assert sys.argv[4] in registry_list[0]\n"
+        )
+        subprocess.run(
+            [sys.executable, "-c", script, os.path.dirname(os.path.abspath(vs.__file__)),
+             os.path.join(self.tmp, "schema"), FOO_CONTEXT, FOO_SCHEMA_URL],
+            check=True, capture_output=True,
+        )
+
+
+class TestSchemaUrls(unittest.TestCase):
+    def test_core_beckn_schema_only_for_payloads_with_a_core_message_object(self):
+        for payload, expected in [
+            ({"wrapper": _foo(1)}, [FOO_SCHEMA_URL]),
+            ({"message": {"note": "no order"}, "x": _foo(1)}, [FOO_SCHEMA_URL]),
+            ({"message": {"order": {"id": "o-1"}}}, [vs.CORE_BECKN_SCHEMA_URL]),
+            ({"message": {"contract": {}, "order": _foo(1)}}, sorted([vs.CORE_BECKN_SCHEMA_URL, FOO_SCHEMA_URL])),
+        ]:
+            with self.subTest(payload=payload):
+                context_urls = set()
+                vs.collect_context_urls(payload, context_urls)
+                self.assertEqual(vs.get_schema_urls_for_context_urls(context_urls), expected)
+
+
+class TestRefreshLocalSchemas(IsolatedSchemasTestCase):
+    def _validate(self, payload):
+        registry_list, attributes_schema, attribute_schemas_map = self.store
+        results = []
+        with open(os.devnull, "w") as devnull, vs.redirect_stdout(devnull):
+            vs.refresh_local_schemas(registry_list, attribute_schemas_map)
+            vs.validate_payload(payload, registry_list, attributes_schema, attribute_schemas_map, results=results)
+        return [(r.valid, r.message) for r in results]
+
+    def _edit_schema(self, text):
+        path = os.path.join(self.tmp, "schema", "Foo", "v1", "attributes.yaml")
+        mtime_ns = os.stat(path).st_mtime_ns
+        with open(path, "w") as f:
+            f.write(text)
+        os.utime(path, ns=(mtime_ns + 10**9, mtime_ns + 10**9))
+        return path
+
+    def test_edited_schema_takes_effect(self):
+        self.assertEqual(self._validate(_foo("x"))[0][0], False)
+        self._edit_schema(FOO_ATTRIBUTES_YAML.replace("type: integer", "type: string"))
+        self.assertEqual(self._validate(_foo("x")), [(True, "")])
+        self.assertEqual(self._validate(_foo(1))[0][0], False)
+
+    def test_broken_or_removed_schema_is_reported(self):
+        self._validate(_foo(1))
+        self._edit_schema("components: [unclosed\n")
+        (valid, message), = self._validate(_foo(1))
+        self.assertFalse(valid)
+        self.assertTrue(message.startswith("Schema could not be loaded"))
+
+        os.remove(self._edit_schema(FOO_ATTRIBUTES_YAML))
+        with self.assertRaises(vs.SchemaCacheMissError):  # falls through to the offline cache
+            self._validate(_foo(1))
+
+    def test_unchanged_files_are_not_reloaded(self):
+        self._validate(_foo(1))
+        registry_list, _, attribute_schemas_map = self.store
+        self.assertEqual(vs.refresh_local_schemas(registry_list, attribute_schemas_map), [])
+
+
+class TestCrossDocumentRefs(IsolatedSchemasTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write_schema("Foo", FOO_ATTRIBUTES_YAML.replace(
+            "type: integer", '$ref: "../../Bar/v1/attributes.yaml#/components/schemas/Count"'))
+        self.bar_url = self.write_schema("Bar", """
+components:
+  schemas:
+    Count:
+      type: integer
+      minimum: 0
+""")
+
+    def _validate(self, payload):
+        registry_list, attributes_schema, attribute_schemas_map = self.store
+        results, output = [], io.StringIO()
+        with vs.redirect_stdout(output):
+            vs.validate_payload(payload, registry_list, attributes_schema, attribute_schemas_map, results=results)
+        return [(r.valid, r.message) for r in results], output.getvalue()
+
+    def test_relative_ref_to_another_document_resolves(self):
+        results, output = self._validate({"a": _foo(1), "b": _foo(-1)})
+        self.assertEqual(results, [(True, ""), (False, "-1 is less than the minimum of 0")])
+        self.assertIn(self.bar_url, output)
+        self.assertNotIn("validating the fragment only", output)
+
+    def test_missing_ref_target_is_reported_per_object(self):
+        self.write_schema("Foo", FOO_ATTRIBUTES_YAML + """        note:
+          $ref: "../../Missing/v1/attributes.yaml#/components/schemas/Note"
+""")
+        results, output = self._validate({"a": _foo(1), "b": dict(_foo(2), note="x")})
+        self.assertIn("validating the fragment only", output)
+        self.assertEqual(results, [
+            (True, ""),
+            (False, "Could not resolve $ref: ../../Missing/v1/attributes.yaml#/components/schemas/Note"),
+        ])
+
+    def test_resolved_schema_has_only_absolute_refs(self):
+        vs.index_attribute_schemas(FOO_SCHEMA_URL, {"components": {"schemas": {"Foo": {
+            "properties": {"a": {"$ref": "#/components/schemas/A"}, "b": {"$ref": "../../Bar/v1/attributes.yaml#/x"}},
+        }}}})
+        resolved, _ = vs._attribute_schema_index[(FOO_SCHEMA_URL, "Foo")]
+        self.assertEqual(
+            [resolved["properties"][name]["$ref"] for name in ("a", "b")],
+            [FOO_SCHEMA_URL + "#/components/schemas/A", self.bar_url + "#/x"],
+        )
+
+
+class TestSchemaClosure(IsolatedSchemasTestCase):
+    BAR_URL = "https://remote.example.org/schema/Bar/attributes.yaml"
+    BAZ_URL = "https://remote.example.org/schema/Baz/attributes.yaml"
+
+    def setUp(self):
+        super().setUp()
+        self.write_schema("Foo", FOO_ATTRIBUTES_YAML.replace(
+            "type: integer", f'$ref: "{self.BAR_URL}#/components/schemas/Count"'))
+        # Foo -> Bar -> Baz, with Bar and Baz only in the (offline) schema cache
+        vs._schema_cache._write_entry(self.BAR_URL, """
+components:
+  schemas:
+    Count:
+      allOf:
+        - $ref: "../Baz/attributes.yaml#/components/schemas/NonNegative"
+""", None, None)
+        vs._schema_cache._write_entry(self.BAZ_URL, """
+components:
+  schemas:
+    NonNegative:
+      type: integer
+      minimum: 0
+""", None, None)
+        self.payload_path = self.write_file("payload.json", json.dumps({"a": _foo(1), "b": _foo(-1)}))
+
+    def _prefetch(self):
+        with open(os.devnull, "w") as devnull, vs.redirect_stdout(devnull):
+            return vs.prefetch_schema_snapshot([self.payload_path])
+
+    def test_prefetch_loads_the_transitive_closure(self):
+        context_urls, snapshot = self._prefetch()
+        self.assertEqual(sorted(snapshot), sorted([FOO_SCHEMA_URL, self.BAR_URL, self.BAZ_URL]))
+        graph = vs.build_schema_graph(context_urls, snapshot)
+        self.assertEqual(graph["contexts"], {FOO_CONTEXT: FOO_SCHEMA_URL})
+        self.assertEqual(graph["schemas"][FOO_SCHEMA_URL]["depends_on"], [self.BAR_URL])
+        self.assertEqual(graph["schemas"][FOO_SCHEMA_URL]["closure"], [self.BAR_URL, self.BAZ_URL])
+        self.assertEqual(graph["unresolved"], [])
+
+    def test_validation_needs_no_further_loads_or_fallback(self):
+        registry_list, attributes_schema, attribute_schemas_map = vs.build_schema_store_from_snapshot(
+            *self._prefetch())
+        results, output = [], io.StringIO()
+        with vs.redirect_stdout(output):
+            with open(self.payload_path) as f:
+                vs.validate_payload(json.load(f), registry_list, attributes_schema, attribute_schemas_map,
+                                    results=results)
+        self.assertEqual([(r.valid, r.message) for r in results],
+                         [(True, ""), (False, "-1 is less than the minimum of 0")])
+        self.assertNotIn("Loaded", output.getvalue())
+        self.assertNotIn("fragment only", output.getvalue())
+
+    def test_unloadable_target_is_unresolved_in_the_graph(self):
+        os.remove(vs._schema_cache._index_path(self.BAZ_URL))
+        context_urls, snapshot = self._prefetch()
+        self.assertEqual(sorted(snapshot), sorted([FOO_SCHEMA_URL, self.BAR_URL]))
+        self.assertEqual(vs.build_schema_graph(context_urls, snapshot)["unresolved"], [self.BAZ_URL])
+
+
+class TestSchemaCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+
+    def test_offline_serves_cached_entries_and_raises_on_a_miss(self):
+        vs.SchemaCache(self.tmp)._write_entry("https://example.org/a.yaml", "a: 1\n", '"etag"', None)
+        cache = vs.SchemaCache(self.tmp, offline=True)
+        self.assertEqual(cache.fetch("https://example.org/a.yaml"), "a: 1\n")
+        self.assertEqual(cache.stats["fresh"], 1)
+        with self.assertRaises(vs.SchemaCacheMissError):
+            cache.fetch("https://example.org/b.yaml")
+
+    def test_corrupt_object_is_a_miss(self):
+        cache = vs.SchemaCache(self.tmp, offline=True)
+        cache._write_entry("https://example.org/a.yaml", "a: 1\n", None, None)
+        objects = os.path.join(self.tmp, "objects")
+        with open(os.path.join(objects, os.listdir(objects)[0]), "w") as f:
+            f.write("tampered")
+        with self.assertRaises(vs.SchemaCacheMissError):
+            cache.fetch("https://example.org/a.yaml")
+
+    def test_concurrent_writes_of_the_same_object_all_succeed(self):
+        cache = vs.SchemaCache(self.tmp)
+        errors = []
+
+        def write(i):
+            try:
+                cache._write_entry(f"https://example.org/{i % 4}.yaml", "same body", None, None)
+            except Exception as e:  # pragma: no cover - reported below
+                errors.append(e)
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(64)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(len(os.listdir(os.path.join(self.tmp, "objects"))), 1)
+        self.assertEqual(len(os.listdir(os.path.join(self.tmp, "index"))), 4)
+        offline = vs.SchemaCache(self.tmp, offline=True)
+        for i in range(4):
+            self.assertEqual(offline.fetch(f"https://example.org/{i}.yaml"), "same body")
+
+
+class TestValidatorCache(unittest.TestCase):
+    URL = "https://example.org/schema/Foo/v1/attributes.yaml"
+
+    def setUp(self):
+        vs._import_validation_deps()
+        vs._validator_cache.clear()
+        self.addCleanup(vs._validator_cache.clear)
+
+    def test_compiles_once_per_key(self):
+        cache, builds = vs.ValidatorCache(), []
+
+        def build():
+            builds.append(1)
+            return {"type": "integer"}
+
+        registry = vs.Registry()
+        first = cache.get((self.URL, "Foo", "attribute"), build, registry)
+        self.assertIs(cache.get((self.URL, "Foo", "attribute"), build, registry), first)
+        self.assertEqual((len(builds), cache.hits, cache.misses), (1, 1, 1))
+
+        # A grown Registry rebinds the compiled validator instead of compiling it again
+        grown = registry.with_resource(self.URL, vs.Resource.from_contents({}, vs.DRAFT202012))
+        rebound = cache.get((self.URL, "Foo", "attribute"), build, grown)
+        self.assertIsNot(rebound, first)
+        self.assertEqual((len(builds), cache.hits, cache.misses, len(cache)), (1, 2, 1, 1))
+        self.assertFalse(rebound.is_valid("x"))
+
+    def test_modes_of_one_type_are_cached_separately(self):
+        registry = vs.Registry()
+        for mode, schema, valid in [
+            ("core", {"type": "string"}, True),
+            ("attribute", {"type": "integer"}, False),
+            ("attribute-fragment", {"maxLength": 0}, False),
+            ("core", {"type": "integer"}, True),  # already compiled: the first schema applies
+        ]:
+            with self.subTest(mode=mode, schema=schema):
+                try:
+                    vs.validate_cached("x", (self.URL, "Foo", mode), lambda: schema, registry)
+                    outcome = True
+                except vs.ValidationError:
+                    outcome = False
+                self.assertEqual(outcome, valid)
+        self.assertEqual(len(vs._validator_cache), 3)
+
+
+class TestValidatorCacheKeys(IsolatedSchemasTestCase):
+    CORE_CONTEXT = "https://example.org/refs/heads/main/schema/core/v2/context.jsonld"
+
+    def test_core_and_attribute_types_of_the_same_name_do_not_share_a_validator(self):
+        core_url = self.write_schema("core", """
+components:
+  schemas:
+    Foo:
+      type: object
+      required: [name]
+""", version="v2")
+        registry_list, attributes_schema, attribute_schemas_map = self.store
+        payload = {
+            "core": {"@context": self.CORE_CONTEXT, "@type": "beckn:Foo", "name": "n"},
+            "attribute": _foo(1),
+            "core-invalid": {"@context": self.CORE_CONTEXT, "@type": "beckn:Foo", "count": 1},
+            "attribute-invalid": dict(_foo(1), name="n"),
+        }
+        results = []
+        hits, misses = vs._validator_cache.hits, vs._validator_cache.misses
+        with open(os.devnull, "w") as devnull, vs.redirect_stdout(devnull):
+            vs.validate_payload(payload, registry_list, attributes_schema, attribute_schemas_map, results=results)
+        self.assertEqual([(r.path, r.valid) for r in results],
+                         [("core", True), ("attribute", True), ("core-invalid", False), ("attribute-invalid", False)])
+        self.assertEqual(set(vs._validator_cache._validators),
+                         {(core_url, "Foo", "core"), (FOO_SCHEMA_URL, "Foo", "attribute")})
+        self.assertEqual((vs._validator_cache.hits - hits, vs._validator_cache.misses - misses), (2, 2))
+
+
+def _per_call_schemas(schema_def, schema_url):
+    """The (resolved, fragment) schemas _validate_attribute_object used to build on every call."""
+    def convert_relative_refs(obj):
+        if isinstance(obj, dict):
+            return {k: f"{schema_url}{v}" if k == "$ref" and isinstance(v, str) and v.startswith("#")
+                    else convert_relative_refs(v) for k, v in obj.items()}
+        if isinstance(obj, list):
+            return [convert_relative_refs(item) for item in obj]
+        return obj
+
+    def allow_jsonld_keywords(schema):
+        if schema.get("additionalProperties") is False:
+            schema.setdefault("properties", {})
+            schema["properties"]["@context"] = {"type": "string"}
+            schema["properties"]["@type"] = {"type": "string"}
+        return schema
+
+    return (allow_jsonld_keywords(convert_relative_refs(copy.deepcopy(schema_def))),
+            allow_jsonld_keywords(copy.deepcopy(schema_def)))
+
+
+class TestAttributeSchemaIndex(unittest.TestCase):
+    URL = "https://example.org/refs/heads/main/schema/Foo/v1/attributes.yaml"
+    DOCUMENT = {"components": {"schemas": {
+        "Closed": {
+            "type": "object",
+            "additionalProperties": False,
+            "properties": {"count": {"$ref": "#/components/schemas/Count"}},
+            "allOf": [{"$ref": "#/components/schemas/Base"}, {"required": ["count"]}],
+        },
+        "ClosedWithoutProperties": {"type": "object", "additionalProperties": False},
+        "Open": {
+            "type": "object",
+            "properties": {"items": {"type": "array", "items": {"$ref": "#/components/schemas/Count"}}},
+        },
+        "Remote": {"$ref": "https://example.org/schema/Bar/v1/attributes.yaml#/components/schemas/Bar"},
+        "Count": {"type": "integer"},
+        "Base": {"type": "object"},
+        "NotASchema": "ignored",
+    }}}
+
+    def setUp(self):
+        vs._attribute_schema_index.clear()
+        self.addCleanup(vs._attribute_schema_index.clear)
+
+    def test_matches_the_per_call_schemas(self):
+        document = copy.deepcopy(self.DOCUMENT)
+        vs.index_attribute_schemas(self.URL, document)
+        self.assertEqual(document, self.DOCUMENT)  # the loaded document is not modified
+        for schema_type, schema_def in self.DOCUMENT["components"]["schemas"].items():
+            with self.subTest(schema_type=schema_type):
+                if not isinstance(schema_def, dict):
+                    self.assertNotIn((self.URL, schema_type), vs._attribute_schema_index)
+                    continue
+                self.assertEqual(vs._get_attribute_validation_schemas(self.URL, schema_type, schema_def),
+                                 _per_call_schemas(schema_def, self.URL))
+
+    def test_jsonld_keywords_are_allowed_only_on_closed_schemas(self):
+        vs.index_attribute_schemas(self.URL, self.DOCUMENT)
+        for schema_type, injected in [("Closed", True), ("ClosedWithoutProperties", True), ("Open", False)]:
+            with self.subTest(schema_type=schema_type):
+                for schema in vs._attribute_schema_index[(self.URL, schema_type)]:
+                    self.assertEqual("@context" in schema.get("properties", {}), injected)
+                    self.assertEqual("@type" in schema.get("properties", {}), injected)
+
+    def test_unindexed_type_gets_a_fragment_only_entry(self):
+        schema_def = {"type": "object", "additionalProperties": False}
+        resolved, fragment = vs._get_attribute_validation_schemas(self.URL, "Standalone", schema_def)
+        self.assertIsNone(resolved)
+        self.assertEqual(fragment, _per_call_schemas(schema_def, self.URL)[1])
+        self.assertEqual(schema_def, {"type": "object", "additionalProperties": False})
+
+
+class TestParallelValidation(IsolatedSchemasTestCase):
+    def setUp(self):
+        super().setUp()
+        self.valid = [
+            self.write_file("a.json", json.dumps({"wrapper": _foo(1)})),
+            self.write_file("b.json", json.dumps({"items": [_foo(2), {"nested": _foo(3)}]})),
+            self.write_file("c.json", json.dumps({"info": {"_postman_id": "x"}, "item": [
+                {"name": "Request", "request": {"body": {"mode": "raw", "raw": json.dumps(_foo(4))}}},
+            ]})),
+        ]
+        self.invalid = [
+            self.write_file("d.json", json.dumps([_foo("x"), _foo(5)])),
+            self.write_file("e.json", "{not json"),
+        ]
+
+    def _run(self, files, jobs):
+        """Run the CLI and return (exit status, JSONL results without timings, summary line)."""
+        process = subprocess.run(
+            [sys.executable, vs.__file__, "--offline", "--cache-dir", os.path.join(self.tmp, "cache"),
+             "--local-schema-map", f"https://example.org/refs/heads/main/schema/={os.path.join(self.tmp, 'schema')}",
+             "--format", "jsonl", "--jobs", str(jobs), *files],
+            capture_output=True, text=True,
+        )
+        results = [json.loads(line) for line in process.stdout.splitlines()]
+        for result in results:
+            del result["duration_ms"]
+        summary = [line for line in process.stderr.splitlines() if line.startswith("Validated ")]
+        return process.returncode, results, [line.rsplit(" (", 1)[0] for line in summary]
+
+    def test_jobs_matches_a_serial_run(self):
+        for files, status in [(self.valid, 0), (self.valid + self.invalid, 1)]:
+            with self.subTest(files=[os.path.basename(f) for f in files]):
+                serial = self._run(files, 1)
+                self.assertEqual(serial[0], status)
+                self.assertEqual(self._run(files, 2), serial)
+        status, results, summary = serial
+        self.assertEqual([(os.path.basename(r["file"]), r["valid"]) for r in results],
+                         [("a.json", True), ("b.json", True), ("b.json", True), ("c.json", True),
+                          ("d.json", False), ("d.json", True), ("e.json", False)])
+        self.assertEqual(summary, ["Validated 6 objects in 5 files: 1 invalid, 1 unparseable inputs"])
+
+
+def _recursive_object_paths(data, path=""):
+    """Paths of the @context/@type objects in data, found by the recursive walk validate_payload used to do."""
+    paths = []
+    if isinstance(data, dict):
+        if "@context" in data and "@type" in data:
+            paths.append(path)
+        for key, value in data.items():
+            paths.extend(_recursive_object_paths(value, f"{path}/{key}" if path else key))
+    elif isinstance(data, list):
+        for idx, item in enumerate(data):
+            paths.extend(_recursive_object_paths(item, f"{path}[{idx}]"))
+    return paths
+
+
+class TestPayloadTraversal(IsolatedSchemasTestCase):
+    def _validated_paths(self, payload):
+        registry_list, attributes_schema, attribute_schemas_map = self.store
+        results = []
+        with open(os.devnull, "w") as devnull, vs.redirect_stdout(devnull):
+            vs.validate_payload(payload, registry_list, attributes_schema, attribute_schemas_map, results=results)
+        return [r.path for r in results]
+
+    def test_paths_and_order_match_the_recursive_walk(self):
+        payloads = [
+            {"envelope": {"order": dict(_foo(1), child=_foo(2)), "items": [_foo(3), [[_foo(4)], {"x": _foo(5)}]]}},
+            [_foo(1), [_foo(2)], {"a/b": _foo(3), "": {"0": _foo(4)}}],
+            _foo(1),
+            {"scalars": [1, "two", None, True], "empty": {}, "list": []},
+        ]
+        for payload in payloads:
+            with self.subTest(payload=payload):
+                self.assertEqual(self._validated_paths(payload), _recursive_object_paths(payload))
+
+    def test_nesting_deeper_than_the_recursion_limit(self):
+        depth = sys.getrecursionlimit() + 100
+        payload = _foo(1)
+        for level in range(depth):
+            payload = {"child": payload} if level % 2 else [payload]
+        with self.assertRaises(RecursionError):
+            _recursive_object_paths(payload)
+        path, = self._validated_paths(payload)
+        self.assertEqual(path.count("child"), depth // 2)
+        self.assertEqual(path.count("[0]"), depth - depth // 2)
+        self.assertTrue(path.startswith("child[0]/child[0]"))
+
+
+class TestResultMemo(IsolatedSchemasTestCase):
+    def test_evicts_the_least_recently_used_outcome(self):
+        memo = vs.configure_result_memo(2)
+        self.assertIsNone(vs.configure_result_memo(0))
+        memo.store("a", None)
+        memo.store("b", None)
+        self.assertEqual(memo.lookup("a"), (True, None))  # "a" is now the most recently used
+        memo.store("c", None)
+        self.assertEqual(len(memo), 2)
+        self.assertEqual(memo.lookup("b"), (False, None))
+        self.assertEqual([memo.lookup(key)[0] for key in ("a", "c")], [True, True])
+        self.assertEqual((memo.hits, memo.misses), (3, 1))
+
+    def test_replayed_invalid_result_is_still_reported(self):
+        memo = vs.configure_result_memo(10)
+        registry_list, attributes_schema, attribute_schemas_map = self.store
+        results = []
+        with open(os.devnull, "w") as devnull, vs.redirect_stdout(devnull):
+            errors = vs.validate_payload({"a": _foo("x"), "b": _foo("x"), "c": _foo(1)}, registry_list,
+                                         attributes_schema, attribute_schemas_map, results=results)
+        self.assertEqual((memo.hits, memo.misses), (1, 2))
+        self.assertEqual([(r.path, r.valid, r.message, r.error_path) for r in results], [
+            ("a", False, "'x' is not of type 'integer'", "$.count"),
+            ("b", False, "'x' is not of type 'integer'", "$.count"),
+            ("c", True, "", ""),
+        ])
+        self.assertEqual(len(errors), 2)
+
+    def test_cli_exit_status_with_memoize(self):
+        path = self.write_file("payload.json", json.dumps([_foo("x"), _foo("x")]))
+        process = subprocess.run(
+            [sys.executable, vs.__file__, "--offline", "--cache-dir", os.path.join(self.tmp, "cache"),
+             "--local-schema-map", f"https://example.org/refs/heads/main/schema/={os.path.join(self.tmp, 'schema')}",
+             "--memoize", "--memo-size", "1", path],
+            capture_output=True, text=True,
+        )
+        self.assertEqual(process.returncode, 1)
+        self.assertIn("Validated 2 objects in 1 files: 2 invalid", process.stdout)
+        self.assertIn("Result memo: 1 validations skipped, 1 performed", process.stdout)
+
+
+class TestValidateMessageStream(IsolatedSchemasTestCase):
+    def _run(self, path, input_format):
+        registry_list, attributes_schema, attribute_schemas_map = self.store
+        results = []
+        with open(os.devnull, "w") as devnull, vs.redirect_stdout(devnull):
+            stats = vs.validate_message_stream(
+                path, input_format, registry_list, attributes_schema, attribute_schemas_map,
+                results=results, progress_every=0,
+            )
+        return stats, results
+
+    def test_ndjson(self):
+        lines = [json.dumps(_foo(1)), "", json.dumps({"wrapper": _foo("x")}), "{not json", json.dumps(_foo(3))]
+        stats, results = self._run(self.write_file("capture.ndjson", "\n".join(lines) + "\n"), "ndjson")
+        self.assertEqual(
+            {key: stats[key] for key in ("messages", "objects", "invalid", "parse_errors")},
+            {"messages": 4, "objects": 3, "invalid": 1, "parse_errors": 1},
+        )
+        self.assertEqual([(r.item, r.path, vs.is_parse_error(r)) for r in results],
+                         [("line 3", "wrapper", False), ("line 4", "", True)])
+
+    def test_json_array(self):
+        text = json.dumps([_foo(1), _foo(-2.5), {"no": "context"}, _foo(4)], indent=2)
+        stats, results = self._run(self.write_file("capture.json", text), "json-array")
+        self.assertEqual((stats["messages"], stats["objects"], stats["invalid"], stats["parse_errors"]), (4, 3, 1, 0))
+        self.assertEqual([r.item for r in results], ["[1]"])
+
+    def test_malformed_json_array_is_a_parse_error(self):
+        stats, results = self._run(self.write_file("capture.json", "[" + json.dumps(_foo(1)) + ",,]"), "json-array")
+        self.assertEqual((stats["messages"], stats["invalid"], stats["parse_errors"]), (1, 0, 1))
+        self.assertTrue(vs.is_parse_error(results[0]))
+
+    def test_unloadable_schema_is_reported_for_every_object(self):
+        schema = os.path.join(self.tmp, "schema", "Foo", "v1", "attributes.yaml")
+        with open(schema, "w") as f:
+            f.write("components: [unclosed\n")
+        lines = [json.dumps(_foo(1)), json.dumps(_foo(2))]
+        stats, results = self._run(self.write_file("capture.ndjson", "\n".join(lines)), "ndjson")
+        self.assertEqual((stats["objects"], stats["invalid"]), (2, 2))
+        self.assertTrue(all(r.message.startswith("Schema could not be loaded") for r in results))
+        self.assertEqual({r.schema_url for r in results}, {FOO_SCHEMA_URL})
+
+
+class TestReports(unittest.TestCase):
+    RESULTS = [
+        vs.ValidationResult(path="a", schema_type="Foo", schema_url=FOO_SCHEMA_URL, valid=True,
+                            duration_ms=1.5, file="one.json"),
+        vs.ValidationResult(path="b", schema_type="Foo", schema_url=FOO_SCHEMA_URL, valid=False,
+                            message="'count' is a required property", error_path="$", duration_ms=2.0,
+                            file="one.json", item="Folder / Request"),
+        vs.ValidationResult(path="", schema_type="", schema_url="", valid=False,
+                            message="Invalid JSON: Expecting value", file="two.json"),
+    ]
+
+    def _report(self, fmt):
+        stream = io.StringIO()
+        vs.write_report(self.RESULTS, fmt, stream)
+        return stream.getvalue()
+
+    def test_jsonl_round_trips(self):
+        lines = self._report("jsonl").splitlines()
+        self.assertEqual([vs.ValidationResult(**json.loads(line)) for line in lines], self.RESULTS)
+
+    def test_junit(self):
+        root = ET.fromstring(self._report("junit").split("?>", 1)[1])
+        self.assertEqual((root.get("tests"), root.get("failures")), ("3", "2"))
+        suites = root.findall("testsuite")
+        self.assertEqual([s.get("name") for s in suites], ["one.json", "two.json"])
+        failure = suites[0].findall("testcase")[1].find("failure")
+        self.assertEqual(failure.get("type"), "Foo")
+        self.assertEqual(suites[1].find("testcase/failure").get("type"), "ProcessingError")
+
+    def test_sarif(self):
+        log = json.loads(self._report("sarif"))
+        run = log["runs"][0]
+        self.assertEqual(log["version"], "2.1.0")
+        self.assertEqual([rule["id"] for rule in run["tool"]["driver"]["rules"]], ["Foo", "processing-error"])
+        self.assertEqual([r["ruleId"] for r in run["results"]], ["Foo", "processing-error"])
+        self.assertEqual(run["results"][0]["locations"][0]["logicalLocations"][0]["fullyQualifiedName"],
+                         "Folder / Request > b (Foo)")
+
+
+class TestValidationManifest(IsolatedSchemasTestCase):
+    def test_reuses_results_until_the_file_or_a_schema_changes(self):
+        path = self.write_file("payload.json", json.dumps({"wrapper": _foo(1)}))
+        snapshot = {FOO_SCHEMA_URL: {"components": {"schemas": {"Foo": {"type": "object"}}}}}
+        results = [vs.ValidationResult(path="wrapper", schema_type="Foo", schema_url=FOO_SCHEMA_URL, valid=True,
+                                       file=path)]
+        manifest_path = os.path.join(self.tmp, "manifest.json")
+        manifest = vs.ValidationManifest()
+        manifest.record(path, results, snapshot)
+        manifest.save(manifest_path)
+
+        self.assertEqual(vs.ValidationManifest.load(manifest_path).lookup(path, snapshot), results)
+        self.assertIsNone(vs.ValidationManifest.load(manifest_path, core_only=True).lookup(path, snapshot))
+        changed_schema = {FOO_SCHEMA_URL: {"components": {"schemas": {"Foo": {"type": "string"}}}}}
+        self.assertIsNone(vs.ValidationManifest.load(manifest_path).lookup(path, changed_schema))
+        self.write_file("payload.json", json.dumps({"wrapper": _foo(2)}))
+        self.assertIsNone(vs.ValidationManifest.load(manifest_path).lookup(path, snapshot))
+
+    def test_missing_or_unreadable_manifest_is_empty(self):
+        self.assertEqual(vs.ValidationManifest.load(os.path.join(self.tmp, "absent.json")).files, {})
+        with open(os.devnull, "w") as devnull, vs.redirect_stdout(devnull):
+            manifest = vs.ValidationManifest.load(self.write_file("broken.json", "{"))
+        self.assertEqual(manifest.files, {})
+
+
+class TestValidationServer(IsolatedSchemasTestCase):
+    def setUp(self):
+        super().setUp()
+        self.server = vs.make_validation_server("127.0.0.1", 0, self.store)
+        self.server.log_message = lambda *args: None
+        self.server.RequestHandlerClass.log_message = lambda *args: None
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(thread.join)
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+
+    def _request(self, method, path, body=None, headers=None):
+        connection = http.client.HTTPConnection("127.0.0.1", self.server.server_address[1], timeout=10)
+        self.addCleanup(connection.close)
+        connection.putrequest(method, path)
+        for name, value in (headers or {}).items():
+            connection.putheader(name, value)
+        connection.endheaders(body)
+        response = connection.getresponse()
+        body = response.read()
+        if response.getheader("Content-Type") != "application/json":
+            return response.status, None
+        return response.status, json.loads(body)
+
+    def _post(self, path, payload):
+        body = json.dumps(payload).encode()
+        return self._request("POST", path, body, {"Content-Length": str(len(body))})
+
+    def test_validate(self):
+        status, response = self._post("/validate", {"wrapper": _foo(1)})
+        self.assertEqual((status, response["valid"], len(response["results"])), (200, True, 1))
+        status, response = self._post("/validate", {"wrapper": _foo("x")})
+        self.assertEqual((status, response["valid"]), (200, False))
+        self.assertEqual(response["results"][0]["path"], "wrapper")
+
+    def test_validate_batch(self):
+        status, response = self._post("/validate/batch", [_foo(1), _foo("x")])
+        self.assertEqual(status, 200)
+        self.assertEqual([r["valid"] for r in response["results"]], [True, False])
+        self.assertEqual(self._post("/validate/batch", {"not": "a list"})[0], 400)
+
+    def test_rejects_bad_content_length(self):
+        for headers in ({}, {"Content-Length": "abc"}, {"Content-Length": "-1"}):
+            with self.subTest(headers=headers):
+                status, response = self._request("POST", "/validate", headers=headers)
+                self.assertEqual(status, 400)
+                self.assertIn("Content-Length", response["error"])
+        status, _ = self._request("POST", "/validate", headers={"Content-Length": str(vs.MAX_REQUEST_BYTES + 1)})
+        self.assertEqual(status, 413)
+
+    def test_rejects_invalid_json(self):
+        status, response = self._request("POST", "/validate", b"{", {"Content-Length": "1"})
+        self.assertEqual(status, 400)
+        self.assertIn("invalid JSON", response["error"])
+
+    def test_health_metrics_and_unknown_paths(self):
+        self.assertEqual(self._request("GET", "/healthz"), (200, {"status": "ok"}))
+        self._post("/validate", _foo(1))
+        # The latency is recorded just after the response is sent
+        for _ in range(100):
+            status, metrics = self._request("GET", "/metrics")
+            if metrics["latency_ms"]["/validate"]["count"]:
+                break
+            time.sleep(0.01)
+        self.assertEqual((status, metrics["latency_ms"]["/validate"]["count"]), (200, 1))
+        self.assertGreater(metrics["traversal"]["visited"], 0)
+        self.assertEqual(self._request("GET", "/nope")[0], 404)
+        self.assertEqual(self._post("/nope", {})[0], 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
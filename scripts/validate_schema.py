@@ -14,10 +14,14 @@ HOW IT WORKS:
 
 2. On-Demand Loading: Schemas are loaded on-demand from GitHub URLs when first encountered.
    The @context URL (e.g., .../EvChargingOffer/v1.0/context.jsonld) is converted to the
-   corresponding attributes.yaml URL for schema loading.
+   corresponding attributes.yaml URL for schema loading. The command-line entry point
+   first pre-scans all input files for @context URLs and fetches the referenced schemas
+   concurrently, so validation itself rarely waits on the network.
 
 3. Schema Caching: Loaded schemas are cached in a Registry and attribute_schemas_map to avoid
-   redundant network requests.
+   redundant network requests within a run. Across runs, downloaded schema files are kept in
+   a content-addressed on-disk cache (see SchemaCache) that is revalidated with
+   ETag/Last-Modified once its TTL expires, and can be used fully offline.
 
 4. Reference Resolution: Uses the referencing library to resolve $ref JSON pointers within
    and across schema files. Core objects use $ref to the full schema document to ensure
@@ -45,12 +49,44 @@ python3 scripts/validate_schema.py examples/ev-charging/v2/03_select/time-based-
 # Validate multiple files:
 python3 scripts/validate_schema.py examples/ev-charging/v2/**/*.json
 
+# Validate many files using all CPU cores (schemas are prefetched once, then shared):
+python3 scripts/validate_schema.py --jobs 0 examples/**/*.json devkits/*/postman/*.json
+
+# Replay a traffic capture with one beckn message per line (constant memory):
+python3 scripts/validate_schema.py --input-format ndjson captures/bap-traffic.ndjson
+
+# Run a long-lived validation service on port 8090 with schemas for the examples preloaded:
+python3 scripts/validate_schema.py --serve 8090 examples/**/*.json
+curl -s -X POST localhost:8090/validate -H 'Content-Type: application/json' -d @examples/ev-charging/v2/03_select/time-based-ev-charging-slot-select.json
+
+# Emit a JUnit XML report for CI (exit status is non-zero if any object is invalid):
+python3 scripts/validate_schema.py --format junit --output validation.xml examples/**/*.json
+
 # Validate only core Beckn objects (skip domain-specific attributes):
 python3 scripts/validate_schema.py --core-only examples/ev-charging/v2/03_select/time-based-ev-charging-slot-select.json
 
 # Validate Postman collection:
 python3 scripts/validate_schema.py devkits/ev-charging/postman/ev-charging:BAP-DEG.postman_collection.json
 
+# Pre-populate the on-disk schema cache for a set of files (no validation):
+python3 scripts/validate_schema.py --warm-cache examples/ev-charging/v2/**/*.json
+
+# Validate strictly from the on-disk cache (no network; fails fast on a cache miss):
+python3 scripts/validate_schema.py --offline examples/ev-charging/v2/**/*.json
+
+# Validate against the schemas in this checkout (e.g. before pushing schema edits):
+python3 scripts/validate_schema.py --local-schemas examples/demand-flex/v2/*.json
+
+# Incremental CI run: only revalidate files whose content or schemas changed since the last run:
+python3 scripts/validate_schema.py --since .validation-manifest.json examples/**/*.json
+
+# Dump the schema dependency graph (attributes.yaml files and the documents they $ref):
+python3 scripts/validate_schema.py --graph - examples/**/*.json
+
+# Parse all schemas once into a snapshot, then start later runs from it (fast startup):
+python3 scripts/validate_schema.py --save-snapshot /tmp/deg-schemas.pickle examples/**/*.json
+python3 scripts/validate_schema.py --snapshot /tmp/deg-schemas.pickle examples/ev-charging/v2/03_select/*.json
+
 EXAMPLE JSON STRUCTURE:
 ----------------------
 {
@@ -90,18 +126,355 @@ DEPENDENCIES:
 - yaml: YAML parsing for schema files
 """
 
+import hashlib
 import json
+import os
+import pickle
 import re
-import copy
-import requests
-import yaml
-from jsonschema import validate, ValidationError
-from referencing import Registry, Resource
-from referencing.jsonschema import DRAFT202012
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import nullcontext, redirect_stdout
+from dataclasses import asdict, dataclass
+from urllib.parse import urldefrag, urljoin
+
+# jsonschema and referencing dominate import time, so they are imported on first use by
+# _import_validation_deps(); requests and yaml are imported inside the functions that
+# need them. This keeps `--help`, cache warming from a snapshot and importing this
+# module (e.g. from generate_postman_collection.py) fast.
+Draft202012Validator = ValidationError = best_match = None
+Registry = Resource = DRAFT202012 = Unresolvable = None
+
+def _import_validation_deps():
+    """Import jsonschema and referencing into this module's globals (idempotent)."""
+    global Draft202012Validator, ValidationError, best_match, Registry, Resource, DRAFT202012, Unresolvable
+    if Registry is not None:
+        return
+    from jsonschema import Draft202012Validator, ValidationError
+    from jsonschema.exceptions import best_match
+    from referencing import Registry, Resource
+    from referencing.exceptions import Unresolvable
+    from referencing.jsonschema import DRAFT202012
+
+HTTP_TIMEOUT_SECONDS = 30
+DEFAULT_FETCH_CONCURRENCY = 8
+DEFAULT_CACHE_TTL_SECONDS = 3600
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "deg-schema-validator",
+)
+
+
+def _write_atomic(path, data):
+    """
+    Write data (bytes) to path via a uniquely named temporary file and a rename.
+
+    The temporary file is created with mkstemp in the target directory, so concurrent
+    writers (threads or processes) never share it, and readers only ever see a
+    complete file.
+    """
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)  # mkstemp creates 0600 files
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class SchemaCacheMissError(Exception):
+    """Raised in offline mode when a schema URL is not present in the on-disk cache."""
+
+
+class SchemaCache:
+    """
+    Content-addressed on-disk cache for schema files fetched over HTTP.
+
+    Layout:
+        <cache_dir>/index/<sha256(url)>.json  - url, etag, last_modified, fetched_at, sha256
+        <cache_dir>/objects/<sha256(body)>    - raw response body
+
+    Entries younger than ttl seconds are served without touching the network. Older
+    entries are revalidated with If-None-Match / If-Modified-Since, and a 304 response
+    only refreshes fetched_at. If revalidation fails because the network is unreachable,
+    the stale copy is served with a warning. In offline mode the network is never used
+    and a missing entry raises SchemaCacheMissError.
+
+    Args:
+        cache_dir: Directory holding the cache (created on first write)
+        ttl: Seconds an entry is considered fresh
+        offline: If True, serve strictly from the cache
+        enabled: If False, always fetch from the network and never write the cache
+        max_connections: Size of the HTTP connection pool per host; concurrent fetches
+            beyond this block until a connection is free
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_CACHE_TTL_SECONDS, offline=False, enabled=True,
+                 max_connections=DEFAULT_FETCH_CONCURRENCY):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.offline = offline
+        self.enabled = enabled
+        self.max_connections = max_connections
+        self.stats = {"fresh": 0, "revalidated": 0, "fetched": 0, "stale": 0}
+        self._stats_lock = threading.Lock()
+        self._session = None
+
+    def _get_session(self):
+        """Create the pooled HTTP session on first network access."""
+        with self._stats_lock:
+            if self._session is None:
+                import requests
+                import requests.adapters
+
+                self._session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.max_connections, pool_maxsize=self.max_connections, pool_block=True
+                )
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+            return self._session
+
+    def _count(self, outcome):
+        with self._stats_lock:
+            self.stats[outcome] += 1
+
+    def _index_path(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, "index", f"{key}.json")
+
+    def _object_path(self, digest):
+        return os.path.join(self.cache_dir, "objects", digest)
+
+    def _read_entry(self, url):
+        """Return (meta, text) for a cached URL, or None if absent or unreadable."""
+        try:
+            with open(self._index_path(url), "r") as f:
+                meta = json.load(f)
+            with open(self._object_path(meta["sha256"]), "rb") as f:
+                body = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        if hashlib.sha256(body).hexdigest() != meta["sha256"]:
+            return None
+        return meta, body.decode("utf-8")
+
+    def _write_meta(self, url, meta):
+        _write_atomic(self._index_path(url), json.dumps(meta, indent=2).encode("utf-8"))
+
+    def _write_entry(self, url, text, etag, last_modified):
+        body = text.encode("utf-8")
+        digest = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(digest)
+        # Objects are content-addressed: one written concurrently by another thread or
+        # process holds the same bytes, so an existing file counts as success.
+        if not os.path.exists(object_path):
+            try:
+                _write_atomic(object_path, body)
+            except OSError:
+                if not os.path.exists(object_path):
+                    raise
+        self._write_meta(url, {
+            "url": url,
+            "sha256": digest,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        })
+
+    def fetch(self, url):
+        """
+        Return the body of url, using the on-disk cache where possible.
+
+        Raises:
+            SchemaCacheMissError: In offline mode, if url is not cached
+            requests.RequestException: If the HTTP request fails and no cached copy exists
+        """
+        entry = self._read_entry(url) if self.enabled else None
+
+        if self.offline:
+            if entry is None:
+                raise SchemaCacheMissError(
+                    f"{url} is not in the schema cache at {self.cache_dir} "
+                    f"(run with --warm-cache first)"
+                )
+            self._count("fresh")
+            return entry[1]
+
+        headers = {}
+        if entry is not None:
+            meta, text = entry
+            if time.time() - meta.get("fetched_at", 0) < self.ttl:
+                self._count("fresh")
+                return text
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+
+        session = self._get_session()
+        import requests
+
+        try:
+            response = session.get(url, headers=headers, timeout=HTTP_TIMEOUT_SECONDS)
+        except requests.RequestException as e:
+            if entry is None:
+                raise
+            print(f"  Warning: Could not revalidate {url}, using cached copy: {e}")
+            self._count("stale")
+            return entry[1]
+
+        if response.status_code == 304 and entry is not None:
+            meta, text = entry
+            self._write_meta(url, dict(meta, fetched_at=time.time()))
+            self._count("revalidated")
+            return text
+
+        response.raise_for_status()
+        self._count("fetched")
+        if self.enabled:
+            self._write_entry(url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return response.text
+
+
+_schema_cache = SchemaCache()
+
+
+def configure_schema_cache(cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_CACHE_TTL_SECONDS, offline=False, enabled=True,
+                           max_connections=DEFAULT_FETCH_CONCURRENCY):
+    """
+    Replace the process-wide schema cache used by load_schema_from_url.
+
+    Returns:
+        SchemaCache: The newly configured cache
+    """
+    global _schema_cache
+    _schema_cache = SchemaCache(cache_dir=cache_dir, ttl=ttl, offline=offline, enabled=enabled,
+                                max_connections=max_connections)
+    return _schema_cache
+
+
+def _parse_yaml(text):
+    import yaml
+
+    # The C loader (when libyaml is available) is equivalent to safe_load, only faster
+    return yaml.load(text, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# URL prefix -> local directory. "*" matches the branch/tag part of the URL
+# (e.g. refs/heads/main or tags/deg-1.0.1), which may span several path segments.
+DEFAULT_LOCAL_SCHEMA_MAP = (
+    ("https://raw.githubusercontent.com/beckn/DEG/*/specification/schema/", os.path.join(REPO_ROOT, "specification", "schema")),
+)
+
+
+class LocalSchemaResolver:
+    """
+    Serve schema URLs from a local checkout instead of the network.
+
+    Each mapping is (url_prefix, directory): a URL starting with url_prefix resolves to
+    directory joined with the rest of the URL. Mappings are tried in order and a URL
+    whose local file does not exist falls through to the schema cache. Parsed files are
+    kept in memory and re-read only when their mtime or size changes; changed_urls()
+    lists the loaded URLs whose files changed, for refresh_local_schemas().
+    """
+
+    def __init__(self, mappings=DEFAULT_LOCAL_SCHEMA_MAP):
+        self.mappings = [
+            (re.compile(re.escape(prefix).replace(r"\*", ".+?")), os.path.abspath(directory))
+            for prefix, directory in mappings
+        ]
+        self.stats = {"hits": 0, "loads": 0}
+        self._parsed = {}  # path -> (mtime_ns, size, schema_data)
+        self._urls = {}  # url -> path, for every URL served from a local file
+        self._lock = threading.Lock()
+
+    def resolve(self, url):
+        """Return the local file for url, or None if no mapping applies or the file does not exist."""
+        for pattern, directory in self.mappings:
+            match = pattern.match(url)
+            if match is None:
+                continue
+            path = os.path.normpath(os.path.join(directory, url[match.end():]))
+            if path.startswith(directory + os.sep) and os.path.isfile(path):
+                return path
+        return None
+
+    def load(self, url):
+        """
+        Load the schema for url from the local tree.
+
+        Returns:
+            dict: Parsed schema, or None if url does not resolve to a local file
+        """
+        path = self.resolve(url)
+        if path is None:
+            with self._lock:
+                self._urls.pop(url, None)
+            return None
+        st = os.stat(path)
+        with self._lock:
+            self._urls[url] = path
+            cached = self._parsed.get(path)
+            if cached is not None and cached[:2] == (st.st_mtime_ns, st.st_size):
+                self.stats["hits"] += 1
+                return cached[2]
+        with open(path, encoding="utf-8") as f:
+            schema_data = _parse_yaml(f.read())
+        with self._lock:
+            self._parsed[path] = (st.st_mtime_ns, st.st_size, schema_data)
+            self.stats["loads"] += 1
+        return schema_data
+
+    def changed_urls(self):
+        """URLs served from local files that changed (or disappeared) since they were last parsed."""
+        with self._lock:
+            loaded = [(url, path, self._parsed.get(path)) for url, path in self._urls.items()]
+        changed = []
+        for url, path, cached in loaded:
+            try:
+                st = os.stat(path)
+                current = (st.st_mtime_ns, st.st_size)
+            except OSError:
+                current = None
+            if cached is None or cached[:2] != current:
+                changed.append(url)
+        return changed
+
+
+_local_schema_resolver = None
+
+
+def configure_local_schemas(mappings=DEFAULT_LOCAL_SCHEMA_MAP):
+    """
+    Resolve schema URLs matching mappings from the local tree (None disables it).
+
+    Returns:
+        LocalSchemaResolver: The newly configured resolver, or None
+    """
+    global _local_schema_resolver
+    _local_schema_resolver = LocalSchemaResolver(mappings) if mappings is not None else None
+    return _local_schema_resolver
+
 
 def load_schema_from_url(url):
     """
     Load a YAML schema file from a URL.
+
+    The local schema resolver (see configure_local_schemas) is consulted first; other
+    URLs go through the on-disk schema cache. Both load_schema_for_context_url and
+    load_core_schema_for_context_url, and the prefetch, load schemas through here.
     
     Args:
         url: URL to the attributes.yaml schema file
@@ -110,12 +483,220 @@ def load_schema_from_url(url):
         dict: Parsed YAML schema as a dictionary
         
     Raises:
+        SchemaCacheMissError: In offline mode, if the URL is not cached
         requests.HTTPError: If the HTTP request fails
         yaml.YAMLError: If YAML parsing fails
     """
-    response = requests.get(url)
-    response.raise_for_status()
-    return yaml.safe_load(response.text)
+    if _local_schema_resolver is not None:
+        schema_data = _local_schema_resolver.load(url)
+        if schema_data is not None:
+            return schema_data
+    return _parse_yaml(_schema_cache.fetch(url))
+
+class ValidatorCache:
+    """
+    Memoized compiled Draft202012Validator instances.
+
+    Keys are (schema URL, schema type, mode) tuples, where mode distinguishes the
+    different ways a schema is applied (core object, core structure, attribute object,
+    fragment fallback). The metaschema check and validator construction happen once
+    per key; later lookups reuse the compiled validator and only rebind it when the
+    Registry has grown since it was built.
+    """
+
+    def __init__(self):
+        self._validators = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._validators)
+
+    def clear(self):
+        self._validators.clear()
+
+    def get(self, key, build_schema, registry):
+        """
+        Return a validator for key, compiling build_schema() on a cache miss.
+
+        Raises:
+            jsonschema.SchemaError: If the built schema is not a valid 2020-12 schema
+        """
+        entry = self._validators.get(key)
+        if entry is None:
+            self.misses += 1
+            schema = build_schema()
+            Draft202012Validator.check_schema(schema)
+            validator = Draft202012Validator(schema, registry=registry)
+            self._validators[key] = (validator, registry)
+            return validator
+
+        self.hits += 1
+        validator, bound_registry = entry
+        if bound_registry is not registry:
+            validator = validator.evolve(registry=registry)
+            self._validators[key] = (validator, registry)
+        return validator
+
+
+_validator_cache = ValidatorCache()
+
+
+DEFAULT_MEMO_SIZE = 10000
+
+class ResultMemo:
+    """
+    Bounded LRU of validation outcomes.
+
+    Keys are (validator key, SHA-256 of the object's canonical JSON), so byte-for-byte
+    identical objects validated against the same schema in the same mode share one
+    outcome: None for valid, or the ValidationError that was raised.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MEMO_SIZE):
+        self.max_entries = max_entries
+        self._outcomes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._outcomes)
+
+    def clear(self):
+        self._outcomes.clear()
+
+    @staticmethod
+    def object_hash(instance):
+        canonical = json.dumps(instance, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        return hashlib.sha256(canonical.encode("utf-8")).digest()
+
+    def lookup(self, memo_key):
+        """Return (found, error) for memo_key, refreshing its LRU position on a hit."""
+        if memo_key not in self._outcomes:
+            self.misses += 1
+            return False, None
+        self.hits += 1
+        self._outcomes.move_to_end(memo_key)
+        return True, self._outcomes[memo_key]
+
+    def store(self, memo_key, error):
+        self._outcomes[memo_key] = error
+        self._outcomes.move_to_end(memo_key)
+        if len(self._outcomes) > self.max_entries:
+            self._outcomes.popitem(last=False)
+
+
+# Disabled unless configure_result_memo() is called (--memoize)
+_result_memo = None
+
+def configure_result_memo(max_entries=DEFAULT_MEMO_SIZE):
+    """
+    Enable (max_entries > 0) or disable the process-wide validation result memo.
+
+    Returns:
+        ResultMemo: The new memo, or None if disabled
+    """
+    global _result_memo
+    _result_memo = ResultMemo(max_entries) if max_entries > 0 else None
+    return _result_memo
+
+
+def validate_cached(instance, key, build_schema, registry):
+    """
+    Validate instance with the cached validator for key.
+
+    Drop-in replacement for jsonschema.validate() that skips the per-call metaschema
+    check and validator construction. When the result memo is enabled, an object
+    identical to one already validated with the same key is not validated again.
+
+    Args:
+        instance: Object to validate
+        key: (schema URL, schema type, mode) cache key
+        build_schema: Zero-argument callable returning the schema, called on a cache miss
+        registry: referencing Registry used for $ref resolution
+
+    Raises:
+        ValidationError: The best-matching validation error, if instance is invalid
+    """
+    _import_validation_deps()
+    memo_key = None
+    if _result_memo is not None:
+        memo_key = (key, ResultMemo.object_hash(instance))
+        found, error = _result_memo.lookup(memo_key)
+        if found:
+            if error is not None:
+                raise error.with_traceback(None)
+            return
+
+    validator = _validator_cache.get(key, build_schema, registry)
+    error = best_match(validator.iter_errors(instance))
+    if memo_key is not None:
+        _result_memo.store(memo_key, error)
+    if error is not None:
+        raise error
+
+@dataclass
+class ValidationResult:
+    """
+    Outcome of validating one object against one schema.
+
+    Attributes:
+        path: JSON path of the object within its payload (e.g. "message/order")
+        schema_type: Schema the object was validated against (e.g. "ChargingOffer")
+        schema_url: URL of the schema document
+        valid: Whether the object passed validation
+        message: Validation or processing error message (empty if valid)
+        error_path: JSON path of the offending value within the object (empty if valid)
+        duration_ms: Time spent validating the object
+        file: Input file the payload came from
+        item: Postman item path ("Folder / Request"), empty for plain JSON files
+    """
+    path: str
+    schema_type: str
+    schema_url: str
+    valid: bool
+    message: str = ""
+    error_path: str = ""
+    duration_ms: float = 0.0
+    file: str = ""
+    item: str = ""
+
+
+# Message prefix of results for input that is not valid JSON (see is_parse_error)
+INVALID_JSON_PREFIX = "Invalid JSON"
+
+def is_parse_error(result):
+    """Whether result records unparseable input rather than a schema-invalid object."""
+    return not result.valid and not result.schema_type and result.message.startswith(INVALID_JSON_PREFIX)
+
+def _record_result(results, path, schema_type, schema_url, started, error=None):
+    """Append a ValidationResult for a validation that began at perf_counter() value started."""
+    traversal_stats["validated"] += 1
+    if results is None:
+        return
+    results.append(ValidationResult(
+        path=path,
+        schema_type=schema_type,
+        schema_url=schema_url or "",
+        valid=error is None,
+        message=error.message if error is not None else "",
+        error_path=error.json_path if error is not None else "",
+        duration_ms=(time.perf_counter() - started) * 1000,
+    ))
+
+# Schema URL -> reason its last load failed, so objects needing it can be reported
+_schema_load_errors = {}
+
+def _record_schema_load_failure(results, errors, path, schema_type, schema_url):
+    """Report an object that could not be validated because its schema failed to load."""
+    reason = _schema_load_errors.get(schema_url, "unknown error")
+    print(f"  {schema_type} at {path or 'root'} was NOT VALIDATED: schema {schema_url} could not be loaded")
+    errors.append(f"{path} ({schema_type}): schema {schema_url} could not be loaded: {reason}")
+    if results is not None:
+        results.append(ValidationResult(
+            path=path, schema_type=schema_type, schema_url=schema_url, valid=False,
+            message=f"Schema could not be loaded: {reason}",
+        ))
 
 def extract_schema_info_from_url(url):
     """
@@ -170,6 +751,13 @@ def is_core_context_url(context_url):
     """
     return '/schema/core/' in context_url
 
+def _schema_source_label(url, branch):
+    """Describe where a loaded schema came from, for log lines."""
+    local_path = _local_schema_resolver.resolve(url) if _local_schema_resolver is not None else None
+    if local_path is not None:
+        return f"local: {os.path.relpath(local_path)}"
+    return f"branch: {branch}"
+
 def load_core_schema_for_context_url(context_url, registry_list):
     """
     Load core attributes schema for a given @context URL.
@@ -184,6 +772,7 @@ def load_core_schema_for_context_url(context_url, registry_list):
     Returns:
         dict: Schema data if successful, None if loading fails
     """
+    _import_validation_deps()
     registry = registry_list[0]
     attributes_url = get_attributes_url_from_context_url(context_url)
     
@@ -199,11 +788,16 @@ def load_core_schema_for_context_url(context_url, registry_list):
     try:
         schema_data = load_schema_from_url(attributes_url)
         registry_list[0] = registry.with_resource(attributes_url, Resource.from_contents(schema_data, DRAFT202012))
+        _schema_load_errors.pop(attributes_url, None)
+        _register_schema_closure(attributes_url, schema_data, registry_list)
         branch = extract_branch_from_context_url(context_url)
-        print(f"  Loaded core attributes schema (branch: {branch})")
+        print(f"  Loaded core attributes schema ({_schema_source_label(attributes_url, branch)})")
         return schema_data
+    except SchemaCacheMissError:
+        raise
     except Exception as e:
         print(f"  Warning: Failed to load core attributes schema from {attributes_url}: {e}")
+        _schema_load_errors[attributes_url] = str(e) or type(e).__name__
         return None
 
 def load_schema_for_context_url(context_url, attribute_schemas_map, registry_list=None):
@@ -218,6 +812,7 @@ def load_schema_for_context_url(context_url, attribute_schemas_map, registry_lis
     Returns:
         tuple: (schema_name, schema_data, schema_url) or None if failed
     """
+    _import_validation_deps()
     # Check if we already have this context URL mapped
     if context_url in attribute_schemas_map:
         return attribute_schemas_map[context_url]
@@ -239,22 +834,97 @@ def load_schema_for_context_url(context_url, attribute_schemas_map, registry_lis
     try:
         schema_data = load_schema_from_url(attributes_url)
         attribute_schemas_map[context_url] = (schema_name, schema_data, attributes_url)
+        _schema_load_errors.pop(attributes_url, None)
+        index_attribute_schemas(attributes_url, schema_data)
         if registry_list is not None:
             registry = registry_list[0]
             registry_list[0] = registry.with_resource(attributes_url, Resource.from_contents(schema_data, DRAFT202012))
-        print(f"  Loaded: {schema_name}/{version} (branch: {branch})")
+            _register_schema_closure(attributes_url, schema_data, registry_list)
+        print(f"  Loaded: {schema_name}/{version} ({_schema_source_label(attributes_url, branch)})")
         return (schema_name, schema_data, attributes_url)
+    except SchemaCacheMissError:
+        raise
     except Exception as e:
         print(f"  Warning: Failed to load {schema_name}/{version} from {attributes_url}: {e}")
+        attribute_schemas_map.pop(context_url, None)
+        _schema_load_errors[attributes_url] = str(e) or type(e).__name__
         return None
 
 
-def _validate_attribute_object(data, schema_def, schema_type, schema_name, path, errors, registry_list, schema_url=None):
+def _absolutize_refs(obj, base_url):
+    """
+    Return a copy of obj with every $ref resolved against base_url.
+
+    Covers both same-document refs ("#/...") and cross-document ones
+    ("../../Bar/v1/attributes.yaml#/..."): the copy has no $id, so a relative ref left
+    in it could not be resolved even when its target is in the Registry.
+    """
+    if isinstance(obj, dict):
+        return {
+            k: urljoin(base_url, v) if k == "$ref" and isinstance(v, str) else _absolutize_refs(v, base_url)
+            for k, v in obj.items()
+        }
+    if isinstance(obj, list):
+        return [_absolutize_refs(item, base_url) for item in obj]
+    return obj
+
+def _allow_jsonld_keywords(schema):
+    """
+    Allow @context and @type (required for JSON-LD) on a schema with additionalProperties: false.
+
+    Returns schema itself when no change is needed, otherwise a copy of its top level
+    and properties (nested subschemas are shared, not copied).
+    """
+    if schema.get("additionalProperties") is not False:
+        return schema
+    schema = dict(schema)
+    schema["properties"] = dict(schema.get("properties") or {})
+    schema["properties"]["@context"] = {"type": "string"}
+    schema["properties"]["@type"] = {"type": "string"}
+    return schema
+
+# (schema_url, schema_type) -> (resolved_schema, fragment_schema), see index_attribute_schemas
+_attribute_schema_index = {}
+
+def index_attribute_schemas(schema_url, schema_data):
+    """
+    Precompute the validation schemas for every type in an attributes.yaml document.
+
+    For each entry in components.schemas two variants are stored in the index under
+    (schema_url, schema_type): the resolved schema, with relative $refs rewritten to
+    absolute ones against schema_url, and the raw fragment used by the fallback path.
+    Both allow @context and @type. This runs once per loaded document so that
+    per-object validation never copies schemas.
+    """
+    schemas = (schema_data.get("components") or {}).get("schemas") or {}
+    for schema_type, schema_def in schemas.items():
+        if not isinstance(schema_def, dict):
+            continue
+        _attribute_schema_index[(schema_url, schema_type)] = (
+            _allow_jsonld_keywords(_absolutize_refs(schema_def, schema_url)),
+            _allow_jsonld_keywords(schema_def),
+        )
+
+def _get_attribute_validation_schemas(schema_url, schema_type, schema_def):
+    """
+    Look up the precomputed (resolved_schema, fragment_schema) pair for a type.
+
+    Types missing from the index (e.g. standalone schemas without a components wrapper)
+    get a fragment-only entry, with resolved_schema set to None.
+    """
+    entry = _attribute_schema_index.get((schema_url, schema_type))
+    if entry is None:
+        entry = (None, _allow_jsonld_keywords(schema_def))
+        _attribute_schema_index[(schema_url, schema_type)] = entry
+    return entry
+
+def _validate_attribute_object(data, schema_def, schema_type, schema_name, path, errors, registry_list, schema_url=None, results=None):
     """
     Validate a domain-specific attribute object against its schema.
     
-    Uses $ref to full document to allow nested $ref resolution, then handles
-    @context and @type properties which are required for JSON-LD.
+    Uses the precomputed schema with absolute $refs to the full document to allow
+    nested $ref resolution, with @context and @type properties allowed as required
+    for JSON-LD.
     
     Args:
         data: Object data to validate
@@ -265,79 +935,50 @@ def _validate_attribute_object(data, schema_def, schema_type, schema_name, path,
         errors: List to append validation errors to
         registry_list: Registry list for reference resolution
         schema_url: Full URL to the attributes.yaml file (for $ref resolution)
+        results: Optional list to append a ValidationResult to
     """
     print(f"  Validating {schema_type} (from {schema_name}) at {path or 'root'}...")
+    started = time.perf_counter()
+    resolved_schema, fragment_schema = _get_attribute_validation_schemas(schema_url, schema_type, schema_def)
     
-    # Try using $ref to full document first (allows nested $ref resolution)
-    if schema_url:
+    # Try the schema with absolute $refs first (allows nested $ref resolution)
+    if resolved_schema is not None:
         try:
-            # Get the full document resource from registry
-            full_doc_resource = registry_list[0].get(schema_url)
-            if full_doc_resource:
-                full_doc = full_doc_resource.contents
-                # Extract the schema from the full document
-                if "components" in full_doc and "schemas" in full_doc["components"]:
-                    target_schema = full_doc["components"]["schemas"].get(schema_type)
-                    if target_schema:
-                        # Recursively convert relative $ref to absolute $ref
-                        # Also need to handle nested schemas referenced within this schema
-                        def convert_relative_refs(obj, base_url, full_doc_schemas=None):
-                            """Recursively convert relative $ref to absolute $ref"""
-                            if isinstance(obj, dict):
-                                result = {}
-                                for k, v in obj.items():
-                                    if k == "$ref" and isinstance(v, str) and v.startswith("#"):
-                                        # Convert relative ref to absolute
-                                        result[k] = f"{base_url}{v}"
-                                    elif k == "allOf" and isinstance(v, list):
-                                        # Handle allOf with $ref - convert $ref in allOf items
-                                        result[k] = [convert_relative_refs(item, base_url, full_doc_schemas) for item in v]
-                                    else:
-                                        result[k] = convert_relative_refs(v, base_url, full_doc_schemas)
-                                return result
-                            elif isinstance(obj, list):
-                                return [convert_relative_refs(item, base_url, full_doc_schemas) for item in obj]
-                            return obj
-                        
-                        # Get schema and convert relative $ref to absolute $ref
-                        resolved_schema = copy.deepcopy(target_schema)
-                        resolved_schema = convert_relative_refs(resolved_schema, schema_url)
-                        
-                        # Modify to allow @context and @type (required for JSON-LD)
-                        if resolved_schema.get("additionalProperties") is False:
-                            if "properties" not in resolved_schema:
-                                resolved_schema["properties"] = {}
-                            resolved_schema["properties"]["@context"] = {"type": "string"}
-                            resolved_schema["properties"]["@type"] = {"type": "string"}
-                        
-                        # Validate against the resolved and modified schema
-                        validate(instance=data, schema=resolved_schema, registry=registry_list[0])
-                        print(f"  {schema_type} at {path or 'root'} is VALID.")
-                        return
+            validate_cached(data, (schema_url, schema_type, "attribute"), lambda: resolved_schema, registry_list[0])
+            print(f"  {schema_type} at {path or 'root'} is VALID.")
+            _record_result(results, path, schema_type, schema_url, started)
+            return
         except ValidationError as e:
             print(f"  {schema_type} at {path or 'root'} is INVALID: {e.message}")
             print(f"  Path: {e.json_path}")
             errors.append(f"{path} ({schema_type}): {e.message}")
+            _record_result(results, path, schema_type, schema_url, started, e)
             return
         except Exception as e:
-            # Fallback to direct validation if $ref resolution fails
-            pass
-    
-    # Fallback: direct validation with schema fragment (may fail on nested $ref)
-    validation_schema = copy.deepcopy(schema_def)
-    if validation_schema.get("additionalProperties") is False:
-        if "properties" not in validation_schema:
-            validation_schema["properties"] = {}
-        validation_schema["properties"]["@context"] = {"type": "string"}
-        validation_schema["properties"]["@type"] = {"type": "string"}
+            # A $ref target could not be loaded (see the prefetch warnings): fall back to
+            # the fragment, which still validates objects that never reach such a $ref
+            reason = getattr(e, "ref", None) or type(e).__name__
+            print(f"  Warning: Could not resolve $ref {reason} for {schema_type}; validating the fragment only")
     
+    # Fallback: direct validation with schema fragment (fails if the object reaches a $ref)
     try:
-        validate(instance=data, schema=validation_schema, registry=registry_list[0])
+        validate_cached(data, (schema_url, schema_type, "attribute-fragment"), lambda: fragment_schema, registry_list[0])
         print(f"  {schema_type} at {path or 'root'} is VALID.")
+        _record_result(results, path, schema_type, schema_url, started)
     except ValidationError as e:
         print(f"  {schema_type} at {path or 'root'} is INVALID: {e.message}")
         print(f"  Path: {e.json_path}")
         errors.append(f"{path} ({schema_type}): {e.message}")
+        _record_result(results, path, schema_type, schema_url, started, e)
+    except Unresolvable as e:
+        print(f"  {schema_type} at {path or 'root'} was NOT VALIDATED: could not resolve $ref {e.ref}")
+        errors.append(f"{path} ({schema_type}): could not resolve $ref {e.ref}")
+        if results is not None:
+            results.append(ValidationResult(
+                path=path, schema_type=schema_type, schema_url=schema_url or "", valid=False,
+                message=f"Could not resolve $ref: {e.ref}",
+                duration_ms=(time.perf_counter() - started) * 1000,
+            ))
 
 def get_schema_store():
     """
@@ -349,6 +990,7 @@ def get_schema_store():
             - attributes_schema: Unused, kept for compatibility (None)
             - attribute_schemas_map: Dict mapping @context URLs to (schema_name, schema_data, schema_url)
     """
+    _import_validation_deps()
     registry = Registry()
     attribute_schemas_map = {}
     return [registry], None, attribute_schemas_map
@@ -360,6 +1002,7 @@ def _load_core_beckn_schema(registry_list):
     Load the core beckn.yaml OpenAPI schema and register it.
     Returns the parsed schema data or None on failure.
     """
+    _import_validation_deps()
     url = CORE_BECKN_SCHEMA_URL
     try:
         resource = registry_list[0].get(url)
@@ -371,33 +1014,42 @@ def _load_core_beckn_schema(registry_list):
     try:
         schema_data = load_schema_from_url(url)
         registry_list[0] = registry_list[0].with_resource(url, Resource.from_contents(schema_data, DRAFT202012))
+        _schema_load_errors.pop(url, None)
         print(f"  Loaded core beckn.yaml schema")
         return schema_data
+    except SchemaCacheMissError:
+        raise
     except Exception as e:
         print(f"  Warning: Failed to load core beckn.yaml: {e}")
+        _schema_load_errors[url] = str(e) or type(e).__name__
         return None
 
 
-def _validate_core_structure(payload, registry_list, errors):
+def _core_structure_targets(payload):
+    """The (key, schema name, object) triples _validate_core_structure checks in payload."""
+    message = payload.get("message") if isinstance(payload, dict) else None
+    if not isinstance(message, dict):
+        return []
+    return [
+        (key, schema_name, message[key])
+        for key, schema_name in [("contract", "Contract"), ("order", "Order")]
+        if isinstance(message.get(key), dict)
+    ]
+
+def _validate_core_structure(payload, registry_list, errors, results=None):
     """
     Validate message.contract (or message.order) against core beckn.yaml schemas.
     This catches missing required fields on Contract, Commitment, Resource, etc.
+    A ValidationResult per validated object is appended to results, if given.
     """
-    message = payload.get("message")
-    if not isinstance(message, dict):
-        return
-
-    # Determine which top-level object to validate and its schema name
-    targets = []
-    for key, schema_name in [("contract", "Contract"), ("order", "Order")]:
-        if key in message and isinstance(message[key], dict):
-            targets.append((key, schema_name, message[key]))
-
+    targets = _core_structure_targets(payload)
     if not targets:
         return
 
     core_schema = _load_core_beckn_schema(registry_list)
     if not core_schema:
+        for key, schema_name, _ in targets:
+            _record_schema_load_failure(results, errors, f"message/{key}", schema_name, CORE_BECKN_SCHEMA_URL)
         return
 
     schemas = (core_schema.get("components") or {}).get("schemas") or {}
@@ -407,23 +1059,50 @@ def _validate_core_structure(payload, registry_list, errors):
             continue
 
         print(f"  Validating message.{key} against core {schema_name} schema...")
+        started = time.perf_counter()
         try:
-            schema_to_validate = {
-                "$ref": f"{CORE_BECKN_SCHEMA_URL}#/components/schemas/{schema_name}"
-            }
-            validate(instance=data, schema=schema_to_validate, registry=registry_list[0])
+            validate_cached(
+                data,
+                (CORE_BECKN_SCHEMA_URL, schema_name, "core-structure"),
+                lambda: {"$ref": f"{CORE_BECKN_SCHEMA_URL}#/components/schemas/{schema_name}"},
+                registry_list[0],
+            )
             print(f"  message.{key} core structure is VALID.")
+            _record_result(results, f"message/{key}", schema_name, CORE_BECKN_SCHEMA_URL, started)
         except ValidationError as e:
             print(f"  message.{key} core structure is INVALID: {e.message}")
             print(f"  Path: {e.json_path}")
             errors.append(f"message/{key}{e.json_path.lstrip('$')}: {e.message}")
+            _record_result(results, f"message/{key}", schema_name, CORE_BECKN_SCHEMA_URL, started, e)
+
+
+# Counts of container nodes visited by validate_payload, of objects carrying @context
+# and @type (candidates), and of objects a validator actually ran on (validated)
+traversal_stats = {"visited": 0, "candidates": 0, "validated": 0}
 
+def _materialize_path(node_path):
+    """
+    Build the JSON path string for a (parent, key) link chain.
+
+    Dict keys are joined with "/" and list indices use "[i]", e.g. "message/order/items[0]".
+    """
+    keys = []
+    while node_path is not None:
+        node_path, key = node_path
+        keys.append(key)
+    path = ""
+    for key in reversed(keys):
+        if isinstance(key, int):
+            path = f"{path}[{key}]"
+        else:
+            path = f"{path}/{key}" if path else key
+    return path
 
-def validate_payload(payload, registry_list, attributes_schema, attribute_schemas_map=None, core_only=False):
+def validate_payload(payload, registry_list, attributes_schema, attribute_schemas_map=None, core_only=False, results=None):
     """
     Validate JSON payload against Beckn protocol schemas.
 
-    Recursively traverses the payload, identifies objects with @context and @type,
+    Traverses the payload, identifies objects with @context and @type,
     loads schemas on-demand, and validates each object against its corresponding schema.
     Also validates message.contract/order against core beckn.yaml structural schemas
     to catch missing required fields.
@@ -436,104 +1115,132 @@ def validate_payload(payload, registry_list, attributes_schema, attribute_schema
         attributes_schema: Unused, kept for compatibility (None)
         attribute_schemas_map: Dict mapping @context URLs to (schema_name, schema_data, schema_url)
         core_only: If True, only validate core Beckn objects, skip domain-specific attributes
+        results: Optional list to append a ValidationResult per validated object to
 
     Returns:
         list: List of validation error messages (empty if validation passes)
     """
+    _import_validation_deps()
     errors = []
 
     # Phase 1: Core structure validation (Contract/Commitment required fields etc.)
     if isinstance(payload, dict) and "message" in payload:
-        _validate_core_structure(payload, registry_list, errors)
+        _validate_core_structure(payload, registry_list, errors, results)
 
-    def find_and_validate_objects(data, path=""):
-        if isinstance(data, dict):
-            # Check for objects with @context and @type
-            if "@context" in data and "@type" in data and attribute_schemas_map is not None:
-                context_url = data.get("@context")
-                obj_type = data.get("@type")
+    def validate_object(data, path):
+        context_url = data.get("@context")
+        obj_type = data.get("@type")
+        
+        # Handle core Beckn objects (e.g., beckn:Order, beckn:Offer)
+        if obj_type and obj_type.startswith("beckn:"):
+            if is_core_context_url(context_url):
+                attributes_url = get_attributes_url_from_context_url(context_url)
+                if attributes_url not in registry_list[0]:
+                    if load_core_schema_for_context_url(context_url, registry_list) is None:
+                        _record_schema_load_failure(results, errors, path, obj_type.split(":")[-1], attributes_url)
+                        return
                 
-                # Handle core Beckn objects (e.g., beckn:Order, beckn:Offer)
-                if obj_type and obj_type.startswith("beckn:"):
-                    if is_core_context_url(context_url):
-                        attributes_url = get_attributes_url_from_context_url(context_url)
-                        if attributes_url not in registry_list[0]:
-                            load_core_schema_for_context_url(context_url, registry_list)
+                try:
+                    resource = registry_list[0].get(attributes_url)
+                    if resource is not None:
+                        core_attributes = resource.contents
+                        object_name = obj_type.split(":")[-1]
                         
-                        try:
-                            resource = registry_list[0].get(attributes_url)
-                            if resource is not None:
-                                core_attributes = resource.contents
-                                object_name = obj_type.split(":")[-1]
-                                
-                                if "components" in core_attributes and "schemas" in core_attributes["components"]:
-                                    schemas = core_attributes["components"]["schemas"]
-                                    if object_name in schemas:
-                                        print(f"  Validating {object_name} at {path or 'root'}...")
-                                        try:
-                                            # Use $ref to full document to allow internal JSON pointer resolution
-                                            schema_to_validate = {
-                                                "$ref": f"{attributes_url}#/components/schemas/{object_name}"
-                                            }
-                                            validate(instance=data, schema=schema_to_validate, registry=registry_list[0])
-                                            print(f"  {object_name} at {path or 'root'} is VALID.")
-                                        except ValidationError as e:
-                                            print(f"  {object_name} at {path or 'root'} is INVALID: {e.message}")
-                                            print(f"  Path: {e.json_path}")
-                                            errors.append(f"{path}: {e.message}")
-                                        except Exception as e:
-                                            # Fallback to direct fragment validation if $ref resolution fails
-                                            print(f"  Warning: $ref resolution failed, trying direct validation: {e}")
-                                            try:
-                                                validate(instance=data, schema=schemas[object_name], registry=registry_list[0])
-                                                print(f"  {object_name} at {path or 'root'} is VALID.")
-                                            except ValidationError as ve:
-                                                print(f"  {object_name} at {path or 'root'} is INVALID: {ve.message}")
-                                                print(f"  Path: {ve.json_path}")
-                                                errors.append(f"{path}: {ve.message}")
-                        except (KeyError, AttributeError):
-                            pass
+                        if "components" in core_attributes and "schemas" in core_attributes["components"]:
+                            schemas = core_attributes["components"]["schemas"]
+                            if object_name in schemas:
+                                print(f"  Validating {object_name} at {path or 'root'}...")
+                                started = time.perf_counter()
+                                try:
+                                    # Use $ref to full document to allow internal JSON pointer resolution
+                                    validate_cached(
+                                        data,
+                                        (attributes_url, object_name, "core"),
+                                        lambda: {"$ref": f"{attributes_url}#/components/schemas/{object_name}"},
+                                        registry_list[0],
+                                    )
+                                    print(f"  {object_name} at {path or 'root'} is VALID.")
+                                    _record_result(results, path, object_name, attributes_url, started)
+                                except ValidationError as e:
+                                    print(f"  {object_name} at {path or 'root'} is INVALID: {e.message}")
+                                    print(f"  Path: {e.json_path}")
+                                    errors.append(f"{path}: {e.message}")
+                                    _record_result(results, path, object_name, attributes_url, started, e)
+                                except Exception as e:
+                                    # Fallback to direct fragment validation if $ref resolution fails
+                                    print(f"  Warning: $ref resolution failed, trying direct validation: {e}")
+                                    try:
+                                        validate_cached(
+                                            data,
+                                            (attributes_url, object_name, "core-fragment"),
+                                            lambda: schemas[object_name],
+                                            registry_list[0],
+                                        )
+                                        print(f"  {object_name} at {path or 'root'} is VALID.")
+                                        _record_result(results, path, object_name, attributes_url, started)
+                                    except ValidationError as ve:
+                                        print(f"  {object_name} at {path or 'root'} is INVALID: {ve.message}")
+                                        print(f"  Path: {ve.json_path}")
+                                        errors.append(f"{path}: {ve.message}")
+                                        _record_result(results, path, object_name, attributes_url, started, ve)
+                except (KeyError, AttributeError):
+                    pass
+        
+        # Handle non-core domain-specific attribute objects
+        else:
+            if core_only:
+                # Skip domain-specific attribute validation when --core-only flag is set
+                pass
+            else:
+                if context_url not in attribute_schemas_map:
+                    load_schema_for_context_url(context_url, attribute_schemas_map, registry_list)
+                    attributes_url = get_attributes_url_from_context_url(context_url)
+                    if context_url not in attribute_schemas_map and attributes_url in _schema_load_errors:
+                        schema_type = obj_type.split(":")[-1] if ":" in obj_type else obj_type
+                        _record_schema_load_failure(results, errors, path, schema_type, attributes_url)
+                        return
                 
-                # Handle non-core domain-specific attribute objects
-                else:
-                    if core_only:
-                        # Skip domain-specific attribute validation when --core-only flag is set
-                        pass
+                if context_url in attribute_schemas_map:
+                    schema_name, schema_data, schema_url = attribute_schemas_map[context_url]
+                    schema_type = obj_type.split(":")[-1] if ":" in obj_type else obj_type
+                    
+                    if "components" in schema_data and "schemas" in schema_data["components"]:
+                        schemas = schema_data["components"]["schemas"]
+
+                        # Try exact match first
+                        if schema_type in schemas:
+                            _validate_attribute_object(data, schemas[schema_type], schema_type, schema_name, path, errors, registry_list, schema_url, results)
+                        else:
+                            # Try case-insensitive match
+                            for schema_key, schema_def in schemas.items():
+                                if schema_key.lower() == schema_type.lower():
+                                    _validate_attribute_object(data, schema_def, schema_key, schema_name, path, errors, registry_list, schema_url, results)
+                                    break
                     else:
-                        if context_url not in attribute_schemas_map:
-                            load_schema_for_context_url(context_url, attribute_schemas_map, registry_list)
-                        
-                        if context_url in attribute_schemas_map:
-                            schema_name, schema_data, schema_url = attribute_schemas_map[context_url]
-                            schema_type = obj_type.split(":")[-1] if ":" in obj_type else obj_type
-                            
-                            if "components" in schema_data and "schemas" in schema_data["components"]:
-                                schemas = schema_data["components"]["schemas"]
-
-                                # Try exact match first
-                                if schema_type in schemas:
-                                    _validate_attribute_object(data, schemas[schema_type], schema_type, schema_name, path, errors, registry_list, schema_url)
-                                else:
-                                    # Try case-insensitive match
-                                    for schema_key, schema_def in schemas.items():
-                                        if schema_key.lower() == schema_type.lower():
-                                            _validate_attribute_object(data, schema_def, schema_key, schema_name, path, errors, registry_list, schema_url)
-                                            break
-                            else:
-                                # Standalone schema (e.g., DEG domain schemas without components wrapper)
-                                _validate_attribute_object(data, schema_data, schema_type, schema_name, path, errors, registry_list, schema_url)
-            
-            # Recursively check children
-            for key, value in data.items():
-                find_and_validate_objects(value, f"{path}/{key}" if path else key)
-        elif isinstance(data, list):
-            for idx, item in enumerate(data):
-                find_and_validate_objects(item, f"{path}[{idx}]")
+                        # Standalone schema (e.g., DEG domain schemas without components wrapper)
+                        _validate_attribute_object(data, schema_data, schema_type, schema_name, path, errors, registry_list, schema_url, results)
 
-    find_and_validate_objects(payload)
+    # Explicit-stack pre-order traversal (same order as a recursive walk). Only dicts and
+    # lists are pushed, and each entry carries a (parent, key) link instead of a path
+    # string; the string is only built for objects that are actually validated.
+    if not isinstance(payload, (dict, list)):
+        return errors
+    stack = [(payload, None)]
+    while stack:
+        data, node_path = stack.pop()
+        traversal_stats["visited"] += 1
+        if isinstance(data, dict):
+            # Check for objects with @context and @type
+            if "@context" in data and "@type" in data and attribute_schemas_map is not None:
+                traversal_stats["candidates"] += 1
+                validate_object(data, _materialize_path(node_path))
+            children = [(value, (node_path, key)) for key, value in data.items() if isinstance(value, (dict, list))]
+        else:
+            children = [(item, (node_path, idx)) for idx, item in enumerate(data) if isinstance(item, (dict, list))]
+        stack.extend(reversed(children))
     return errors
 
-def process_file(filepath, registry_list, attributes_schema, attribute_schemas_map=None, core_only=False):
+def process_file(filepath, registry_list, attributes_schema, attribute_schemas_map=None, core_only=False, results=None):
     """
     Process and validate a JSON file or Postman collection.
     
@@ -547,8 +1254,16 @@ def process_file(filepath, registry_list, attributes_schema, attribute_schemas_m
         attributes_schema: Unused, kept for compatibility (None)
         attribute_schemas_map: Dict mapping @context URLs to schema info
         core_only: If True, only validate core Beckn objects, skip domain-specific attributes
+        results: Optional list to append a ValidationResult per validated object to; a
+            file that cannot be processed is recorded as a single invalid result
+
+    Returns:
+        list: Validation error messages for the file (empty if validation passes)
     """
     print(f"Processing {filepath}...")
+    errors = []
+    first_result = len(results) if results is not None else 0
+    started = time.perf_counter()
     try:
         with open(filepath, 'r') as f:
             data = json.load(f)
@@ -557,13 +1272,27 @@ def process_file(filepath, registry_list, attributes_schema, attribute_schemas_m
         
         if is_postman:
             print("  Identified as Postman collection.")
-            _traverse_postman_items(data.get("item", []), registry_list, attributes_schema, attribute_schemas_map, core_only)
+            errors.extend(_traverse_postman_items(data.get("item", []), registry_list, attributes_schema, attribute_schemas_map, core_only, results))
         else:
-            validate_payload(data, registry_list, attributes_schema, attribute_schemas_map, core_only)
+            errors.extend(validate_payload(data, registry_list, attributes_schema, attribute_schemas_map, core_only, results))
+    except SchemaCacheMissError:
+        raise
     except Exception as e:
         print(f"  Error processing {filepath}: {e}")
+        errors.append(f"Error processing {filepath}: {e}")
+        if results is not None:
+            prefix = INVALID_JSON_PREFIX if isinstance(e, json.JSONDecodeError) else "Error processing file"
+            results.append(ValidationResult(
+                path="", schema_type="", schema_url="", valid=False,
+                message=f"{prefix}: {e}",
+                duration_ms=(time.perf_counter() - started) * 1000,
+            ))
+    if results is not None:
+        for result in results[first_result:]:
+            result.file = filepath
+    return errors
 
-def _traverse_postman_items(items, registry_list, attributes_schema, attribute_schemas_map, core_only=False):
+def _traverse_postman_items(items, registry_list, attributes_schema, attribute_schemas_map, core_only=False, results=None, item_path=""):
     """
     Recursively traverse Postman collection items and validate JSON request bodies.
     
@@ -573,36 +1302,1400 @@ def _traverse_postman_items(items, registry_list, attributes_schema, attribute_s
         attributes_schema: Unused, kept for compatibility (None)
         attribute_schemas_map: Dict mapping @context URLs to schema info
         core_only: If True, only validate core Beckn objects, skip domain-specific attributes
+        results: Optional list to append a ValidationResult per validated object to
+        item_path: Names of the enclosing folders, joined with " / "
+
+    Returns:
+        list: Validation error messages across all request bodies
     """
+    errors = []
     for item in items:
+        name = item.get("name", "")
+        current_path = f"{item_path} / {name}" if item_path else name
         if "item" in item:
-            _traverse_postman_items(item["item"], registry_list, attributes_schema, attribute_schemas_map, core_only)
+            errors.extend(_traverse_postman_items(item["item"], registry_list, attributes_schema, attribute_schemas_map, core_only, results, current_path))
         if "request" in item and "body" in item["request"]:
             body = item["request"]["body"]
             if body.get("mode") == "raw":
                 try:
                     json_body = json.loads(body["raw"])
-                    validate_payload(json_body, registry_list, attributes_schema, attribute_schemas_map, core_only)
+                except json.JSONDecodeError:
+                    continue
+                first_result = len(results) if results is not None else 0
+                errors.extend(validate_payload(json_body, registry_list, attributes_schema, attribute_schemas_map, core_only, results))
+                if results is not None:
+                    for result in results[first_result:]:
+                        result.item = current_path
+    return errors
+
+def iter_file_payloads(data):
+    """
+    Yield the JSON payloads contained in a loaded file.
+
+    Regular JSON files yield themselves; Postman collections yield every raw request
+    body that parses as JSON.
+    """
+    is_postman = isinstance(data, dict) and "info" in data and "_postman_id" in data.get("info", {})
+    if not is_postman:
+        yield data
+        return
+
+    stack = list(reversed(data.get("item", [])))
+    while stack:
+        item = stack.pop()
+        if "item" in item:
+            stack.extend(reversed(item["item"]))
+        if "request" in item and "body" in item["request"]:
+            body = item["request"]["body"]
+            if body.get("mode") == "raw":
+                try:
+                    yield json.loads(body["raw"])
                 except json.JSONDecodeError:
                     pass
 
-if __name__ == "__main__":
-    import argparse
-    
-    parser = argparse.ArgumentParser(
-        description="Validate JSON files against Beckn protocol schemas",
-        epilog="Example: python3 scripts/validate_schema.py examples/ev-charging/v2/**/*.json"
-    )
-    parser.add_argument("files", nargs="+", help="JSON files or Postman collections to validate")
-    parser.add_argument(
-        "--core-only",
-        action="store_true",
-        default=False,
-        help="Only validate core Beckn objects (beckn:Order, beckn:Offer, etc.), skip domain-specific attribute objects"
-    )
-    
-    args = parser.parse_args()
-    registry, attributes_schema, attribute_schemas_map = get_schema_store()
-    
-    for file in args.files:
-        process_file(file, registry, attributes_schema, attribute_schemas_map, core_only=args.core_only)
+def collect_context_urls(payload, urls):
+    """
+    Add every @context URL found in payload (on objects that also carry @type) to urls.
+
+    CORE_BECKN_SCHEMA_URL is added as well if the payload has a message.contract or
+    message.order, which are checked against it (see _validate_core_structure).
+    """
+    if _core_structure_targets(payload):
+        urls.add(CORE_BECKN_SCHEMA_URL)
+    stack = [payload]
+    while stack:
+        data = stack.pop()
+        if isinstance(data, dict):
+            context_url = data.get("@context")
+            if isinstance(context_url, str) and "@type" in data:
+                urls.add(context_url)
+            stack.extend(data.values())
+        elif isinstance(data, list):
+            stack.extend(data)
+
+def get_schema_urls_for_context_urls(context_urls, core_only=False):
+    """
+    Map @context URLs to the attributes.yaml URLs the validator would load for them.
+
+    CORE_BECKN_SCHEMA_URL is included only if it is in context_urls, where
+    collect_context_urls puts it for payloads with a core message object. Context
+    URLs the loaders would skip (no branch or schema name in the URL) are left out.
+
+    Returns:
+        list: Sorted, de-duplicated schema URLs
+    """
+    schema_urls = set()
+    for context_url in context_urls:
+        if context_url == CORE_BECKN_SCHEMA_URL:
+            schema_urls.add(context_url)
+            continue
+        attributes_url = get_attributes_url_from_context_url(context_url)
+        if is_core_context_url(context_url):
+            schema_urls.add(attributes_url)
+        elif not core_only and extract_branch_from_context_url(context_url):
+            schema_name, _ = extract_schema_info_from_url(attributes_url)
+            if schema_name:
+                schema_urls.add(attributes_url)
+    return sorted(schema_urls)
+
+STREAM_CHUNK_SIZE = 1 << 16
+STREAM_PROGRESS_EVERY = 10000
+INPUT_FORMATS = ("auto", "json", "ndjson", "json-array")
+
+def resolve_input_format(filepath, input_format="auto"):
+    """
+    Decide how to read filepath.
+
+    "auto" treats *.ndjson and *.jsonl files as NDJSON and everything else as a
+    regular JSON file or Postman collection.
+    """
+    if input_format != "auto":
+        return input_format
+    if filepath.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return "json"
+
+def iter_ndjson_messages(f):
+    """
+    Yield (label, message) for each non-blank line of an NDJSON stream.
+
+    Lines that are not valid JSON yield their json.JSONDecodeError as the message.
+    """
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield f"line {line_number}", json.loads(line)
+        except json.JSONDecodeError as e:
+            yield f"line {line_number}", e
+
+_JSON_WHITESPACE = " \t\r\n"
+_JSON_NUMBER_CHARS = "0123456789+-.eE"
+
+def iter_json_array_messages(f, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield (label, message) for each element of a top-level JSON array, reading f
+    incrementally so only the current element is held in memory.
+
+    Accepts exactly what json.load accepts for a top-level array: elements must be
+    separated by single commas, and only whitespace may follow the closing bracket.
+    A number is complete only once a delimiter follows it, so numbers split across
+    reads (e.g. after "." or "e") are not cut short.
+
+    Raises:
+        json.JSONDecodeError: If the stream is not a well-formed JSON array
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    pos = 0
+    eof = False
+    # What the grammar allows next: "[" (start), "first" (value or "]"),
+    # "value" (after a comma), "separator" ("," or "]") or "end" (whitespace only)
+    expect = "["
+    index = 0
+
+    def read_more():
+        # Grow reads geometrically so a large element is not re-parsed per chunk
+        nonlocal buf, pos, eof
+        chunk = f.read(max(chunk_size, len(buf) - pos))
+        buf = buf[pos:] + chunk
+        pos = 0
+        eof = not chunk
+
+    while True:
+        while pos < len(buf) and buf[pos] in _JSON_WHITESPACE:
+            pos += 1
+        if pos >= len(buf):
+            if not eof:
+                read_more()
+                continue
+            if expect == "end":
+                return
+            if expect == "[":
+                raise json.JSONDecodeError("Expected a top-level JSON array", buf, pos)
+            raise json.JSONDecodeError("Unterminated JSON array", buf, pos)
+
+        char = buf[pos]
+        if expect == "[":
+            if char != "[":
+                raise json.JSONDecodeError("Expected a top-level JSON array", buf, pos)
+            expect = "first"
+            pos += 1
+            continue
+        if expect == "end":
+            raise json.JSONDecodeError("Extra data after the top-level JSON array", buf, pos)
+        if expect == "separator":
+            if char == ",":
+                expect = "value"
+            elif char == "]":
+                expect = "end"
+            else:
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+            pos += 1
+            continue
+        if char == "]" and expect == "first":
+            expect = "end"
+            pos += 1
+            continue
+        if char in ",]":
+            raise json.JSONDecodeError("Expecting value", buf, pos)
+
+        try:
+            message, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            read_more()
+            continue
+        # A number running into the end of the buffer may continue in the next read
+        if (not eof and isinstance(message, (int, float)) and not isinstance(message, bool)
+                and not buf[end:].lstrip(_JSON_NUMBER_CHARS)):
+            read_more()
+            continue
+
+        yield f"[{index}]", message
+        index += 1
+        expect = "separator"
+        pos = end
+        if pos >= chunk_size:
+            buf = buf[pos:]
+            pos = 0
+
+def validate_message_stream(filepath, input_format, registry_list, attributes_schema, attribute_schemas_map=None,
+                            core_only=False, results=None, progress_every=STREAM_PROGRESS_EVERY):
+    """
+    Validate a stream of beckn messages (NDJSON or a JSON array) one message at a time.
+
+    Memory use is bounded by the largest single message: messages are parsed
+    incrementally, per-object log lines are suppressed, and only invalid results are
+    kept. Invalid objects and unparseable messages are printed as one line each, with a
+    throughput line every progress_every messages and at the end.
+
+    Args:
+        filepath: Path to the capture file
+        input_format: "ndjson" or "json-array"
+        registry_list: List containing referencing Registry
+        attributes_schema: Unused, kept for compatibility (None)
+        attribute_schemas_map: Dict mapping @context URLs to schema info
+        core_only: If True, only validate core Beckn objects, skip domain-specific attributes
+        results: Optional list to append invalid ValidationResults to
+        progress_every: Messages between progress lines (0 disables them)
+
+    Returns:
+        dict: Counters with keys messages, objects, invalid (schema-invalid objects),
+        parse_errors (unparseable messages or stream) and seconds
+    """
+    print(f"Streaming {filepath} ({input_format})...")
+    stats = {"messages": 0, "objects": 0, "invalid": 0, "parse_errors": 0, "seconds": 0.0}
+    started = time.perf_counter()
+
+    def report_progress():
+        stats["seconds"] = time.perf_counter() - started
+        rate = stats["messages"] / stats["seconds"] if stats["seconds"] else 0.0
+        print(
+            f"  {stats['messages']} messages, {stats['objects']} objects, {stats['invalid']} invalid, "
+            f"{stats['parse_errors']} unparseable ({rate:.0f} messages/sec)"
+        )
+
+    def record_invalid(result, label):
+        result.file = filepath
+        result.item = label
+        stats["parse_errors" if is_parse_error(result) else "invalid"] += 1
+        print(f"  INVALID {_result_name(result)}: {result.message}")
+        if results is not None:
+            results.append(result)
+
+    with open(filepath, "r", encoding="utf-8") as f, open(os.devnull, "w") as devnull:
+        messages = iter_ndjson_messages(f) if input_format == "ndjson" else iter_json_array_messages(f)
+        try:
+            for label, message in messages:
+                stats["messages"] += 1
+                if isinstance(message, json.JSONDecodeError):
+                    record_invalid(ValidationResult(
+                        path="", schema_type="", schema_url="", valid=False, message=f"{INVALID_JSON_PREFIX}: {message}"
+                    ), label)
+                    continue
+                message_results = []
+                try:
+                    with redirect_stdout(devnull):
+                        validate_payload(message, registry_list, attributes_schema, attribute_schemas_map, core_only, message_results)
+                except SchemaCacheMissError:
+                    raise
+                except Exception as e:
+                    message_results.append(ValidationResult(
+                        path="", schema_type="", schema_url="", valid=False, message=f"Error processing message: {e}"
+                    ))
+                stats["objects"] += len(message_results)
+                for result in message_results:
+                    if not result.valid:
+                        record_invalid(result, label)
+                if progress_every and stats["messages"] % progress_every == 0:
+                    report_progress()
+        except json.JSONDecodeError as e:
+            record_invalid(ValidationResult(
+                path="", schema_type="", schema_url="", valid=False, message=f"{INVALID_JSON_PREFIX} stream: {e}"
+            ), f"[{stats['messages']}]")
+
+    report_progress()
+    return stats
+
+def scan_context_urls(files):
+    """
+    Collect the distinct @context URLs used across files (including Postman raw bodies).
+
+    Unreadable files are reported and skipped; process_file reports them again later.
+
+    Returns:
+        set: @context URLs
+    """
+    context_urls = set()
+    for filepath in files:
+        try:
+            with open(filepath, 'r') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"  Error reading {filepath}: {e}")
+            continue
+        for payload in iter_file_payloads(data):
+            collect_context_urls(payload, context_urls)
+    return context_urls
+
+def _map_concurrently(func, urls, concurrency):
+    """
+    Call func(url) for every URL on a bounded thread pool.
+
+    Yields:
+        tuple: (url, result, exception) in input order; exactly one of result and
+        exception is meaningful
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not urls:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(urls)))) as executor:
+        futures = [(url, executor.submit(func, url)) for url in urls]
+        for url, future in futures:
+            try:
+                yield url, future.result(), None
+            except Exception as e:
+                yield url, None, e
+
+def schema_dependencies(schema_url, schema_data):
+    """
+    Documents referenced by external $refs in schema_data.
+
+    Relative references are resolved against schema_url and fragments are dropped, so
+    ".../core/v2/attributes.yaml#/components/schemas/Location" yields the attributes.yaml URL.
+
+    Returns:
+        set: Referenced document URLs, excluding schema_url itself
+    """
+    dependencies = set()
+    stack = [schema_data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == "$ref" and isinstance(value, str):
+                    if not value.startswith("#"):
+                        dependencies.add(urldefrag(urljoin(schema_url, value)).url)
+                else:
+                    stack.append(value)
+        elif isinstance(node, list):
+            stack.extend(node)
+    dependencies.discard(schema_url)
+    return dependencies
+
+# $ref targets that failed to load, so they are reported and retried only once per run
+_unresolved_schema_refs = set()
+
+def fetch_schema_closure(schemas, concurrency=DEFAULT_FETCH_CONCURRENCY, loaded=()):
+    """
+    Load every document transitively $ref'd from schemas that is not already available.
+
+    Runs breadth-first, one concurrent fetch wave per level of the dependency graph, so
+    that validation never has to resolve a new remote $ref. A target that cannot be
+    loaded (including offline cache misses) is reported once and skipped; $refs into it
+    stay unresolvable and those types fall back to fragment-only validation.
+
+    Args:
+        schemas: Dict mapping schema URL to parsed schema data to start from
+        concurrency: Maximum number of documents fetched at the same time
+        loaded: Container of URLs that are already available (e.g. a Registry)
+
+    Returns:
+        dict: Newly loaded documents, mapping URL to parsed schema data
+    """
+    fetched = {}
+    frontier = dict(schemas)
+    while frontier:
+        wanted = set()
+        for url, schema_data in frontier.items():
+            wanted.update(schema_dependencies(url, schema_data))
+        wanted = sorted(
+            url for url in wanted
+            if url not in schemas and url not in fetched and url not in loaded and url not in _unresolved_schema_refs
+        )
+        frontier = {}
+        for url, schema_data, error in _map_concurrently(load_schema_from_url, wanted, concurrency):
+            if error is None and isinstance(schema_data, dict):
+                frontier[url] = fetched[url] = schema_data
+            else:
+                print(f"  Warning: Failed to load $ref target {url}: {error or 'not a schema document'}")
+                _unresolved_schema_refs.add(url)
+    return fetched
+
+def _register_schema_closure(schema_url, schema_data, registry_list):
+    """Load and register the documents schema_data transitively $refs (on-demand loading path)."""
+    _import_validation_deps()
+    fetched = fetch_schema_closure({schema_url: schema_data}, loaded=registry_list[0])
+    if fetched:
+        registry_list[0] = registry_list[0].with_resources(
+            (url, Resource.from_contents(data, DRAFT202012)) for url, data in fetched.items()
+        )
+        for url in fetched:
+            print(f"  Loaded $ref target: {url}")
+
+def refresh_local_schemas(registry_list, attribute_schemas_map):
+    """
+    Pick up edits to local schema files in a long-lived schema store (--serve).
+
+    Once a schema is in the Registry and attribute_schemas_map it is never loaded again,
+    so the local resolver's mtime check alone would not apply an edited file. Each
+    changed document is re-parsed and replaced in the Registry, attribute_schemas_map
+    and the attribute index. A file that was removed or no longer parses is evicted
+    instead, so the next object needing it loads it again (or reports the failure).
+    Compiled validators and memoized results are dropped, since any of them may
+    depend on a changed document through a $ref.
+
+    Returns:
+        list: URLs that were reloaded or evicted
+    """
+    if _local_schema_resolver is None:
+        return []
+    changed = _local_schema_resolver.changed_urls()
+    if not changed:
+        return []
+    _import_validation_deps()
+    for url in changed:
+        try:
+            schema_data = _local_schema_resolver.load(url)
+        except Exception as e:
+            print(f"  Warning: Failed to reload {url}: {e}")
+            _schema_load_errors[url] = str(e) or type(e).__name__
+            schema_data = None
+        for (schema_url, schema_type) in [key for key in _attribute_schema_index if key[0] == url]:
+            del _attribute_schema_index[(schema_url, schema_type)]
+        context_urls = [context_url for context_url, entry in attribute_schemas_map.items() if entry[2] == url]
+        if schema_data is None:
+            if url in registry_list[0]:
+                registry_list[0] = registry_list[0].remove(url)
+            for context_url in context_urls:
+                del attribute_schemas_map[context_url]
+            print(f"  Evicted: {url}")
+            continue
+        registry_list[0] = registry_list[0].with_resource(url, Resource.from_contents(schema_data, DRAFT202012))
+        for context_url in context_urls:
+            attribute_schemas_map[context_url] = (attribute_schemas_map[context_url][0], schema_data, url)
+        if context_urls:
+            index_attribute_schemas(url, schema_data)
+        _register_schema_closure(url, schema_data, registry_list)
+        print(f"  Reloaded: {url}")
+    _validator_cache.clear()
+    if _result_memo is not None:
+        _result_memo.clear()
+    return changed
+
+def build_schema_graph(context_urls, snapshot, core_only=False):
+    """
+    Describe the schema dependency graph for a prefetch snapshot (the --graph dump).
+
+    Returns:
+        dict: With keys
+            - contexts: @context URL -> schema URL the validator loads for it
+            - schemas: schema URL -> {"types": component schema names,
+              "depends_on": documents it $refs, "closure": all documents reachable from it}
+            - unresolved: $ref targets that could not be loaded
+    """
+    depends_on = {url: sorted(schema_dependencies(url, data)) for url, data in snapshot.items()}
+    schemas = {}
+    for url in sorted(snapshot):
+        closure = set()
+        stack = list(depends_on[url])
+        while stack:
+            dependency = stack.pop()
+            if dependency in closure or dependency == url:
+                continue
+            closure.add(dependency)
+            stack.extend(depends_on.get(dependency, ()))
+        components = (snapshot[url].get("components") or {}).get("schemas") or {}
+        schemas[url] = {"types": sorted(components), "depends_on": depends_on[url], "closure": sorted(closure)}
+    contexts = {}
+    for context_url in sorted(context_urls):
+        if context_url == CORE_BECKN_SCHEMA_URL:
+            continue
+        schema_urls = get_schema_urls_for_context_urls([context_url], core_only)
+        if schema_urls:
+            contexts[context_url] = schema_urls[0]
+    unresolved = sorted({dep for deps in depends_on.values() for dep in deps if dep not in snapshot})
+    return {"contexts": contexts, "schemas": schemas, "unresolved": unresolved}
+
+def warm_schema_cache(files, core_only=False, concurrency=DEFAULT_FETCH_CONCURRENCY):
+    """
+    Pre-populate the on-disk schema cache with every schema referenced by files,
+    including documents they transitively $ref.
+
+    Args:
+        files: JSON files or Postman collections to scan for @context URLs
+        core_only: If True, skip domain-specific attribute schemas
+        concurrency: Maximum number of schemas fetched at the same time
+
+    Returns:
+        int: Number of schema URLs that could not be fetched
+    """
+    failures = 0
+    schemas = {}
+    schema_urls = get_schema_urls_for_context_urls(scan_context_urls(files), core_only)
+    for url, text, error in _map_concurrently(lambda url: _schema_cache.fetch(url), schema_urls, concurrency):
+        if error is None:
+            print(f"  Cached: {url}")
+            try:
+                schemas[url] = _parse_yaml(text)
+            except Exception as e:
+                print(f"  Warning: {url} is not valid YAML, not following its $refs: {e}")
+        else:
+            print(f"  Warning: Failed to cache {url}: {error}")
+            failures += 1
+    unresolved_before = len(_unresolved_schema_refs)
+    for url in fetch_schema_closure(schemas, concurrency):
+        print(f"  Cached: {url}")
+    return failures + len(_unresolved_schema_refs) - unresolved_before
+
+def prefetch_schema_snapshot(files, core_only=False, concurrency=DEFAULT_FETCH_CONCURRENCY):
+    """
+    Load every schema referenced by files up front.
+
+    Files are pre-scanned for @context URLs, then all corresponding schemas are fetched
+    concurrently, so a cold-cache run pays one parallel fetch wave instead of one
+    round-trip per newly encountered schema during validation.
+
+    Args:
+        files: JSON files or Postman collections to scan for @context URLs
+        core_only: If True, skip domain-specific attribute schemas
+        concurrency: Maximum number of schemas fetched at the same time
+
+    Returns:
+        tuple: (context_urls, snapshot)
+            - context_urls: Set of @context URLs found in files (see collect_context_urls)
+            - snapshot: Dict mapping schema URL to parsed schema data (failed URLs omitted)
+
+    Raises:
+        SchemaCacheMissError: In offline mode, if a schema is not cached
+    """
+    context_urls = scan_context_urls(files)
+    snapshot = {}
+    schema_urls = get_schema_urls_for_context_urls(context_urls, core_only)
+    for url, schema_data, error in _map_concurrently(load_schema_from_url, schema_urls, concurrency):
+        if isinstance(error, SchemaCacheMissError):
+            raise error
+        if error is not None:
+            print(f"  Warning: Failed to prefetch {url}: {error}")
+        else:
+            snapshot[url] = schema_data
+    snapshot.update(fetch_schema_closure(snapshot, concurrency))
+    print(f"  Prefetched {len(snapshot)} schemas")
+    return context_urls, snapshot
+
+def build_schema_store_from_snapshot(context_urls, snapshot):
+    """
+    Build a fully populated schema store from a prefetch snapshot.
+
+    Returns:
+        tuple: (registry_list, attributes_schema, attribute_schemas_map), as get_schema_store()
+    """
+    registry_list, attributes_schema, attribute_schemas_map = get_schema_store()  # imports Resource
+    registry_list[0] = registry_list[0].with_resources(
+        (url, Resource.from_contents(schema_data, DRAFT202012)) for url, schema_data in snapshot.items()
+    )
+    for context_url in context_urls:
+        attributes_url = get_attributes_url_from_context_url(context_url)
+        if is_core_context_url(context_url) or attributes_url not in snapshot:
+            continue
+        schema_name, _ = extract_schema_info_from_url(attributes_url)
+        if not schema_name:
+            continue
+        attribute_schemas_map[context_url] = (schema_name, snapshot[attributes_url], attributes_url)
+        index_attribute_schemas(attributes_url, snapshot[attributes_url])
+    return registry_list, attributes_schema, attribute_schemas_map
+
+SCHEMA_SNAPSHOT_VERSION = 1
+
+def save_schema_snapshot(path, context_urls, snapshot):
+    """
+    Write a prefetch snapshot to disk so later runs can skip YAML parsing and the prefetch scan.
+
+    The file is a pickle of the already-parsed schema dicts; only load snapshots you created.
+    """
+    _write_atomic(path, pickle.dumps(
+        {"version": SCHEMA_SNAPSHOT_VERSION, "context_urls": sorted(context_urls), "schemas": snapshot},
+        protocol=pickle.HIGHEST_PROTOCOL,
+    ))
+
+def load_schema_snapshot(path):
+    """
+    Read a snapshot written by save_schema_snapshot().
+
+    Returns:
+        tuple: (context_urls, snapshot) as returned by prefetch_schema_snapshot()
+
+    Raises:
+        ValueError: If the file was written by an incompatible version of this script
+    """
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    if not isinstance(data, dict) or data.get("version") != SCHEMA_SNAPSHOT_VERSION:
+        raise ValueError(f"{path} is not a version {SCHEMA_SNAPSHOT_VERSION} schema snapshot; recreate it with --save-snapshot")
+    return set(data["context_urls"]), data["schemas"]
+
+MANIFEST_VERSION = 1
+
+def _file_sha256(filepath):
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ValidationManifest:
+    """
+    Per-file record of a previous run, used by --since to skip unchanged files.
+
+    For every validated file the manifest stores the sha256 of its bytes, its @context
+    URLs, the content hash of each schema those resolve to (including documents they
+    transitively $ref), and the file's results. A
+    file is reused only if its bytes and all of its schemas hash the same as last time;
+    the whole manifest is discarded if this script or --core-only changed.
+    """
+
+    def __init__(self, core_only=False, files=None):
+        self.core_only = core_only
+        self.files = files if files is not None else {}
+        self._schema_hashes = {}
+        self._file_hashes = {}
+
+    @staticmethod
+    def fingerprint(core_only):
+        """Hash of this script's source and the options that affect results."""
+        with open(os.path.abspath(__file__), "rb") as f:
+            digest = hashlib.sha256(f.read())
+        digest.update(b"core_only" if core_only else b"full")
+        return digest.hexdigest()
+
+    @classmethod
+    def load(cls, path, core_only=False):
+        """Read a manifest written by save(); a missing or outdated one yields an empty manifest."""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return cls(core_only)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"  Warning: Ignoring unreadable manifest {path}: {e}")
+            return cls(core_only)
+        if data.get("version") != MANIFEST_VERSION or data.get("validator") != cls.fingerprint(core_only):
+            print(f"  Manifest {path} was written by a different validator version or options; revalidating everything")
+            return cls(core_only)
+        return cls(core_only, data.get("files") or {})
+
+    def save(self, path):
+        _write_atomic(path, json.dumps(
+            {"version": MANIFEST_VERSION, "validator": self.fingerprint(self.core_only), "files": self.files}
+        ).encode("utf-8"))
+
+    def _schema_hashes_for(self, context_urls, snapshot):
+        # The schemas for the file's contexts plus every document they transitively $ref
+        schema_urls = set()
+        stack = get_schema_urls_for_context_urls(context_urls, self.core_only)
+        while stack:
+            url = stack.pop()
+            if url not in schema_urls:
+                schema_urls.add(url)
+                if url in snapshot:
+                    stack.extend(schema_dependencies(url, snapshot[url]))
+        hashes = {}
+        for url in sorted(schema_urls):
+            if url not in self._schema_hashes:
+                self._schema_hashes[url] = ResultMemo.object_hash(snapshot[url]).hex() if url in snapshot else None
+            hashes[url] = self._schema_hashes[url]
+        return hashes
+
+    def _file_hash(self, filepath):
+        if filepath not in self._file_hashes:
+            self._file_hashes[filepath] = _file_sha256(filepath)
+        return self._file_hashes[filepath]
+
+    def lookup(self, filepath, snapshot):
+        """
+        Return the previous results for filepath if neither it nor its schemas changed.
+
+        Args:
+            filepath: File to check
+            snapshot: Dict mapping schema URL to parsed schema data for this run
+
+        Returns:
+            list: ValidationResult objects from the previous run, or None if filepath must be revalidated
+        """
+        entry = self.files.get(filepath)
+        if entry is None:
+            return None
+        try:
+            if self._file_hash(filepath) != entry["sha256"]:
+                return None
+        except OSError:
+            return None
+        if self._schema_hashes_for(entry["context_urls"], snapshot) != entry["schemas"]:
+            return None
+        return [ValidationResult(**result) for result in entry["results"]]
+
+    def record(self, filepath, file_results, snapshot):
+        """Store filepath's results from this run, with the file and schema hashes they depend on."""
+        try:
+            file_hash = self._file_hash(filepath)
+        except OSError:
+            self.files.pop(filepath, None)
+            return
+        context_urls = sorted(scan_context_urls([filepath]))
+        self.files[filepath] = {
+            "sha256": file_hash,
+            "context_urls": context_urls,
+            "schemas": self._schema_hashes_for(context_urls, snapshot),
+            "results": [asdict(result) for result in file_results],
+        }
+
+class _PrefetchedOnlySchemaSource:
+    """Schema source for worker processes: anything not in the snapshot failed to prefetch."""
+
+    def fetch(self, url):
+        raise LookupError(f"{url} was not prefetched (see warnings above)")
+
+_worker_store = None
+
+def _snapshot_counters():
+    """Current values of the process-wide validator cache and traversal counters."""
+    return {
+        "validator_hits": _validator_cache.hits,
+        "validator_misses": _validator_cache.misses,
+        "visited": traversal_stats["visited"],
+        "candidates": traversal_stats["candidates"],
+        "validated": traversal_stats["validated"],
+        "memo_hits": _result_memo.hits if _result_memo is not None else 0,
+        "memo_misses": _result_memo.misses if _result_memo is not None else 0,
+    }
+
+def _add_counters(counters):
+    """Merge counter increments reported by a worker process into this process."""
+    _validator_cache.hits += counters["validator_hits"]
+    _validator_cache.misses += counters["validator_misses"]
+    for key in traversal_stats:
+        traversal_stats[key] += counters[key]
+    if _result_memo is not None:
+        _result_memo.hits += counters["memo_hits"]
+        _result_memo.misses += counters["memo_misses"]
+
+def _init_validation_worker(context_urls, snapshot, memo_size=0):
+    """ProcessPoolExecutor initializer: warm-start the worker's schema store from the snapshot."""
+    global _schema_cache, _worker_store
+    _schema_cache = _PrefetchedOnlySchemaSource()
+    _worker_store = build_schema_store_from_snapshot(context_urls, snapshot)
+    configure_result_memo(memo_size)
+
+def _validate_file_in_worker(filepath, core_only):
+    """
+    Validate one file in a worker process, capturing its output.
+
+    Returns:
+        tuple: (output, errors, results, counters), where counters holds this file's
+        increments of the validator cache and traversal counters
+    """
+    import io
+
+    registry_list, attributes_schema, attribute_schemas_map = _worker_store
+    before = _snapshot_counters()
+    output = io.StringIO()
+    results = []
+    with redirect_stdout(output):
+        errors = process_file(filepath, registry_list, attributes_schema, attribute_schemas_map, core_only, results)
+    after = _snapshot_counters()
+    return output.getvalue(), errors, results, {key: after[key] - before[key] for key in after}
+
+def validate_files_parallel(files, jobs, context_urls, snapshot, core_only=False, results=None):
+    """
+    Validate files in a process pool.
+
+    The prefetch snapshot is shipped to each worker, so workers never touch the
+    network. Each file's output is captured in its worker and printed in input order,
+    so results are deterministic regardless of scheduling.
+
+    Args:
+        files: JSON files or Postman collections to validate
+        jobs: Number of worker processes
+        context_urls: @context URLs found in files, from prefetch_schema_snapshot()
+        snapshot: Dict mapping schema URL to parsed schema data, from prefetch_schema_snapshot()
+        core_only: If True, only validate core Beckn objects, skip domain-specific attributes
+        results: Optional list to append every file's ValidationResults to, in input order
+
+    Returns:
+        list: Per-file lists of validation error messages, in input order
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    file_errors = []
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_validation_worker,
+        initargs=(context_urls, snapshot, _result_memo.max_entries if _result_memo is not None else 0),
+    ) as executor:
+        for output, errors, file_results, counters in executor.map(_validate_file_in_worker, files, [core_only] * len(files)):
+            sys.stdout.write(output)
+            _add_counters(counters)
+            file_errors.append(errors)
+            if results is not None:
+                results.extend(file_results)
+    return file_errors
+
+MAX_REQUEST_BYTES = 64 * 1024 * 1024
+
+class LatencyHistogram:
+    """Cumulative request latency histogram with fixed millisecond buckets."""
+
+    BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bucket_counts = [0] * (len(self.BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, duration_ms):
+        index = next((i for i, bound in enumerate(self.BUCKETS_MS) if duration_ms <= bound), len(self.BUCKETS_MS))
+        with self._lock:
+            self._bucket_counts[index] += 1
+            self.count += 1
+            self.sum_ms += duration_ms
+
+    def snapshot(self):
+        """Return count, sum and cumulative per-bucket counts (Prometheus-style "le" buckets)."""
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, bucket_count in zip(self.BUCKETS_MS + ("+Inf",), self._bucket_counts):
+                cumulative += bucket_count
+                buckets[str(bound)] = cumulative
+            return {"count": self.count, "sum_ms": round(self.sum_ms, 3), "buckets": buckets}
+
+class ValidationRequestHandler:
+    """
+    HTTP front end for validate_payload.
+
+    Mixed into http.server.BaseHTTPRequestHandler by make_validation_server(), so the
+    http.server import is only paid for when --serve is used.
+
+    Endpoints:
+        POST /validate        Body: one beckn payload
+        POST /validate/batch  Body: JSON array of beckn payloads
+        GET  /metrics         Per-endpoint latency histograms and cache counters
+        GET  /healthz         Liveness check
+    """
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/metrics":
+            self._send_json(200, {
+                "latency_ms": {name: histogram.snapshot() for name, histogram in self.server.histograms.items()},
+                "validator_cache": {"hits": _validator_cache.hits, "misses": _validator_cache.misses},
+                "traversal": dict(traversal_stats),
+                "result_memo": (
+                    {"hits": _result_memo.hits, "misses": _result_memo.misses, "entries": len(_result_memo)}
+                    if _result_memo is not None else None
+                ),
+                "schema_cache": dict(getattr(_schema_cache, "stats", {})),
+            })
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        handlers = {
+            "/validate": self._validate_one,
+            "/validate/batch": self._validate_batch,
+        }
+        handler = handlers.get(self.path)
+        if handler is None:
+            self.send_error(404)
+            return
+
+        started = time.perf_counter()
+        try:
+            try:
+                length = int(self.headers.get("Content-Length", ""))
+            except ValueError:
+                length = -1
+            if length < 0:
+                self._send_json(400, {"error": "a non-negative integer Content-Length header is required"})
+                return
+            if length > MAX_REQUEST_BYTES:
+                self._send_json(413, {"error": f"request body exceeds {MAX_REQUEST_BYTES} bytes"})
+                return
+            try:
+                body = json.loads(self.rfile.read(length) if length else b"")
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                self._send_json(400, {"error": f"invalid JSON: {e}"})
+                return
+            status, response = handler(body)
+            self._send_json(status, response)
+        except SchemaCacheMissError as e:
+            self._send_json(503, {"error": str(e)})
+        finally:
+            self.server.histograms[self.path].observe((time.perf_counter() - started) * 1000)
+
+    def _validate(self, payload):
+        results = []
+        started = time.perf_counter()
+        with self.server.lock, redirect_stdout(self.server.devnull):
+            registry_list, attributes_schema, attribute_schemas_map = self.server.store
+            refresh_local_schemas(registry_list, attribute_schemas_map)
+            try:
+                errors = validate_payload(
+                    payload, registry_list, attributes_schema, attribute_schemas_map, self.server.core_only, results
+                )
+            except SchemaCacheMissError:
+                raise
+            except Exception as e:
+                errors = [f"Error processing payload: {e}"]
+        return {
+            "valid": not errors,
+            "errors": errors,
+            "results": [asdict(result) for result in results],
+            "duration_ms": (time.perf_counter() - started) * 1000,
+        }
+
+    def _validate_one(self, body):
+        return 200, self._validate(body)
+
+    def _validate_batch(self, body):
+        if not isinstance(body, list):
+            return 400, {"error": "batch body must be a JSON array of payloads"}
+        responses = [self._validate(payload) for payload in body]
+        return 200, {"valid": all(r["valid"] for r in responses), "results": responses}
+
+    def _send_json(self, status, data):
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, fmt, *args):
+        sys.stderr.write(f"[{self.log_date_time_string()}] {fmt % args}\n")
+
+def make_validation_server(host, port, store, core_only=False):
+    """
+    Create a threaded HTTP validation server around a warm schema store.
+
+    Requests share the store, attribute index and compiled validators; validation
+    itself is serialized with a lock because loaders update the store in place.
+
+    Args:
+        host: Interface to bind ("" for all)
+        port: TCP port (0 picks a free port)
+        store: (registry_list, attributes_schema, attribute_schemas_map) tuple
+        core_only: If True, only validate core Beckn objects, skip domain-specific attributes
+
+    Local schema files (--local-schemas) that are edited while the server runs take
+    effect from the next request on; see refresh_local_schemas().
+
+    Returns:
+        http.server.ThreadingHTTPServer: Server ready for serve_forever()
+    """
+    import http.server
+
+    handler_class = type(
+        "ValidationRequestHandler", (ValidationRequestHandler, http.server.BaseHTTPRequestHandler), {}
+    )
+    server = http.server.ThreadingHTTPServer((host, port), handler_class)
+    server.daemon_threads = True
+    server.store = store
+    server.core_only = core_only
+    server.lock = threading.Lock()
+    server.devnull = open(os.devnull, "w")
+    server.histograms = {"/validate": LatencyHistogram(), "/validate/batch": LatencyHistogram()}
+    return server
+
+REPORT_FORMATS = ("text", "jsonl", "junit", "sarif")
+
+def _result_name(result):
+    """Human-readable identifier of a result within its file."""
+    name = " > ".join(part for part in (result.item, result.path or "root") if part)
+    return f"{name} ({result.schema_type})" if result.schema_type else name
+
+def write_jsonl_report(results, stream):
+    """Write one JSON object per ValidationResult."""
+    for result in results:
+        stream.write(json.dumps(asdict(result)) + "\n")
+
+def write_junit_report(results, stream):
+    """Write results as JUnit XML: one testsuite per file, one testcase per validated object."""
+    import xml.etree.ElementTree as ET
+
+    by_file = {}
+    for result in results:
+        by_file.setdefault(result.file, []).append(result)
+
+    suites = ET.Element(
+        "testsuites",
+        name="validate_schema",
+        tests=str(len(results)),
+        failures=str(sum(1 for r in results if not r.valid)),
+        time=f"{sum(r.duration_ms for r in results) / 1000:.6f}",
+    )
+    for filepath, file_results in by_file.items():
+        suite = ET.SubElement(
+            suites,
+            "testsuite",
+            name=filepath,
+            tests=str(len(file_results)),
+            failures=str(sum(1 for r in file_results if not r.valid)),
+            time=f"{sum(r.duration_ms for r in file_results) / 1000:.6f}",
+        )
+        for result in file_results:
+            case = ET.SubElement(
+                suite,
+                "testcase",
+                classname=filepath,
+                name=_result_name(result),
+                time=f"{result.duration_ms / 1000:.6f}",
+            )
+            if not result.valid:
+                failure = ET.SubElement(case, "failure", message=result.message, type=result.schema_type or "ProcessingError")
+                failure.text = f"{result.error_path or '$'}: {result.message}\nSchema: {result.schema_url}"
+    stream.write(ET.tostring(suites, encoding="unicode", xml_declaration=True))
+    stream.write("\n")
+
+def write_sarif_report(results, stream):
+    """Write failed results as a SARIF 2.1.0 log, with one rule per schema type."""
+    sarif_results = []
+    rule_ids = set()
+    for result in results:
+        if result.valid:
+            continue
+        rule_id = result.schema_type or "processing-error"
+        rule_ids.add(rule_id)
+        sarif_results.append({
+            "ruleId": rule_id,
+            "level": "error",
+            "message": {"text": result.message},
+            "locations": [{
+                "physicalLocation": {"artifactLocation": {"uri": result.file}},
+                "logicalLocations": [{"fullyQualifiedName": _result_name(result), "kind": "object"}],
+            }],
+            "properties": {
+                "item": result.item,
+                "path": result.path,
+                "errorPath": result.error_path,
+                "schemaUrl": result.schema_url,
+                "durationMs": result.duration_ms,
+            },
+        })
+
+    log = {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {
+                "driver": {
+                    "name": "validate_schema",
+                    "rules": [
+                        {"id": rule_id, "shortDescription": {"text": f"Object does not conform to the {rule_id} schema"}}
+                        for rule_id in sorted(rule_ids)
+                    ],
+                },
+            },
+            "results": sarif_results,
+        }],
+    }
+    json.dump(log, stream, indent=2)
+    stream.write("\n")
+
+def write_report(results, fmt, stream):
+    """Write results to stream in one of the machine-readable REPORT_FORMATS."""
+    writers = {
+        "jsonl": write_jsonl_report,
+        "junit": write_junit_report,
+        "sarif": write_sarif_report,
+    }
+    writers[fmt](results, stream)
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(
+        description="Validate JSON files against Beckn protocol schemas",
+        epilog="Example: python3 scripts/validate_schema.py examples/ev-charging/v2/**/*.json"
+    )
+    parser.add_argument("files", nargs="*", help="JSON files or Postman collections to validate (with --serve: files whose schemas are preloaded)")
+    parser.add_argument(
+        "--core-only",
+        action="store_true",
+        default=False,
+        help="Only validate core Beckn objects (beckn:Order, beckn:Offer, etc.), skip domain-specific attribute objects"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get("DEG_SCHEMA_CACHE_DIR", DEFAULT_CACHE_DIR),
+        help="Directory for the on-disk schema cache (default: $DEG_SCHEMA_CACHE_DIR or %(default)s)"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=int,
+        default=DEFAULT_CACHE_TTL_SECONDS,
+        help="Seconds a cached schema is used before it is revalidated with the server (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        default=False,
+        help="Do not read or write the on-disk schema cache"
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        default=False,
+        help="Serve schemas strictly from the on-disk cache and fail on the first cache miss"
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        help="Validate files in N worker processes (0 = one per CPU, default: %(default)s)"
+    )
+    parser.add_argument(
+        "--fetch-concurrency",
+        type=int,
+        default=DEFAULT_FETCH_CONCURRENCY,
+        help="Maximum number of schemas downloaded in parallel during prefetch (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=INPUT_FORMATS,
+        default="auto",
+        help="How to read the input files: regular JSON/Postman, NDJSON (one message per line) or a "
+             "streamed top-level JSON array of messages. auto treats *.ndjson/*.jsonl as NDJSON "
+             "(default: %(default)s)"
+    )
+    parser.add_argument(
+        "--format",
+        choices=REPORT_FORMATS,
+        default="text",
+        help="Report format. Machine-readable formats are written to --output, or to stdout "
+             "with the human-readable log moved to stderr (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--output", "-o",
+        help="Write the --format report to this file instead of stdout"
+    )
+    parser.add_argument(
+        "--memoize",
+        action="store_true",
+        default=False,
+        help="Validate byte-identical objects only once per schema (results are reused from an LRU memo)"
+    )
+    parser.add_argument(
+        "--memo-size",
+        type=int,
+        default=DEFAULT_MEMO_SIZE,
+        help="Maximum number of memoized validation results kept with --memoize (default: %(default)s)"
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="[HOST:]PORT",
+        help="Run an HTTP validation service (POST /validate, POST /validate/batch, GET /metrics) "
+             "that keeps schemas and compiled validators warm between requests"
+    )
+    parser.add_argument(
+        "--warm-cache",
+        action="store_true",
+        default=False,
+        help="Fetch every schema referenced by the given files into the on-disk cache, then exit without validating"
+    )
+    parser.add_argument(
+        "--local-schemas",
+        action="store_true",
+        default=False,
+        help="Load schemas for DEG @context URLs (any branch or tag) from this checkout's "
+             "specification/schema instead of GitHub, so unpushed schema edits are validated"
+    )
+    parser.add_argument(
+        "--local-schema-map",
+        action="append",
+        default=[],
+        metavar="URL_PREFIX=DIR",
+        help="Serve URLs starting with URL_PREFIX from DIR (\"*\" in the prefix matches the branch/tag). "
+             "Repeatable, checked before the --local-schemas default; implies --local-schemas"
+    )
+    parser.add_argument(
+        "--since",
+        metavar="MANIFEST",
+        help="Incremental run: reuse results from MANIFEST for files whose bytes and schemas are unchanged, "
+             "validate the rest, then update MANIFEST (created if missing). Streamed inputs are always validated"
+    )
+    parser.add_argument(
+        "--graph",
+        metavar="PATH",
+        help="Load every schema referenced by the given files plus their transitive $ref closure, write the "
+             "schema dependency graph as JSON to PATH (\"-\" for stdout), then exit without validating"
+    )
+    parser.add_argument(
+        "--save-snapshot",
+        metavar="PATH",
+        help="Prefetch and parse every schema referenced by the given files, write them to PATH "
+             "as a pickled snapshot for --snapshot, then exit without validating"
+    )
+    parser.add_argument(
+        "--snapshot",
+        metavar="PATH",
+        help="Load parsed schemas from a snapshot written by --save-snapshot instead of scanning "
+             "the files and parsing YAML (schemas missing from it still load on demand). "
+             "Snapshots are pickles: only load files you created"
+    )
+    
+    args = parser.parse_args()
+    if not args.files and not args.serve:
+        parser.error("at least one file is required (unless --serve is used)")
+    if args.offline and args.no_cache:
+        parser.error("--offline requires the on-disk cache (drop --no-cache)")
+    fetch_concurrency = max(1, args.fetch_concurrency)
+    configure_schema_cache(args.cache_dir, ttl=args.cache_ttl, offline=args.offline, enabled=not args.no_cache,
+                           max_connections=fetch_concurrency)
+
+    if args.memoize:
+        configure_result_memo(args.memo_size)
+
+    if args.local_schemas or args.local_schema_map:
+        mappings = []
+        for entry in args.local_schema_map:
+            prefix, sep, directory = entry.partition("=")
+            if not sep or not prefix or not directory:
+                parser.error(f"--local-schema-map expects URL_PREFIX=DIR, got {entry!r}")
+            mappings.append((prefix, directory))
+        configure_local_schemas(mappings + list(DEFAULT_LOCAL_SCHEMA_MAP))
+
+    if args.warm_cache:
+        print(f"Warming schema cache in {args.cache_dir}...")
+        failures = warm_schema_cache(args.files, core_only=args.core_only, concurrency=fetch_concurrency)
+        sys.exit(1 if failures else 0)
+
+    if args.save_snapshot:
+        try:
+            print(f"Prefetching schemas for {len(args.files)} files...")
+            context_urls, snapshot = prefetch_schema_snapshot(args.files, args.core_only, fetch_concurrency)
+        except SchemaCacheMissError as e:
+            print(f"Error: {e}")
+            sys.exit(2)
+        save_schema_snapshot(args.save_snapshot, context_urls, snapshot)
+        print(f"Wrote snapshot of {len(snapshot)} schemas to {args.save_snapshot}")
+        sys.exit(0)
+
+    def load_or_prefetch(files):
+        if args.snapshot:
+            print(f"Loading schema snapshot {args.snapshot}...")
+            try:
+                return load_schema_snapshot(args.snapshot)
+            except (OSError, ValueError, pickle.UnpicklingError) as e:
+                print(f"Error: {e}")
+                sys.exit(2)
+        print(f"Prefetching schemas for {len(files)} files...")
+        return prefetch_schema_snapshot(files, args.core_only, fetch_concurrency)
+
+    if args.graph:
+        with redirect_stdout(sys.stderr) if args.graph == "-" else nullcontext():
+            try:
+                context_urls, snapshot = load_or_prefetch(args.files)
+            except SchemaCacheMissError as e:
+                print(f"Error: {e}")
+                sys.exit(2)
+            graph = build_schema_graph(context_urls, snapshot, args.core_only)
+        if args.graph == "-":
+            json.dump(graph, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+        else:
+            with open(args.graph, "w") as f:
+                json.dump(graph, f, indent=2)
+            print(f"Wrote dependency graph of {len(graph['schemas'])} schemas to {args.graph}")
+        sys.exit(1 if graph["unresolved"] else 0)
+
+    if args.serve:
+        host, _, port = args.serve.rpartition(":")
+        try:
+            context_urls, snapshot = load_or_prefetch(args.files)
+        except SchemaCacheMissError as e:
+            print(f"Error: {e}")
+            sys.exit(2)
+        server = make_validation_server(host, int(port), build_schema_store_from_snapshot(context_urls, snapshot), args.core_only)
+        print(f"Validation service running at http://{host or 'localhost'}:{server.server_address[1]}")
+
+        def stop(signum, frame):
+            # shutdown() blocks until serve_forever() returns, so it cannot run on this thread
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        import signal
+
+        signal.signal(signal.SIGINT, stop)
+        signal.signal(signal.SIGTERM, stop)
+        try:
+            server.serve_forever()
+            print("\nStopped.")
+        finally:
+            server.server_close()
+        sys.exit(0)
+
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    results = []
+    log_to_stderr = args.format != "text" and not args.output
+    # Streamed captures are validated one message at a time after the regular files;
+    # they are not pre-scanned, so their schemas load on demand.
+    json_files = [f for f in args.files if resolve_input_format(f, args.input_format) == "json"]
+    stream_files = [f for f in args.files if resolve_input_format(f, args.input_format) != "json"]
+    
+    with redirect_stdout(sys.stderr) if log_to_stderr else nullcontext():
+        started = time.perf_counter()
+        stream_objects = 0
+        stream_recorded = 0  # stream results appended to results (invalid objects and parse errors)
+        manifest = ValidationManifest.load(args.since, args.core_only) if args.since else None
+        try:
+            context_urls, snapshot = load_or_prefetch(json_files)
+            registry, attributes_schema, attribute_schemas_map = build_schema_store_from_snapshot(context_urls, snapshot)
+            pending_files = json_files
+            if manifest is not None:
+                pending_files = []
+                for file in json_files:
+                    previous_results = manifest.lookup(file, snapshot)
+                    if previous_results is None:
+                        pending_files.append(file)
+                    else:
+                        print(f"\nUnchanged: {file} ({len(previous_results)} objects, reusing previous results)")
+                        results.extend(previous_results)
+            if jobs > 1 and len(pending_files) > 1:
+                validate_files_parallel(pending_files, jobs, context_urls, snapshot, core_only=args.core_only, results=results)
+            else:
+                for file in pending_files:
+                    process_file(file, registry, attributes_schema, attribute_schemas_map, core_only=args.core_only, results=results)
+            if manifest is not None:
+                file_order = {file: index for index, file in enumerate(json_files)}
+                results.sort(key=lambda r: file_order.get(r.file, len(file_order)))
+                results_by_file = {}
+                for result in results:
+                    results_by_file.setdefault(result.file, []).append(result)
+                for file in pending_files:
+                    manifest.record(file, results_by_file.get(file, []), snapshot)
+                manifest.save(args.since)
+            for file in stream_files:
+                stream_stats = validate_message_stream(
+                    file, resolve_input_format(file, args.input_format), registry, attributes_schema,
+                    attribute_schemas_map, core_only=args.core_only, results=results,
+                )
+                stream_objects += stream_stats["objects"]
+                stream_recorded += stream_stats["invalid"] + stream_stats["parse_errors"]
+        except SchemaCacheMissError as e:
+            print(f"Error: {e}")
+            sys.exit(2)
+
+        parse_errors = sum(1 for r in results if is_parse_error(r))
+        invalid = sum(1 for r in results if not r.valid) - parse_errors
+        # Results of regular files are one per object, except for files that did not parse
+        file_parse_errors = parse_errors - sum(1 for r in results if is_parse_error(r) and r.file in stream_files)
+        objects = len(results) - stream_recorded - file_parse_errors + stream_objects
+        print(
+            f"Validated {objects} objects in {len(args.files)} files: {invalid} invalid, "
+            f"{parse_errors} unparseable inputs ({time.perf_counter() - started:.2f}s)"
+        )
+        if manifest is not None:
+            print(f"Incremental: {len(json_files) - len(pending_files)} of {len(json_files)} files unchanged, "
+                  f"{len(pending_files)} revalidated")
+        print(f"Traversal: {traversal_stats['visited']} nodes visited, {traversal_stats['candidates']} objects with "
+              f"@context/@type, {traversal_stats['validated']} objects validated")
+        print(f"Validator cache: {_validator_cache.hits} hits, {_validator_cache.misses} misses")
+        if _result_memo is not None:
+            print(f"Result memo: {_result_memo.hits} validations skipped, {_result_memo.misses} performed")
+        if _local_schema_resolver is not None:
+            print(f"Local schemas: {_local_schema_resolver.stats['loads']} files parsed, "
+                  f"{_local_schema_resolver.stats['hits']} reused")
+
+    if args.format != "text":
+        if args.output:
+            with open(args.output, "w") as f:
+                write_report(results, args.format, f)
+        else:
+            write_report(results, args.format, sys.stdout)
+
+    sys.exit(1 if invalid or parse_errors else 0)